@@ -0,0 +1,77 @@
+"""
+Compare polib with the streaming po reader and writer.
+
+    python examples/benchmark_pofile.py [number of entries]
+"""
+import sys
+import time
+import tempfile
+import tracemalloc
+from io import BytesIO
+from pathlib import Path
+
+import polib
+
+from odoo_tools.modules.pofile import PoStream
+from odoo_tools.modules.translate import PoFileWriter
+
+
+def generate_rows(count):
+    for index in range(count):
+        yield (
+            'sale',
+            'code',
+            'addons/sale/models/sale_{}.py'.format(index % 50),
+            index,
+            'Source term number {} with a few more words'.format(index),
+            'Terme source numero {}'.format(index),
+            ['odoo-python'],
+        )
+
+
+def measure(label, func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print("{:<24} {:>8.3f}s {:>10.1f} MiB".format(
+        label, duration, peak / 1024 / 1024
+    ))
+
+    return result
+
+
+def main(count):
+    rows = list(generate_rows(count))
+
+    def write(streaming):
+        buffer = BytesIO()
+        PoFileWriter(buffer, None, streaming=streaming).write_rows(rows)
+        return buffer.getvalue()
+
+    print("{} entries".format(count))
+
+    content = measure("write polib", lambda: write(False))
+    streamed = measure("write streaming", lambda: write(True))
+    assert content == streamed
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        po_path = Path(tmp_dir) / 'fr.po'
+        po_path.write_bytes(content)
+
+        polib_count = measure(
+            "read polib",
+            lambda: len(polib.pofile(str(po_path)))
+        )
+        stream_count = measure(
+            "read streaming",
+            lambda: sum(1 for _ in PoStream(po_path))
+        )
+        assert polib_count == stream_count
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,89 @@
+"""
+Compare the requirement merger with the pip based implementation.
+
+    python examples/benchmark_requirements.py [number of modules]
+"""
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+from odoo_tools.utilities.requirements import (
+    merge_requirements,
+    merge_requirements_pip,
+)
+
+
+PACKAGES = [
+    'requests >2',
+    'lxml <5',
+    'Pillow >3.0',
+    "pywin32; sys_platform == 'win32'",
+    "cryptography; python_version >= '3.6'",
+    'gitpython',
+    'barcode',
+    'xlrd <2',
+    'requests[security] <3',
+    'phonenumbers',
+]
+
+
+def rules(count):
+    """
+    Returns the rules of ``count`` modules, each module depending on
+    a package of its own and on a shared package.
+    """
+    result = set()
+
+    for index in range(count):
+        result.add("package-{} >={}.0".format(index, index % 7))
+        result.add(PACKAGES[index % len(PACKAGES)])
+
+    return result
+
+
+def merge_with_temp_files(rules):
+    """
+    The previous implementation of ModuleApi.requirements writing each
+    rule in a temporary file.
+    """
+    with tempfile.TemporaryDirectory() as tempdir:
+        files = set()
+
+        for index, rule in enumerate(rules):
+            path = Path(tempdir) / "{}.txt".format(index)
+            path.write_text(rule)
+            files.add(str(path))
+
+        return merge_requirements_pip(files)
+
+
+def measure(label, func):
+    start = time.perf_counter()
+    result = func()
+    duration = time.perf_counter() - start
+
+    print("{:<24} {:>8.3f}s".format(label, duration))
+
+    return result
+
+
+def main(count):
+    module_rules = rules(count)
+
+    print("{} modules, {} rules".format(count, len(module_rules)))
+
+    expected = measure(
+        "pip and temp files",
+        lambda: merge_with_temp_files(module_rules)
+    )
+    result = measure(
+        "packaging",
+        lambda: merge_requirements(rules=module_rules)
+    )
+
+    assert sorted(expected) == sorted(result)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
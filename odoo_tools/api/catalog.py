@@ -0,0 +1,163 @@
+import time
+import logging
+import threading
+
+from ..db import compile_db_filter
+
+
+_logger = logging.getLogger(__name__)
+
+
+class DatabaseCatalog(object):
+    """
+    In memory catalog of the databases.
+
+    The catalog keeps the result of :meth:`ManagementApi.db_list` for
+    ``ttl`` seconds so selecting the database of a request doesn't
+    require to query postgresql. It can also be refreshed periodically
+    by a background thread.
+
+    Once expired, a single thread reloads the catalog while the others
+    keep using the previous list of databases.
+
+    .. code:: python
+
+        catalog = env.manage.catalog
+        catalog.start(interval=30)
+
+        dbs = catalog.db_filter('www.example.com')
+
+    Attributes:
+        manage (ManagementApi): The management api used to list databases.
+
+        ttl (int): Time in seconds after which the catalog is refreshed.
+            If None, the catalog is only refreshed explicitly.
+
+        filters (dict): Extra parameters passed to ``db_list``.
+    """
+    def __init__(self, manage, ttl=60, **filters):
+        self.manage = manage
+        self.ttl = ttl
+        self.filters = filters
+        self.dbfilter = None
+        self.refreshed_at = None
+        self._databases = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def expired(self):
+        if self.refreshed_at is None:
+            return True
+
+        if self.ttl is None:
+            return False
+
+        return time.time() - self.refreshed_at > self.ttl
+
+    def refresh(self):
+        """
+        Reload the databases from postgresql.
+        """
+        with self._lock:
+            return self._reload()
+
+    def _reload(self):
+        databases = self.manage.db_list(**self.filters)
+
+        self.dbfilter = (
+            self.filters.get('dbfilter') or
+            self.manage.environment.get_config('dbfilter')
+        )
+        self._databases = databases
+        self.refreshed_at = time.time()
+
+        return databases
+
+    def databases(self):
+        """
+        Returns the databases of the catalog.
+
+        Returns:
+            list(dict): ``{"name": .., "version": .., "status": ..}``
+        """
+        if not self.expired():
+            return self._databases
+
+        # Nothing to serve yet, wait for the catalog to be loaded
+        blocking = self.refreshed_at is None
+
+        if self._lock.acquire(blocking=blocking):
+            try:
+                # It may have been refreshed while waiting for the lock
+                if self.expired():
+                    self._reload()
+            finally:
+                self._lock.release()
+
+        return self._databases
+
+    def names(self):
+        return [
+            db['name']
+            for db in self.databases()
+        ]
+
+    def get(self, name):
+        for db in self.databases():
+            if db['name'] == name:
+                return db
+
+    def db_filter(self, hostname=None):
+        """
+        Returns the names of the databases matching the dbfilter for
+        the hostname.
+        """
+        names = self.names()
+
+        if not self.dbfilter:
+            return names
+
+        rule = compile_db_filter(self.dbfilter, hostname)
+
+        return [
+            name
+            for name in names
+            if rule.match(name)
+        ]
+
+    def start(self, interval=None):
+        """
+        Refresh the catalog every ``interval`` seconds in a background
+        thread. It defaults to the ttl of the catalog.
+        """
+        if self._thread is not None:
+            return
+
+        interval = interval or self.ttl
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._refresh_loop,
+            args=(interval,),
+            name="odootools-db-catalog",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _refresh_loop(self, interval):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                _logger.error("Couldn't refresh databases", exc_info=True)
+
+            self._stop.wait(interval)
@@ -59,6 +59,7 @@ class Context(object):
         show_master_password=True,
         reset_access_rights=False,
         requirement_file_path=None,
+        wheelhouse_path=None,
     ):
         if custom_paths is None:
             custom_paths = set()
@@ -93,6 +94,7 @@ class Context(object):
         self.strict_mode = strict_mode
         self.reset_access_rights = reset_access_rights
         self.requirement_file_path = requirement_file_path
+        self.wheelhouse_path = wheelhouse_path
 
     def default_odoorc(self):
         directories = [
@@ -126,6 +128,10 @@ class Context(object):
     def from_env(klass, envvars=None):
         """
         Creates a ``Context`` from environment variables.
+
+        Args:
+            envvars (EnvironmentVariables|EnvironmentSnapshot): The
+                variables to use, defaults to the current environment.
         """
         if envvars is None:
             envvars = EnvironmentVariables()
@@ -161,14 +167,14 @@ class Context(object):
             }
 
         if envvars.ODOO_DISABLED_MODULES:
-            args['disabled_modules'] = envvars.ODOO_DISABLED_MODULES
+            args['disabled_modules'] = set(envvars.ODOO_DISABLED_MODULES)
 
         if envvars.ODOO_RC:
             args['odoo_rc'] = Path(envvars.ODOO_RC)
 
         args['init_logger'] = envvars.USE_ODOO_LOGGER
 
-        args['extra_apt_packages'] = envvars.ODOO_EXTRA_APT_PACKAGES
+        args['extra_apt_packages'] = set(envvars.ODOO_EXTRA_APT_PACKAGES)
         args['apt_install_recommends'] = envvars.APT_INSTALL_RECOMMENDS
         args['package_map_file'] = envvars.PACKAGE_MAP_FILE
 
@@ -186,5 +192,10 @@ class Context(object):
             if envvars.REQUIREMENTS_FILE_PATH
             else None
         )
+        args['wheelhouse_path'] = (
+            Path(envvars.WHEELHOUSE_PATH)
+            if envvars.WHEELHOUSE_PATH
+            else None
+        )
 
         return Context(**args)
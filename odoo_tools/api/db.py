@@ -1,5 +1,4 @@
 # import sys
-import psycopg2
 from contextlib import closing, contextmanager
 import logging
 from itertools import groupby
@@ -7,6 +6,7 @@ from itertools import groupby
 from .objects import CompanySpec
 from ..entrypoints import execute_entrypoint, entrypoint
 from ..exceptions import InstallModulesError
+from ..db import get_tables
 
 _logger = logging.getLogger(__name__)
 
@@ -112,29 +112,54 @@ def setup_company(man):
 class DbApi(object):
 
     def __init__(self, manage, database):
+        self.manage = manage
         self.environment = manage.environment
         self.database = database
         self.config = manage.config
         self._entrypoint_loaded = False
         self.without_demo = True
 
+    def installed_modules(self, modules):
+        """
+        Returns the modules of ``modules`` installed in the database.
+
+        The query is done on a pooled connection so it doesn't require
+        to load the odoo registry.
+
+        Raises:
+            KeyError: If the database isn't initialized.
+        """
+        query = """
+            SELECT name
+              FROM ir_module_module
+             WHERE name IN %s
+               AND state = 'installed'
+        """
+
+        manage = self.manage
+        with closing(manage.db_connect(self.database, pooled=True)) as conn:
+            with closing(conn.cursor()) as cr:
+                if not get_tables(cr, {'ir_module_module'}):
+                    raise KeyError('ir.module.module')
+
+                cr.execute(query, (tuple(modules),))
+
+                return {
+                    name
+                    for (name,) in cr.fetchall()
+                }
+
     def mark_modules(self, modules, force=False):
         to_install = {mod for mod in modules}
         to_update = set()
 
-        if not force:
+        if not force and to_install:
+            import psycopg2
+
             try:
-                with self.env() as env:
-                    IrModule = env['ir.module.module']
-                    installed_modules = IrModule.search(
-                        [
-                            ['name', 'in', list(to_install)],
-                            ['state', '=', 'installed'],
-                        ],
-                    )
-                    for mod in installed_modules:
-                        to_install.remove(mod.name)
-                        to_update.add(mod.name)
+                for mod in self.installed_modules(to_install):
+                    to_install.remove(mod)
+                    to_update.add(mod)
             except psycopg2.OperationalError:
                 _logger.error(
                     "SQL Error",
@@ -167,7 +192,42 @@ class DbApi(object):
         for key in self.config['update'].keys():
             self.config['update'][key] = False
 
-    def init(self, modules, country, language="en_US", without_demo=True):
+    def init(
+        self,
+        modules,
+        country,
+        language="en_US",
+        without_demo=True,
+        template_cache=False
+    ):
+        """
+        Initialize the database with modules.
+
+        Args:
+            modules (set(str)): Modules to install.
+
+            country (str): Country code of the main company.
+
+            language (str): Languages to load separated by commas.
+
+            without_demo (bool): Skip demo data.
+
+            template_cache (bool): Create the database from a cached
+                template database, see :class:`TemplateCache`.
+        """
+        if template_cache:
+            from .templates import TemplateCache
+
+            cache = TemplateCache(self.manage)
+            cache.init_database(
+                self.database,
+                modules,
+                country,
+                language,
+                without_demo
+            )
+            return
+
         company = CompanySpec(country_code=country)
 
         self.company_spec = self.environment.manage.company_spec = company
@@ -272,9 +332,10 @@ class DbApi(object):
 
             installed_modules.button_immediate_uninstall()
 
-    def export_translation_terms(self, languages, modules):
+    def translation_generator(self):
         """
-        Export terms grouped by module
+        Returns a function compatible with ``trans_generate`` of
+        odoo 10 to 13 for the current odoo version.
         """
         # TODO create a unified term exporter. The one from Odoo14 is
         # much better than previous versions. It could be a good start
@@ -299,16 +360,31 @@ class DbApi(object):
             from odoo.tools.translate import TranslationModuleReader
 
             def trans_generate(language, modules, cr):
-
-                reader = TranslationModuleReader(
+                return TranslationModuleReader(
                     cr,
                     modules=modules,
                     lang=language
                 )
-                return [
-                    x
-                    for x in reader
-                ]
+
+        return trans_generate
+
+    def export_translation_terms(self, languages, modules, streaming=False):
+        """
+        Export terms grouped by module
+
+        Args:
+            languages (list(str)): Languages to export.
+
+            modules (list(str)): Modules to export, ``all`` exports the
+                installed modules.
+
+            streaming (bool): Export the terms of one module at a time
+                instead of loading the terms of all modules in memory.
+
+        Yields:
+            tuple: ``(language, module, terms)``
+        """
+        trans_generate = self.translation_generator()
 
         def get_key(key_id):
             def wrap(value):
@@ -316,20 +392,35 @@ class DbApi(object):
             return wrap
 
         with self.env() as env:
-            for language in languages:
-                translations = trans_generate(
-                    language,
-                    modules,
-                    env.cr
-                )
+            if streaming and 'all' in modules:
+                modules = self.installed_modules_names(env.cr)
 
-                translations.sort()
+            for language in languages:
+                if streaming:
+                    batches = [[module] for module in modules]
+                else:
+                    batches = [modules]
+
+                for batch in batches:
+                    translations = sorted(
+                        trans_generate(language, batch, env.cr)
+                    )
 
-                for module, terms in groupby(translations, key=get_key(0)):
-                    yield language, module, terms
+                    for module, terms in groupby(
+                        translations,
+                        key=get_key(0)
+                    ):
+                        yield language, module, terms
 
         _logger.info('translation file written successfully')
 
+    def installed_modules_names(self, cr):
+        cr.execute(
+            "SELECT name FROM ir_module_module "
+            "WHERE state = 'installed' ORDER BY name"
+        )
+        return [name for (name,) in cr.fetchall()]
+
     @contextmanager
     def env(self, uid=None, ctx=None):
         import odoo
@@ -1,7 +1,10 @@
 import os
+import time
+import tempfile
 import toml
 import json
 import logging
+from io import StringIO
 from pathlib import Path
 from contextlib import contextmanager
 from configparser import NoSectionError, NoOptionError
@@ -30,6 +33,22 @@ from .services import ServiceApi
 _logger = logging.getLogger(__name__)
 
 
+def folder_mtimes(paths):
+    """
+    Returns the modification time of each folder of ``paths``, None
+    for missing folders.
+    """
+    mtimes = {}
+
+    for path in paths:
+        try:
+            mtimes[str(path)] = os.stat(str(path)).st_mtime_ns
+        except OSError:
+            mtimes[str(path)] = None
+
+    return mtimes
+
+
 class Environment(object):
     """
     Odoo Environment object.
@@ -54,22 +73,33 @@ class Environment(object):
         requirement_file_path (Path): The path where to store the requirements
             file when merging pip requirements.
 
+        config_validate_interval (float): Time in seconds during which
+            :meth:`get_config` uses the config file read without checking
+            if it changed.
+
     """
+    config_validate_interval = 1.0
 
     def __init__(
         self,
         context=None,
+        envvars=None,
     ):
         """
         Initialize an environment.
 
         Parameters:
             context (Context): The context to use.
+            envvars (EnvironmentSnapshot): Snapshot of the environment
+                variables used instead of reading ``os.environ``.
             env (Environment): The environment to use.
             strict_mode (bool): If the environment is strict.
         """
         if context is None:
-            context = Context.from_env()
+            context = Context.from_env(envvars)
+
+        self.envvars = envvars
+        self._env_options = None
 
         self.context = context
         self.modules = ModuleApi(self)
@@ -79,8 +109,17 @@ class Environment(object):
         self._config = ConfigParser()
         self._nested = False
         self._read_config = False
+        self._config_state = None
+        self._config_content = None
+        self._config_defaults_version = None
+        self._config_validated = None
+        self._env_params = {}
         self.loader = FileLoader()
 
+        self._addons_paths = None
+        self.addons_paths_timings = {}
+        self.addons_paths_version = 0
+
         self._prepare_parser()
 
     def _prepare_parser(self):
@@ -140,13 +179,18 @@ class Environment(object):
         with self.config():
             self._config.set(section, key, value)
 
+        if section == 'options' and key == 'addons_path':
+            self._addons_paths = None
+
     def get_config(self, key, section='options'):
         """
         Get a configuration settings in the currently open configuration file.
         """
+        if not self._nested:
+            self._load_config(force=False)
+
         try:
-            with self.config(readonly=True):
-                return parse_value(self._config.get(section, key))
+            return parse_value(self._config.get(section, key))
         except NoOptionError:
             return None
         except NoSectionError:
@@ -175,41 +219,170 @@ class Environment(object):
         if not nested:
             self._nested = True
             is_top = True
+            self._load_config()
+
+        try:
+            yield self._config
+        except Exception:
+            raise
+        finally:
+            if is_top:
+                self._nested = False
+
+        if not nested and not readonly:
+            self._write_config(config_path)
+
+    def _config_file_state(self, config_path):
+        try:
+            stat = os.stat(str(config_path))
+        except (OSError, TypeError):
+            return None
+
+        return (str(config_path), stat.st_mtime_ns, stat.st_size)
+
+    def _dump_config(self):
+        out = StringIO()
+
+        defaults = self._config._defaults
+        self._config._defaults = {}
+        try:
+            self._config.write(out)
+        finally:
+            self._config._defaults = defaults
+
+        return out.getvalue()
+
+    def revalidate_config(self):
+        """
+        Check the config file again on the next call to :meth:`get_config`.
+        """
+        self._config_validated = None
+
+    def _load_config(self, force=True):
+        """
+        Read the config file unless it didn't change since it was read,
+        then compute the defaults of the odoo version.
+
+        Args:
+            force (bool): Check the config file even if it was checked
+                less than :attr:`config_validate_interval` ago.
+        """
+        config_path = Path(self.context.odoo_rc)
+        now = time.monotonic()
+
+        # Checking the config file stats it and computing the defaults
+        # may import odoo, it's done at most once per interval
+        if (
+            not force and
+            self._config_validated is not None and
+            self._config_validated[0] == str(config_path) and
+            now - self._config_validated[1] <= self.config_validate_interval
+        ):
+            return
+
+        state = self._config_file_state(config_path)
+
+        if state is not None and state != self._config_state:
+            config = ConfigParser()
+            config._defaults = self._config._defaults
 
-        if not nested and config_path.exists() and not self._read_config:
             try:
-                self._read_config = True
-                self._config.read(str(config_path))
+                config.read(str(config_path))
             except Exception:
                 _logger.info("Couldn't read ODOO_RC file.", exc_info=True)
+            else:
+                self._config = config
+                self._read_config = True
+                self._config_state = state
+                self._config_content = self._dump_config()
+
+        version = self.odoo_version()
 
-        if not self._config._defaults and self.odoo_version():
+        if version and version != self._config_defaults_version:
             try:
-                params_by_name = get_env_params(self, self.odoo_version())
+                params_by_name = self.env_params(version)
             except OdooNotInstalled:
                 params_by_name = {}
 
             self._config._defaults = get_defaults(params_by_name)
+            self._config_defaults_version = version
+
+        self._config_validated = (str(config_path), now)
+
+    def _write_config(self, config_path):
+        """
+        Write the config file if it was modified.
+
+        The file is written in a temporary file renamed over the config
+        file, so readers never see a partially written file. The file
+        is written in place when it can't be replaced, for example when
+        its folder isn't writable or when it's a bind mounted file.
+        """
+        content = self._dump_config()
+
+        if content == self._config_content and config_path.exists():
+            return
+
+        # Keep symlinks pointing to the config file
+        target = Path(os.path.realpath(str(config_path)))
 
         try:
-            yield self._config
-        except Exception:
-            raise
-        finally:
-            if is_top:
-                self._nested = False
+            self._replace_file(target, content)
+        except OSError:
+            _logger.debug(
+                "Couldn't replace %s, writing it in place",
+                target, exc_info=True
+            )
 
-        if not nested and not readonly:
             try:
-                with config_path.open('w') as out:
-                    defaults = self._config._defaults
-                    self._config._defaults = {}
-                    self._config.write(out)
-                    self._config._defaults = defaults
+                with target.open('w') as out:
+                    out.write(content)
             except Exception:
                 _logger.error("Couldn't write config ", exc_info=True)
+                return
+
+        self._config_content = content
+        self._config_state = self._config_file_state(config_path)
+
+    @staticmethod
+    def _replace_file(target, content):
+        fd, tmp_name = tempfile.mkstemp(
+            dir=str(target.parent),
+            prefix=".{}.".format(target.name),
+            suffix='.tmp'
+        )
+
+        try:
+            with os.fdopen(fd, 'w') as out:
+                out.write(content)
+
+            if target.exists():
+                stat = target.stat()
+                os.chmod(tmp_name, stat.st_mode & 0o7777)
+
+                try:
+                    os.chown(tmp_name, stat.st_uid, stat.st_gid)
+                except OSError:
+                    # Only privileged users can give away files
+                    pass
+
+            os.replace(tmp_name, str(target))
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
 
-    def addons_paths(self):
+    def env_params(self, version):
+        """
+        Returns the environment variables of the odoo options of
+        ``version``, computed once per version.
+        """
+        if version not in self._env_params:
+            self._env_params[version] = get_env_params(self, version)
+
+        return self._env_params[version]
+
+    def addons_paths(self, reload=False):
         """
         Returns the addons path configured for this environment.
 
@@ -238,10 +411,89 @@ class Environment(object):
             with env.config():
                 env.set_config("addons_path", addons_paths)
 
+        The result is cached until the config file, the custom paths,
+        the excluded paths or the options of the context change, or
+        until the modification time of a searched folder or of a
+        returned addons path changes. Modules added deeper in a searched
+        folder than an existing addons path require ``reload``.
+
+        The time spent in each phase of the last lookup is stored in
+        :attr:`addons_paths_timings` and :attr:`addons_paths_version` is
+        incremented each time the addons paths are searched.
+
+        Args:
+            reload (bool): Search the addons paths even if they're cached.
+
         Returns:
             paths (List<Path>): The list of paths containing installable
                 addons.
         """
+        start = time.perf_counter()
+        timings = {}
+
+        cache = self._addons_paths
+        if (
+            not reload and
+            cache is not None and
+            cache['key'] == self._addons_paths_key() and
+            cache['mtimes'] == folder_mtimes(cache['mtimes'])
+        ):
+            timings['validate'] = time.perf_counter() - start
+            self.addons_paths_timings = timings
+            return type(cache['paths'])(cache['paths'])
+
+        timings['validate'] = time.perf_counter() - start
+
+        paths, searched = self._find_addons_paths(timings)
+
+        self.addons_paths_version += 1
+        self._addons_paths = {
+            "key": self._addons_paths_key(),
+            "mtimes": folder_mtimes(set(searched) | set(paths)),
+            "paths": paths,
+        }
+        self.addons_paths_timings = timings
+
+        _logger.debug(
+            "Found %s addons paths in %.3fs (%s)",
+            len(paths),
+            sum(timings.values()),
+            ", ".join(
+                "{} {:.3f}s".format(phase, duration)
+                for phase, duration in timings.items()
+            )
+        )
+
+        return type(paths)(paths)
+
+    def _addons_paths_key(self):
+        odoo_rc = self.context.odoo_rc
+
+        try:
+            rc_mtime = os.stat(str(odoo_rc)).st_mtime_ns
+        except (OSError, TypeError):
+            rc_mtime = None
+
+        return (
+            str(odoo_rc),
+            rc_mtime,
+            frozenset(str(path) for path in self.context.custom_paths),
+            frozenset(str(path) for path in self.context.excluded_paths),
+            self.context.exclude_odoo,
+            self.context.force_addons_lookup,
+            self.context.include_odoo_entrypoints,
+            self.context.odoo_base_path,
+        )
+
+    def _find_addons_paths(self, timings):
+        """
+        Search the addons paths.
+
+        Returns:
+            tuple: The addons paths and the folders searched.
+        """
+        start = time.perf_counter()
+
         try:
             with self.config(readonly=True) as config:
                 paths = config.get('options', 'addons_path')
@@ -253,11 +505,14 @@ class Environment(object):
             )
 
             if len(config_paths) > 0 and not self.context.force_addons_lookup:
-                return config_paths
+                timings['config'] = time.perf_counter() - start
+                return config_paths, set()
 
         except Exception:
             config_paths = set()
 
+        timings['config'] = time.perf_counter() - start
+
         base_addons_paths = config_paths
 
         try:
@@ -273,9 +528,12 @@ class Environment(object):
 
         orig_valid_paths = find_addons_paths(
             base_addons_paths,
-            options=self.context
+            options=self.context,
+            timings=timings
         )
 
+        start = time.perf_counter()
+
         if self.context.excluded_paths:
             excluded_paths = to_path_list(self.context.excluded_paths)
             valid_paths = filter_excluded_paths(
@@ -284,7 +542,9 @@ class Environment(object):
         else:
             valid_paths = orig_valid_paths
 
-        return valid_paths
+        timings['filter'] = time.perf_counter() - start
+
+        return valid_paths, base_addons_paths
 
     def odoo_config(self):
         """
@@ -323,22 +583,62 @@ class Environment(object):
     def env_options(self):
         """
         Load environment variable options.
+
+        With a snapshot of the environment variables, the options are
+        computed once per snapshot and odoo version.
         """
+        version = self.odoo_version()
+
+        cache = self._env_options
+        if (
+            cache is not None and
+            cache[0] is self.envvars and
+            cache[1] == version
+        ):
+            return dict(cache[2])
+
         try:
-            params_by_name = get_env_params(self, self.odoo_version())
+            params_by_name = self.env_params(version)
         except OdooNotInstalled:
             params_by_name = {}
 
+        if self.envvars is not None:
+            environ = self.envvars.environ
+        else:
+            environ = os.environ
+
         configs = {}
 
-        for key, value in os.environ.items():
+        for key, value in environ.items():
             if key in params_by_name:
                 option = params_by_name[key]
                 config_name = option[0]
                 converted_value = convert_env_value(key, value)
                 configs[config_name] = converted_value
 
-        return configs
+        if self.envvars is not None:
+            self._env_options = (self.envvars, version, configs)
+
+        return dict(configs)
+
+    def refresh_envvars(self, context=False):
+        """
+        Take a new snapshot of the environment variables.
+
+        The options read from the environment variables, such as
+        :meth:`env_options`, use the new snapshot. The context was built
+        from the previous snapshot and may have been modified since, it's
+        kept as is unless ``context`` is set.
+
+        Args:
+            context (bool): Build the context again from the new snapshot.
+        """
+        if self.envvars is not None:
+            self.envvars = self.envvars.refresh()
+
+        if context:
+            self.context = Context.from_env(self.envvars)
+            self.revalidate_config()
 
     def sync_options(self):
         """
@@ -0,0 +1,224 @@
+import os
+import sys
+import json
+import time
+import logging
+import threading
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from ..env import SOCKET_ENV
+
+
+_logger = logging.getLogger(__name__)
+
+
+class FleetUpdate(object):
+    """
+    Update modules in many databases.
+
+    Each database is updated by a separate ``odootools manage update``
+    process so a crash or a memory leak in one database doesn't affect
+    the others. At most ``jobs`` databases are updated at the same time.
+
+    The output of each process is written in ``<log_dir>/<database>.log``
+    and the result of each database is recorded in
+    ``<log_dir>/state.json``. When ``resume`` is set, databases already
+    updated with the same modules are skipped.
+
+    .. code:: python
+
+        fleet = FleetUpdate(env, ['sale'], 'logs', jobs=4, timeout=3600)
+        results = fleet.run(['db1', 'db2'])
+
+    Attributes:
+        environment (Environment): The environment used to locate the
+            odoo configuration passed to the workers.
+
+        modules (list(str)): Modules to update.
+
+        log_dir (Path): Folder of the logs and state file.
+
+        jobs (int): Maximum number of databases updated concurrently.
+
+        timeout (int): Time in seconds after which the update of a
+            database is killed.
+
+        resume (bool): Skip databases updated successfully by a previous
+            run.
+    """
+    def __init__(
+        self,
+        environment,
+        modules,
+        log_dir,
+        jobs=4,
+        timeout=None,
+        resume=False
+    ):
+        self.environment = environment
+        self.modules = sorted(modules)
+        self.log_dir = Path(log_dir)
+        self.jobs = jobs
+        self.timeout = timeout
+        self.resume = resume
+        self.state = {}
+        self._lock = threading.Lock()
+
+    @property
+    def state_path(self):
+        return self.log_dir / 'state.json'
+
+    def log_path(self, dbname):
+        return self.log_dir / "{}.log".format(dbname)
+
+    def load_state(self):
+        if not self.resume or not self.state_path.exists():
+            return {}
+
+        with self.state_path.open('r') as fin:
+            state = json.load(fin)
+
+        if state.get('modules') != self.modules:
+            _logger.warning(
+                "Ignoring %s, it was created for other modules %s",
+                self.state_path,
+                state.get('modules')
+            )
+            return {}
+
+        return state.get('databases', {})
+
+    def save_state(self):
+        data = {
+            "modules": self.modules,
+            "databases": self.state,
+        }
+
+        tmp_path = self.state_path.with_suffix('.tmp')
+        with tmp_path.open('w') as fout:
+            json.dump(data, fout, indent=2, sort_keys=True)
+
+        os.replace(tmp_path, self.state_path)
+
+    def command(self, dbname):
+        """
+        Returns the command line updating ``dbname``.
+        """
+        args = [sys.executable, '-m', 'odoo_tools.cli']
+
+        odoo_rc = self.environment.context.odoo_rc
+        if odoo_rc and Path(odoo_rc).exists():
+            args += ['-c', str(odoo_rc)]
+
+        args += [
+            'manage',
+            'update',
+            '-m', ','.join(self.modules),
+            dbname
+        ]
+
+        return args
+
+    def worker_environ(self):
+        """
+        Returns the environment variables of the worker processes.
+
+        Workers must run in their own process, they are never forwarded
+        to an odootools daemon.
+        """
+        environ = dict(os.environ)
+        environ.pop(SOCKET_ENV, None)
+        return environ
+
+    def update_database(self, dbname):
+        """
+        Update the modules of ``dbname`` in a worker process.
+
+        Returns:
+            dict: ``{"name": .., "status": .., "duration": ..,
+            "returncode": .., "log": ..}`` where status is one of
+            ``done``, ``failed`` or ``timeout``.
+        """
+        log_path = self.log_path(dbname)
+
+        result = {
+            "name": dbname,
+            "log": str(log_path),
+            "returncode": None,
+        }
+
+        _logger.info("Updating %s, logs in %s", dbname, log_path)
+
+        start = time.monotonic()
+
+        with log_path.open('w') as log_file:
+            try:
+                proc = subprocess.run(
+                    self.command(dbname),
+                    stdin=subprocess.DEVNULL,
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT,
+                    env=self.worker_environ(),
+                    timeout=self.timeout,
+                )
+            except subprocess.TimeoutExpired:
+                result['status'] = 'timeout'
+            else:
+                result['returncode'] = proc.returncode
+                result['status'] = 'done' if proc.returncode == 0 else 'failed'
+
+        result['duration'] = round(time.monotonic() - start, 3)
+
+        if result['status'] == 'done':
+            _logger.info("Updated %s in %.1fs", dbname, result['duration'])
+        else:
+            _logger.error(
+                "Update of %s %s, see %s",
+                dbname,
+                result['status'],
+                log_path
+            )
+
+        with self._lock:
+            self.state[dbname] = result
+            self.save_state()
+
+        return result
+
+    def run(self, databases):
+        """
+        Update the modules in ``databases``.
+
+        Returns:
+            list(dict): The result of each database in the same order as
+            ``databases``. Databases skipped because they were already
+            updated have the status ``skipped``.
+        """
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.state = self.load_state()
+
+        to_update = [
+            dbname
+            for dbname in databases
+            if self.state.get(dbname, {}).get('status') != 'done'
+        ]
+
+        results = {}
+
+        for dbname in databases:
+            if dbname not in to_update:
+                results[dbname] = dict(self.state[dbname], status='skipped')
+
+        if to_update:
+            max_workers = max(1, min(self.jobs or 1, len(to_update)))
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for result in executor.map(self.update_database, to_update):
+                    results[result['name']] = result
+
+        return [
+            results[dbname]
+            for dbname in databases
+        ]
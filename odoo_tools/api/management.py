@@ -1,11 +1,12 @@
-import distro
 import six
 import logging
-import psycopg2
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import closing
 from urllib.parse import urlparse
 
 from .db import DbApi
+from .catalog import DatabaseCatalog
+from .pool import ConnectionPool
 from ..entrypoints import execute_entrypoint
 from ..configuration.odoo import (
     OfficialRelease,
@@ -21,6 +22,8 @@ class ManagementApi(object):
     def __init__(self, environment):
         self.environment = environment
         self._initialized = False
+        self._catalog = None
+        self.pool = ConnectionPool()
 
     def connection_info(self, db_or_uri):
         if db_or_uri.startswith(('postgresql://', 'postgres://')):
@@ -59,8 +62,34 @@ class ManagementApi(object):
 
         return connection_info
 
-    def db_connect(self, db):
-        connection_info = self.connection_info(db)
+    def db_connect(self, db, connection_info=None, pooled=False):
+        """
+        Open a connection to the database.
+
+        Args:
+            db (str): The database name or a postgresql uri.
+
+            connection_info (dict): Connection parameters as returned by
+                :meth:`connection_info` to reuse instead of reading them
+                from the configuration again. The database is replaced by
+                ``db``.
+
+            pooled (bool): Borrow the connection from :attr:`pool`. The
+                connection is given back to the pool when closed.
+
+        Returns:
+            connection: A psycopg2 connection.
+        """
+        if connection_info is None:
+            connection_info = self.connection_info(db)
+        else:
+            connection_info = dict(connection_info, database=db)
+
+        if pooled:
+            return self.pool.acquire(connection_info)
+
+        import psycopg2
+
         return psycopg2.connect(**connection_info)
 
     def get_active_dbs(self, template=None):
@@ -82,7 +111,7 @@ class ManagementApi(object):
 
         templates = ('postgres', template)
 
-        with closing(self.db_connect('postgres')) as conn:
+        with closing(self.db_connect('postgres', pooled=True)) as conn:
             with closing(conn.cursor()) as cr:
                 cr.execute(db_sql, (templates,))
 
@@ -93,13 +122,14 @@ class ManagementApi(object):
 
         return res
 
-    def get_db_version(self, dbname):
+    def get_db_version(self, dbname, connection_info=None, pooled=True):
         db_info = {
             "name": dbname
         }
 
         try:
-            with closing(self.db_connect(dbname)) as conn:
+            conn = self.db_connect(dbname, connection_info, pooled=pooled)
+            with closing(conn):
                 try:
                     with closing(conn.cursor()) as cr:
                         if len(get_tables(cr, {'ir_module_module'})) >= 1:
@@ -123,7 +153,18 @@ class ManagementApi(object):
         filter_version=False,
         filter_invalid=False,
         include_extra_dbs=False,
+        jobs=8,
     ):
+        """
+        Returns the list of databases with their version and status.
+
+        Databases rejected by ``dbfilter`` or not in ``db_name`` are
+        discarded before connecting to them. The remaining databases are
+        probed concurrently by at most ``jobs`` threads.
+
+        Returns:
+            list(dict): ``{"name": .., "version": .., "status": ..}``
+        """
         if not dbfilter:
             dbfilter = self.environment.get_config('dbfilter')
 
@@ -143,10 +184,24 @@ class ManagementApi(object):
             template=db_template
         )
 
-        valid_dbs = [
-            self.get_db_version(dbname)
-            for dbname in active_dbs
-        ]
+        if dbfilter:
+            active_dbs = [
+                db['name']
+                for db in db_filter(
+                    [{'name': dbname} for dbname in active_dbs],
+                    dbfilter,
+                    hostname
+                )
+            ]
+
+        if db_names and not include_extra_dbs:
+            active_dbs = [
+                dbname
+                for dbname in active_dbs
+                if dbname in db_names
+            ]
+
+        valid_dbs = self.probe_dbs(active_dbs, jobs=jobs)
 
         if filter_invalid:
             valid_dbs = [
@@ -169,9 +224,6 @@ class ManagementApi(object):
                 if 'version' in db and db['version'] == filter_version
             ]
 
-        if dbfilter:
-            valid_dbs = db_filter(valid_dbs, dbfilter, hostname)
-
         dbs_hash = {
             db['name']: db
             for db in valid_dbs
@@ -194,6 +246,40 @@ class ManagementApi(object):
 
         return result_dbs
 
+    def probe_dbs(self, dbnames, jobs=8):
+        """
+        Calls :meth:`get_db_version` on each database using a pool
+        of threads. The connection parameters are computed once and
+        shared by all the probes. Probes aren't pooled, keeping a
+        connection opened to each database could exhaust the
+        connections of postgresql.
+
+        Returns:
+            list(dict): The database infos in the same order as ``dbnames``.
+        """
+        if not dbnames:
+            return []
+
+        connection_info = self.connection_info('postgres')
+
+        def probe(dbname):
+            return self.get_db_version(dbname, connection_info, pooled=False)
+
+        max_workers = max(1, min(jobs or 1, len(dbnames)))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(probe, dbnames))
+
+    @property
+    def catalog(self):
+        """
+        Returns the shared :class:`DatabaseCatalog` of this environment.
+        """
+        if self._catalog is None:
+            self._catalog = DatabaseCatalog(self)
+
+        return self._catalog
+
     def db(self, database):
         """
         Returns a DbApi instance.
@@ -429,6 +515,8 @@ class ManagementApi(object):
         }
 
         if distrib_override is not None:
+            import distro
+
             distrib_id = distro.id()
         else:
             distrib_id = distrib_override
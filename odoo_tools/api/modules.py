@@ -1,35 +1,106 @@
-import tempfile
+import time
+import logging
+import multiprocessing
+from functools import partial
 from collections import defaultdict
-from ..compat import Path
+from concurrent.futures import ProcessPoolExecutor
 from ..modules.search import find_modules_paths
-from ..utilities.requirements import merge_requirements
+from .objects import get_translation_filename
+from ..utilities.requirements import (
+    merge_requirements,
+    requirements_hash,
+)
+
+
+_logger = logging.getLogger(__name__)
+
+
+def _export_language(context, database, modules, language):
+    """
+    Export the translations of ``language`` in a spawned process.
+
+    The process doesn't inherit the environment nor the connections of
+    its parent, it creates its own environment from ``context``.
+    """
+    from .environment import Environment
+
+    env = Environment(context)
+    manifests = {
+        name: env.modules.get(name)
+        for name in modules
+    }
+
+    return env.modules.write_translations(
+        env.manage.db(database),
+        manifests,
+        [language],
+    )
 
 
 class ModuleApi(object):
+    """
+    Api to list the modules of the addons paths.
+
+    Attributes:
+        validate_interval (float): Time in seconds during which
+            :meth:`get` uses the modules found without checking the
+            addons paths again.
+    """
+    validate_interval = 1.0
+
     def __init__(self, environment):
         self.environment = environment
         self._all_manifests = None
         self._manifest_by_name = None
+        self._version = None
+        self._validated_at = None
 
     def list(self, reload=False, filters=None):
         if filters is None:
             filters = set(['installable'])
 
-        if not self._all_manifests or reload:
+        addons_paths = self.environment.addons_paths(reload=reload)
+
+        # Modules are searched again when the addons paths changed
+        version = self.environment.addons_paths_version
+
+        if not self._all_manifests or reload or version != self._version:
             all_manifests = find_modules_paths(
-                self.environment.addons_paths(),
+                addons_paths,
                 filters,
                 self.environment.context
             )
             self._all_manifests = all_manifests
+            self._manifest_by_name = None
+            self._version = version
 
         return self._all_manifests
 
+    def revalidate(self):
+        """
+        Check the addons paths again on the next call to :meth:`get`.
+        """
+        self._validated_at = None
+
     def get(self, name):
-        if not self._manifest_by_name:
-            self._manifest_by_name = defaultdict(list)
-            for module in self.list():
-                self._manifest_by_name[module.technical_name].append(module)
+        now = time.monotonic()
+
+        # Checking the addons paths stats all of them, it's done at
+        # most once per validate_interval
+        if (
+            self._manifest_by_name is None or
+            self._validated_at is None or
+            now - self._validated_at > self.validate_interval
+        ):
+            manifests = self.list()
+
+            if self._manifest_by_name is None:
+                manifest_by_name = defaultdict(list)
+                for module in manifests:
+                    manifest_by_name[module.technical_name].append(module)
+                self._manifest_by_name = manifest_by_name
+
+            self._validated_at = now
 
         mods = self._manifest_by_name[name]
 
@@ -99,18 +170,107 @@ class ModuleApi(object):
         for module in self.disabled_modules():
             module.remove()
 
+    def requirement_paths(self, extra_paths=None, lookup_requirements=False):
+        """
+        Returns the requirement files merged by :meth:`requirements`.
+
+        Args:
+            extra_paths (set): Requirement files to merge.
+
+            lookup_requirements (bool): Also merge the files named
+                ``requirements.txt`` found recursively in the addons
+                paths.
+
+        Returns:
+            set(str): The paths of the requirement files.
+        """
+        paths = set(extra_paths or [])
+
+        if lookup_requirements:
+            paths |= self.environment.requirement_files(
+                lookup_requirements=True
+            )
+
+        return {str(path) for path in paths}
+
+    def requirements_hash(
+        self,
+        package_map=None,
+        extra_paths=None,
+        extra_rules=None,
+        lookup_requirements=False
+    ):
+        """
+        Returns the digest of the inputs of :meth:`requirements`, it
+        changes when the requirements may change.
+        """
+        extra_paths = self.requirement_paths(extra_paths, lookup_requirements)
+
+        filters = set(['installable', 'python_dependencies'])
+
+        dependencies = {
+            str(module.path): module.external_dependencies.get(
+                'python', []
+            )
+            for module in self.list(filters=filters)
+        }
+
+        return requirements_hash(
+            dependencies,
+            extra_paths,
+            package_map=package_map,
+            rules=extra_rules
+        )
+
     def requirements(
         self,
         lookup_requirements=False,
         package_map=None,
         extra_paths=None,
-        extra_rules=None
+        extra_rules=None,
+        lock=None
     ):
+        """
+        Returns the merged python requirements of the modules.
+
+        Args:
+            lookup_requirements (bool): Also merge the files named
+                ``requirements.txt`` found recursively in the addons
+                paths.
+
+            package_map (dict): Map of module dependencies to packages.
+
+            extra_paths (set): Requirement files to merge.
+
+            extra_rules (set): Requirements to merge.
+
+            lock (RequirementsLock): If set, requirements are only
+                computed when their inputs changed.
+
+        Returns:
+            set(str): The requirements.
+        """
+        if lock is not None:
+            digest = self.requirements_hash(
+                package_map, extra_paths, extra_rules, lookup_requirements
+            )
+            requirements = lock.get(digest)
+
+            if requirements is None:
+                requirements = self.requirements(
+                    lookup_requirements=lookup_requirements,
+                    package_map=package_map,
+                    extra_paths=extra_paths,
+                    extra_rules=extra_rules
+                )
+                lock.save(digest, sorted(requirements))
+
+            return set(requirements)
+
         if package_map is None:
             package_map = {}
 
-        if extra_paths is None:
-            extra_paths = set()
+        extra_paths = self.requirement_paths(extra_paths, lookup_requirements)
 
         if extra_rules is None:
             extra_rules = set()
@@ -122,26 +282,134 @@ class ModuleApi(object):
         for module in modules:
             packages |= module.requirements(package_map=package_map)
 
-        if extra_rules or packages:
-            name_template = "{}.txt"
-            temp_file_count = 0
+        requirements = merge_requirements(
+            extra_paths,
+            rules=set(extra_rules) | packages
+        )
+
+        return set(requirements)
+
+    def export_translations(self, db, modules, languages, jobs=None):
+        """
+        Export the translations of many modules in their i18n folder.
+
+        The terms of all the modules are generated at once in a single
+        environment instead of once per module.
+
+        With ``jobs``, each language is exported in a separate process
+        with at most ``jobs`` processes at the same time. Processes are
+        spawned instead of forked so they don't share the connections
+        and the odoo registries of the current process.
+
+        Args:
+            db (DbApi): the api used to access the database.
+
+            modules (list(str)): Names of the modules to export.
+
+            languages (list(str)): list of locales to export.
 
-            with tempfile.TemporaryDirectory() as tempdir:
-                folder_root = Path(tempdir)
+            jobs (int): Number of processes used to export languages.
 
-                for rule in set(extra_rules) | packages:
-                    file_name = name_template.format(temp_file_count)
-                    file_handle = folder_root / file_name
+        Returns:
+            list(Path): The translation files written.
+        """
+        manifests = {
+            name: self.get(name)
+            for name in modules
+        }
+
+        if not jobs or jobs <= 1 or len(languages) <= 1:
+            return self.write_translations(db, manifests, languages)
+
+        context = multiprocessing.get_context('spawn')
+        max_workers = min(jobs, len(languages))
+
+        export = partial(
+            _export_language,
+            self.environment.context,
+            db.database,
+            list(manifests),
+        )
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=context
+        ) as executor:
+            return [
+                path
+                for paths in executor.map(export, languages)
+                for path in paths
+            ]
+
+    def write_translations(self, db, manifests, languages):
+        translations = db.export_translation_terms(
+            languages,
+            list(manifests)
+        )
+
+        paths = []
+
+        for language, module, rows in translations:
+            manifest = manifests.get(module)
+
+            if manifest is None:
+                _logger.debug("Ignoring terms of module %s", module)
+                continue
+
+            manifest.write_translations(language, rows, module)
+            paths.append(
+                manifest.path / 'i18n' /
+                get_translation_filename(language, module)
+            )
 
-                    with file_handle.open("wb") as temp:
-                        temp.write(rule.encode('utf-8'))
+        return paths
+
+    def extract_translations(self, modules=None, jobs=None):
+        """
+        Write the pot file of modules from their sources, without
+        a database.
 
-                    extra_paths.add(str(file_handle))
+        Args:
+            modules (list(str)): Names of the modules, defaults to all
+                the installable modules.
 
-                    temp_file_count += 1
+            jobs (int): Number of processes extracting terms.
 
-                requirements = merge_requirements(extra_paths)
+        Returns:
+            list(Path): The pot files written.
+        """
+        if modules is None:
+            manifests = self.list()
         else:
-            requirements = merge_requirements(extra_paths)
+            manifests = [self.get(name) for name in modules]
 
-        return set(requirements)
+        from ..modules.extract import export_pot_files
+
+        return export_pot_files(manifests, jobs=jobs)
+
+    def compile_translations(self, cache_dir, modules=None, jobs=None):
+        """
+        Compile the po files of modules into binary catalogs that can
+        be loaded by odoo with
+        :func:`odoo_tools.modules.compiled.install_loader`.
+
+        Args:
+            cache_dir (Path): Folder of the compiled catalogs.
+
+            modules (list(str)): Names of the modules, defaults to all
+                the installable modules.
+
+            jobs (int): Number of processes compiling modules.
+
+        Returns:
+            list(tuple): ``(po_path, catalog_path, compiled)`` for each
+            po file.
+        """
+        if modules is None:
+            manifests = self.list()
+        else:
+            manifests = [self.get(name) for name in modules]
+
+        from ..modules.compiled import compile_translations
+
+        return compile_translations(manifests, cache_dir, jobs=jobs)
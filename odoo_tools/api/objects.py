@@ -1,4 +1,6 @@
+import os
 import hashlib
+from io import BytesIO
 from six import ensure_text
 import shutil
 import logging
@@ -7,8 +9,6 @@ import tempfile
 from zipfile import ZipFile
 
 from ..compat import Path
-from ..modules.render import render_description_str
-from ..modules.translate import PoFileWriter, PoFileReader
 from ..exceptions import ArgumentError
 
 _logger = logging.getLogger(__name__)
@@ -481,6 +481,8 @@ class Manifest(object):
         data['technical_name'] = module_path.name
 
         if render_description:
+            from ..modules.render import render_description_str
+
             data['description_html'] = render_description_str(
                 module_path,
                 data.get('description', '')
@@ -613,6 +615,72 @@ class Manifest(object):
 
         return outfile
 
+    def write_translations(self, language, rows, module=None):
+        """
+        Merge translation rows in the po file of ``language`` located
+        in the i18n folder of the module.
+
+        The file is only written when the merge changes its entries
+        and the new content differs from the current one, so exporting
+        an unchanged module doesn't touch its files.
+
+        Args:
+            language (str): The locale of the rows, an empty language
+                writes the pot file.
+
+            rows (iterable): Translation rows as exported by odoo.
+
+            module (str): Name of the module used in logs.
+
+        Returns:
+            PoFileWriter: The writer used to merge the rows, its
+            ``changed`` attribute tells if the file was written.
+        """
+        module = module or self.technical_name
+        filename = get_translation_filename(language, module)
+        trans_path = self.path / 'i18n' / filename
+        trans_path.parent.mkdir(parents=True, exist_ok=True)
+
+        _logger.info(
+            "Exporting translation %s of module %s to %s",
+            language,
+            module,
+            trans_path
+        )
+
+        from ..modules.translate import PoFileWriter, PoFileReader
+
+        content = trans_path.read_bytes() if trans_path.exists() else b''
+        origin_po_file = PoFileReader(BytesIO(content))
+
+        buffer = BytesIO()
+        po_writer = PoFileWriter(
+            buffer,
+            language,
+            pofile=origin_po_file.pofile
+        )
+
+        fingerprint = po_writer.fingerprint() if content else None
+
+        po_writer.add_entries(rows)
+
+        if fingerprint == po_writer.fingerprint():
+            _logger.info("Translation file %s is up to date", trans_path)
+            return po_writer
+
+        po_writer.write()
+
+        if buffer.getvalue() == content:
+            _logger.info("Translation file %s is up to date", trans_path)
+            return po_writer
+
+        tmp_path = trans_path.with_name(trans_path.name + '.tmp')
+        tmp_path.write_bytes(buffer.getvalue())
+        os.replace(str(tmp_path), str(trans_path))
+        po_writer.changed = True
+
+        return po_writer
+
     def export_translations(self, db, languages):
         """
         Exports translation in the corresponding module's path.
@@ -637,37 +705,8 @@ class Manifest(object):
         po_files = []
 
         for language, module, rows in translations:
-            filename = get_translation_filename(language, module)
-            trans_path = self.path / 'i18n' / filename
-            trans_path.parent.mkdir(parents=True, exist_ok=True)
-
-            _logger.info(
-                "Exporting translation %s of module %s to %s",
-                language,
-                module,
-                trans_path
+            po_files.append(
+                self.write_translations(language, rows, module=module)
             )
 
-            if trans_path.exists():
-                origin_po_file = PoFileReader(trans_path.open('rb'))
-            else:
-                with trans_path.open("w+") as buffer:
-                    buffer.write("")
-
-                with trans_path.open('rb') as buffer:
-                    origin_po_file = PoFileReader(buffer)
-
-            with trans_path.open('wb+') as buffer:
-                po_writer = PoFileWriter(
-                    buffer,
-                    language,
-                    pofile=origin_po_file.pofile
-                )
-
-                po_writer.add_entries(rows)
-
-                po_writer.write()
-
-                po_files.append(po_writer)
-
         return po_files
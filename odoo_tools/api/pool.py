@@ -0,0 +1,273 @@
+import os
+import time
+import logging
+import threading
+from collections import defaultdict
+
+
+_logger = logging.getLogger(__name__)
+
+
+class PooledConnection(object):
+    """
+    Proxy around a psycopg2 connection borrowed from a
+    :class:`ConnectionPool`.
+
+    Calling :meth:`close` gives the connection back to the pool instead
+    of closing it, so it can be used with ``contextlib.closing`` like
+    a regular connection.
+    """
+    def __init__(self, pool, key, connection):
+        self._pool = pool
+        self._key = key
+        self._connection = connection
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def close(self):
+        if self._connection is None:
+            return
+
+        connection, self._connection = self._connection, None
+        self._pool.release(self._key, connection)
+
+
+class ConnectionPool(object):
+    """
+    Keep idle connections opened to postgresql so administrative queries
+    don't have to authenticate for each call.
+
+    Connections are pooled by connection parameters (database, host,
+    user, ...). When more than ``max_total`` connections are idle, the
+    least recently released ones are closed.
+
+    Connections are never shared between processes, a forked process
+    forgets the idle connections of its parent without closing them as
+    closing them would also close them for the parent.
+
+    Attributes:
+        max_idle (int): Delay in seconds after which an idle connection
+            is closed.
+
+        max_size (int): Maximum number of idle connections kept for
+            each connection parameters.
+
+        max_total (int): Maximum number of idle connections kept for
+            all the connection parameters.
+
+        check_after (int): Delay in seconds after which an idle connection
+            is checked with a ``SELECT 1`` before being reused.
+    """
+    def __init__(self, max_idle=60, max_size=4, check_after=10, max_total=16):
+        self.max_idle = max_idle
+        self.max_size = max_size
+        self.max_total = max_total
+        self.check_after = check_after
+        self.idle = defaultdict(list)
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+        # Connections of the parent process, kept open for the parent
+        self.inherited = []
+
+    def check_pid(self):
+        """
+        Forget the idle connections inherited from the parent process.
+
+        Must be called with :attr:`lock` held.
+        """
+        pid = os.getpid()
+
+        if pid == self.pid:
+            return
+
+        for connections in self.idle.values():
+            self.inherited.extend(
+                connection
+                for connection, _ in connections
+            )
+
+        self.idle = defaultdict(list)
+        self.pid = pid
+
+    @staticmethod
+    def make_key(connection_info):
+        return tuple(sorted(
+            (key, str(value))
+            for key, value in connection_info.items()
+        ))
+
+    def connect(self, connection_info):
+        import psycopg2
+
+        return psycopg2.connect(**connection_info)
+
+    def is_healthy(self, connection, idle_time):
+        if connection.closed:
+            return False
+
+        if idle_time < self.check_after:
+            return True
+
+        try:
+            with connection.cursor() as cr:
+                cr.execute("SELECT 1")
+            connection.rollback()
+        except Exception:
+            _logger.debug("Discarding broken connection", exc_info=True)
+            return False
+
+        return True
+
+    def discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def acquire(self, connection_info):
+        """
+        Returns a connection for ``connection_info``, reusing an idle
+        connection if a healthy one is available.
+
+        Returns:
+            PooledConnection: The connection to close once done.
+        """
+        key = self.make_key(connection_info)
+
+        while True:
+            with self.lock:
+                self.check_pid()
+                idle = self.idle.get(key)
+                if not idle:
+                    break
+                connection, released_at = idle.pop()
+                if not idle:
+                    del self.idle[key]
+
+            idle_time = time.time() - released_at
+
+            if (
+                idle_time <= self.max_idle and
+                self.is_healthy(connection, idle_time)
+            ):
+                return PooledConnection(self, key, connection)
+
+            self.discard(connection)
+
+        connection = self.connect(connection_info)
+        return PooledConnection(self, key, connection)
+
+    def release(self, key, connection):
+        if connection.closed:
+            return
+
+        try:
+            connection.rollback()
+        except Exception:
+            self.discard(connection)
+            return
+
+        evicted = []
+
+        with self.lock:
+            self.check_pid()
+
+            idle = self.idle[key]
+            if len(idle) < self.max_size:
+                idle.append((connection, time.time()))
+                connection = None
+
+            evicted.extend(self.evict())
+
+        if connection is not None:
+            evicted.append(connection)
+
+        for connection in evicted:
+            self.discard(connection)
+
+        self.prune()
+
+    def evict(self):
+        """
+        Remove the least recently released connections above
+        ``max_total``.
+
+        Must be called with :attr:`lock` held.
+
+        Returns:
+            list: The connections to close.
+        """
+        total = sum(len(idle) for idle in self.idle.values())
+        evicted = []
+
+        while total > self.max_total:
+            key = min(
+                (key for key in self.idle if self.idle[key]),
+                key=lambda key: self.idle[key][0][1]
+            )
+            idle = self.idle[key]
+            evicted.append(idle.pop(0)[0])
+            if not idle:
+                del self.idle[key]
+            total -= 1
+
+        return evicted
+
+    def prune(self):
+        """
+        Close the connections idle for more than ``max_idle`` seconds.
+        """
+        deadline = time.time() - self.max_idle
+        expired = []
+
+        with self.lock:
+            self.check_pid()
+
+            for key in list(self.idle):
+                idle = self.idle[key]
+                expired.extend(
+                    connection
+                    for connection, released_at in idle
+                    if released_at < deadline
+                )
+                idle[:] = [
+                    (connection, released_at)
+                    for connection, released_at in idle
+                    if released_at >= deadline
+                ]
+                if not idle:
+                    del self.idle[key]
+
+        for connection in expired:
+            self.discard(connection)
+
+    def close_database(self, database):
+        """
+        Close the idle connections to ``database``.
+        """
+        with self.lock:
+            self.check_pid()
+
+            keys = [
+                key
+                for key in self.idle
+                if ('database', database) in key
+            ]
+            idle = [
+                self.idle.pop(key)
+                for key in keys
+            ]
+
+        for connections in idle:
+            for connection, _ in connections:
+                self.discard(connection)
+
+    def close_all(self):
+        with self.lock:
+            self.check_pid()
+            idle, self.idle = self.idle, defaultdict(list)
+
+        for connections in idle.values():
+            for connection, _ in connections:
+                self.discard(connection)
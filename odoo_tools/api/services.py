@@ -1,5 +1,4 @@
 from zipfile import ZipFile
-import giturlparse
 import logging
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -38,6 +37,8 @@ class ServiceApi(object):
         if not fetch_path:
             fetch_path = target_path
 
+        import giturlparse
+
         results = []
 
         for key, addon in service.addons.items():
@@ -0,0 +1,325 @@
+import os
+import json
+import uuid
+import shutil
+import hashlib
+import logging
+from pathlib import Path
+from contextlib import closing, contextmanager
+
+from psycopg2 import sql
+
+from ..exceptions import OdooNotInstalled
+from ..modules.search import build_dependencies
+
+
+_logger = logging.getLogger(__name__)
+
+
+class TemplateCache(object):
+    """
+    Cache of initialized databases used as templates.
+
+    Initializing a database installs all its modules from scratch. The
+    template cache initializes a database ``odootools_tpl_<hash>`` once and
+    then creates the other databases with
+    ``CREATE DATABASE .. TEMPLATE odootools_tpl_<hash>`` and a copy of
+    the template filestore.
+
+    The hash covers the modules to install with their dependencies and
+    auto installed modules, the checksum of those modules, the country,
+    the languages, the demo data flag, the odoo version and the sources
+    of the odoo server. A change in any module or server source results
+    in a new template.
+
+    Templates are built under a temporary name and only flagged as
+    templates once renamed, so a build that was killed is never reused.
+    Processes building the same template wait for each other with a
+    postgresql advisory lock.
+
+    Attributes:
+        manage (ManagementApi): The management api of the environment.
+
+        prefix (str): Prefix of the template database names.
+    """
+    prefix = 'odootools_tpl_'
+
+    def __init__(self, manage):
+        self.manage = manage
+
+    def module_closure(self, modules):
+        """
+        Returns the modules installed in a database initialized with
+        ``modules``.
+
+        Returns:
+            list(Manifest): The manifests sorted by name.
+        """
+        available = {
+            mod.path.name: mod
+            for mod in self.manage.environment.modules.list()
+        }
+
+        dependencies = build_dependencies(
+            available,
+            list(set(modules) | {'base'}),
+        )
+
+        return sorted(
+            available[name]
+            for name in dependencies
+            if name in available
+        )
+
+    def server_checksum(self):
+        """
+        Returns a digest of the python sources of the odoo server.
+
+        The addons of the server are covered by the checksum of the
+        modules. As the server has many more files than a module, its
+        files are compared by size and modification time.
+
+        Returns:
+            str: The hexadecimal digest or None if odoo isn't installed.
+        """
+        try:
+            path = Path(self.manage.environment.path())
+        except OdooNotInstalled:
+            return None
+
+        check = hashlib.sha1(str(path).encode('utf-8'))
+
+        for root, dirs, files in os.walk(str(path)):
+            dirs[:] = sorted(
+                name
+                for name in dirs
+                if name != 'addons' and name != '__pycache__'
+            )
+
+            for name in sorted(files):
+                if not name.endswith('.py'):
+                    continue
+
+                file = Path(root) / name
+                stat = file.stat()
+                check.update("{}:{}:{}\0".format(
+                    file.relative_to(path), stat.st_size, stat.st_mtime_ns
+                ).encode('utf-8'))
+
+        return check.hexdigest()
+
+    def template_hash(self, modules, country, language, without_demo):
+        check = hashlib.sha1()
+
+        params = {
+            "country": country,
+            "language": language,
+            "without_demo": without_demo,
+            "odoo_version": self.manage.environment.odoo_version(),
+            "server": self.server_checksum(),
+        }
+        check.update(json.dumps(params, sort_keys=True).encode('utf-8'))
+
+        for module in self.module_closure(modules):
+            check.update(module.path.name.encode('utf-8'))
+            # The checksum only covers the content of the files
+            for file in module.files():
+                check.update(str(file.relative_to(module.path)).encode())
+            check.update(module.checksum().digest())
+
+        return check.hexdigest()
+
+    def template_name(self, modules, country, language, without_demo):
+        return "{}{}".format(
+            self.prefix,
+            self.template_hash(modules, country, language, without_demo)
+        )
+
+    def building_name(self, template):
+        return "{}_tmp".format(template)
+
+    def exists(self, database):
+        """
+        Returns True if the template ``database`` was fully built.
+        """
+        query = """
+            SELECT 1
+              FROM pg_database
+             WHERE datname = %s
+               AND datistemplate
+        """
+
+        with closing(self.manage.db_connect('postgres', pooled=True)) as conn:
+            with closing(conn.cursor()) as cr:
+                cr.execute(query, (database,))
+                return cr.fetchone() is not None
+
+    @contextmanager
+    def lock(self, template):
+        """
+        Hold a postgresql advisory lock for ``template`` until the
+        context exits.
+        """
+        key = int(hashlib.sha1(template.encode('utf-8')).hexdigest()[:15], 16)
+
+        with closing(self.manage.db_connect('postgres')) as conn:
+            conn.autocommit = True
+            with closing(conn.cursor()) as cr:
+                cr.execute("SELECT pg_advisory_lock(%s)", (key,))
+                try:
+                    yield
+                finally:
+                    cr.execute("SELECT pg_advisory_unlock(%s)", (key,))
+
+    def execute_admin(self, query):
+        """
+        Execute a query that cannot run in a transaction on the
+        postgres database.
+        """
+        with closing(self.manage.db_connect('postgres')) as conn:
+            conn.autocommit = True
+            with closing(conn.cursor()) as cr:
+                cr.execute(query)
+
+    def filestore(self, database):
+        return Path(self.manage.config.filestore(database))
+
+    def release(self, database):
+        """
+        Close the connections opened to ``database`` by this process as
+        postgresql refuses to copy a database in use.
+        """
+        self.manage.pool.close_database(database)
+
+        try:
+            from odoo.modules.registry import Registry
+            from odoo.sql_db import close_db
+        except ImportError:
+            return
+
+        Registry.delete(database)
+        close_db(database)
+
+    def drop(self, database):
+        self.release(database)
+        self.execute_admin(
+            sql.SQL("DROP DATABASE IF EXISTS {}").format(
+                sql.Identifier(database)
+            )
+        )
+        shutil.rmtree(str(self.filestore(database)), ignore_errors=True)
+
+    def build(self, template, modules, country, language, without_demo):
+        _logger.info("Building template database %s", template)
+
+        building = self.building_name(template)
+
+        # Leftovers of a build that was killed
+        self.drop(template)
+        self.drop(building)
+
+        dbapi = self.manage.db(building)
+        dbapi.default_entrypoints()
+
+        try:
+            dbapi.init(
+                modules,
+                country,
+                language=language,
+                without_demo=without_demo
+            )
+        except Exception:
+            self.drop(building)
+            raise
+
+        self.release(building)
+        self.execute_admin(
+            sql.SQL("ALTER DATABASE {} RENAME TO {}").format(
+                sql.Identifier(building),
+                sql.Identifier(template),
+            )
+        )
+
+        source = self.filestore(building)
+        if source.exists():
+            source.rename(self.filestore(template))
+
+        self.execute_admin(
+            sql.SQL("ALTER DATABASE {} WITH IS_TEMPLATE TRUE").format(
+                sql.Identifier(template)
+            )
+        )
+
+    def copy(self, template, database):
+        _logger.info("Creating database %s from %s", database, template)
+
+        self.release(template)
+        self.execute_admin(
+            sql.SQL("CREATE DATABASE {} WITH TEMPLATE {}").format(
+                sql.Identifier(database),
+                sql.Identifier(template),
+            )
+        )
+
+        try:
+            target = self.filestore(database)
+            # Leftovers of a database dropped without its filestore
+            shutil.rmtree(str(target), ignore_errors=True)
+
+            source = self.filestore(template)
+            if source.exists():
+                shutil.copytree(str(source), str(target))
+
+            self.reset_identity(database)
+        except Exception:
+            self.drop(database)
+            raise
+
+    def reset_identity(self, database):
+        """
+        Give a new uuid and secret to a database created from a template.
+        """
+        query = """
+            UPDATE ir_config_parameter
+               SET value = %s
+             WHERE key = %s
+        """
+
+        with closing(self.manage.db_connect(database, pooled=True)) as conn:
+            with closing(conn.cursor()) as cr:
+                cr.execute(query, (str(uuid.uuid1()), 'database.uuid'))
+                cr.execute(query, (str(uuid.uuid4()), 'database.secret'))
+            conn.commit()
+
+    def init_database(
+        self,
+        database,
+        modules,
+        country,
+        language,
+        without_demo
+    ):
+        """
+        Create ``database`` from the template matching the parameters,
+        building the template first if needed.
+
+        Returns:
+            str: The name of the template used.
+        """
+        template = self.template_name(
+            modules, country, language, without_demo
+        )
+
+        if not self.exists(template):
+            with self.lock(template):
+                # Another process may have built it in the meantime
+                if not self.exists(template):
+                    self.build(
+                        template, modules, country, language, without_demo
+                    )
+        else:
+            _logger.info("Using cached template database %s", template)
+
+        self.copy(template, database)
+
+        return template
@@ -1,4 +1,5 @@
 from ..api.environment import Environment
+from ..env import EnvironmentVariables
 from .plugins import InitOdooPlugin, LoggingPlugin, OverlayModulePlugin
 
 
@@ -6,7 +7,8 @@ class OdooApplication(object):
 
     def __init__(self, env=None, plugins=None):
         if env is None:
-            env = Environment()
+            # Environment variables don't change while serving requests
+            env = Environment(envvars=EnvironmentVariables.snapshot())
 
         if plugins is None:
             plugins = []
@@ -17,6 +17,10 @@ class AppMixin(object):
 
 
 class SessionStoreMixin(AppMixin):
+    # Unmodified sessions are saved again once this delay (in seconds)
+    # is elapsed to keep sliding their expiration.
+    session_refresh_interval = 60 * 60
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._session_store = None
@@ -40,6 +44,24 @@ class SessionStoreMixin(AppMixin):
     def session_gc(self):
         pass
 
+    def session_mtime(self, session):
+        """
+        Returns the timestamp of the last save of the session or None
+        if the session store cannot tell.
+        """
+        return None
+
+    def session_refresh_needed(self, session):
+        mtime = self.session_mtime(session)
+
+        if mtime is None:
+            return False
+
+        return time.time() - mtime > self.session_refresh_interval
+
+    def refresh_session(self, session):
+        self.session_store.save(session)
+
     def make_session_store(self):
         raise NotImplementedError("make_session_store not implemented.")
 
@@ -6,6 +6,7 @@ from pathlib import Path
 from . import dispatchers
 from .dispatchers import DispatcherNotFoundError
 from . import routers
+from .registries import RegistryManager
 
 from .request import (
     Request,
@@ -128,6 +129,10 @@ class BaseApp(object):
 
 
 class BaseWSGIApp(object):
+    registry_max_size = None
+    registry_max_memory = None
+    registry_max_idle = None
+
     def __init__(self, application):
         super().__init__(application)
 
@@ -150,7 +155,15 @@ class BaseWSGIApp(object):
         # TODO compute at init time
         self.request_type = self.build_request_type()
 
-        self.registries = {}
+        self.registries = self.make_registry_manager()
+        self.db_catalog = None
+
+    def make_registry_manager(self):
+        return RegistryManager(
+            max_size=self.registry_max_size,
+            max_memory=self.registry_max_memory,
+            max_idle=self.registry_max_idle,
+        )
 
     def get_db_router(self, db):
         from odoo.http import request
@@ -161,15 +174,7 @@ class BaseWSGIApp(object):
         return request.registry['ir.http'].routing_map()
 
     def get_registry(self, name):
-        from odoo.modules.registry import Registry
-        return Registry(name)
-        # if name in self.registries:
-        #     return self.registries[name]
-
-        # registry = Registry.new(name)
-        # self.registries[name] = registry
-
-        # return registry
+        return self.registries.get(name)
 
     def _request_type(self):
         return [Request]
@@ -0,0 +1,205 @@
+import os
+import time
+import threading
+import logging
+from collections import OrderedDict
+
+_logger = logging.getLogger(__name__)
+
+
+def get_rss():
+    """
+    Returns the resident memory of the current process in bytes.
+
+    Returns:
+        int|None: The resident memory or None if it cannot be read
+            on the current platform.
+    """
+    try:
+        with open('/proc/self/statm') as fin:
+            pages = int(fin.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+
+    return pages * os.sysconf('SC_PAGE_SIZE')
+
+
+class RegistryInfo(object):
+    """
+    Metrics of a registry loaded by the :class:`RegistryManager`.
+
+    Attributes:
+        name (str): The database name.
+
+        registry (Registry): The odoo registry.
+
+        load_time (float): Time in seconds spent to load the registry.
+
+        memory (int|None): Growth of the resident memory in bytes while
+            loading the registry.
+    """
+    def __init__(self, name, registry, load_time, memory=None):
+        self.name = name
+        self.registry = registry
+        self.load_time = load_time
+        self.memory = memory
+        self.loaded_at = time.time()
+        self.last_used = self.loaded_at
+        self.hits = 0
+
+    def touch(self):
+        self.last_used = time.time()
+        self.hits += 1
+
+    def values(self):
+        return {
+            "load_time": self.load_time,
+            "memory": self.memory,
+            "loaded_at": self.loaded_at,
+            "last_used": self.last_used,
+            "hits": self.hits,
+        }
+
+
+class RegistryManager(object):
+    """
+    Keeps track of the registries loaded by the application.
+
+    Registries are loaded lazily on their first use. The least recently
+    used registries are unloaded when there are more than ``max_size``
+    registries loaded, when the process uses more than ``max_memory`` bytes
+    or when they haven't been used for ``max_idle`` seconds.
+
+    Attributes:
+        max_size (int|None): Maximum number of registries loaded.
+
+        max_memory (int|None): Maximum resident memory of the process in
+            bytes.
+
+        max_idle (int|None): Delay in seconds after which an unused
+            registry is unloaded.
+    """
+    def __init__(self, max_size=None, max_memory=None, max_idle=None):
+        self.max_size = max_size
+        self.max_memory = max_memory
+        self.max_idle = max_idle
+        self.registries = OrderedDict()
+        self.lock = threading.RLock()
+
+    def load_registry(self, name):
+        from odoo.modules.registry import Registry
+        return Registry(name)
+
+    def unload_registry(self, name):
+        from odoo.modules.registry import Registry
+        Registry.delete(name)
+
+    def get(self, name):
+        """
+        Returns the registry of the database ``name``, loading it if
+        needed.
+
+        Odoo may replace a registry, for example after installing modules.
+        The registry is always requested from odoo and only its metrics
+        are kept here.
+        """
+        self.evict_idle()
+
+        with self.lock:
+            info = self.registries.get(name)
+
+        rss = get_rss() if info is None else None
+        start = time.perf_counter()
+        registry = self.load_registry(name)
+        load_time = time.perf_counter() - start
+
+        with self.lock:
+            info = self.registries.get(name)
+
+            if info is None or info.registry is not registry:
+                memory = None
+                if rss is not None:
+                    memory = max((get_rss() or rss) - rss, 0)
+
+                _logger.info(
+                    "Loaded registry %s in %.3fs", name, load_time
+                )
+
+                info = RegistryInfo(name, registry, load_time, memory)
+                self.registries[name] = info
+
+            info.touch()
+            self.registries.move_to_end(name)
+
+        self.evict(keep=name)
+
+        return registry
+
+    def unload(self, name):
+        with self.lock:
+            info = self.registries.pop(name, None)
+
+        if info is None:
+            return
+
+        _logger.info("Unloading registry %s", name)
+        self.unload_registry(name)
+
+        return info
+
+    def evict(self, keep=None):
+        """
+        Unload the least recently used registries until the bounds of
+        the manager are respected. The registry ``keep`` is never
+        unloaded.
+        """
+        with self.lock:
+            to_unload = [
+                name
+                for name in self.registries
+                if name != keep
+            ]
+
+        if self.max_size is not None:
+            while to_unload and len(self.registries) > self.max_size:
+                self.unload(to_unload.pop(0))
+
+        rss = get_rss() if self.max_memory is not None else None
+
+        # Memory isn't always given back to the system when a registry
+        # is unloaded, so the memory of unloaded registries is deducted
+        # from the current resident memory instead of measuring it again.
+        while rss is not None and to_unload and rss > self.max_memory:
+            info = self.unload(to_unload.pop(0))
+            if not info or not info.memory:
+                break
+            rss -= info.memory
+
+    def evict_idle(self):
+        if self.max_idle is None:
+            return
+
+        deadline = time.time() - self.max_idle
+
+        with self.lock:
+            idle = []
+            for name, info in self.registries.items():
+                if info.last_used >= deadline:
+                    break
+                idle.append(name)
+
+        for name in idle:
+            self.unload(name)
+
+    def metrics(self):
+        """
+        Returns metrics of the loaded registries.
+
+        Returns:
+            dict: ``{name: {"load_time": .., "memory": .., ...}}``
+        """
+        with self.lock:
+            return {
+                name: info.values()
+                for name, info in self.registries.items()
+            }
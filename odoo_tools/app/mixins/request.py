@@ -1,4 +1,6 @@
 import collections
+import hashlib
+import pickle
 import time
 import logging
 
@@ -117,6 +119,34 @@ class SessionManagementMixin(BaseHTTPRequest):
         httprequest.session.context['lang'] = 'en_US'
 
         self.explicit_session = explicit_session
+        self.session_hash = self.hash_session(httprequest.session)
+
+    def hash_session(self, session):
+        """
+        Returns a hash of the serialized session data or None if
+        the session cannot be serialized.
+        """
+        try:
+            data = pickle.dumps(sorted(dict(session).items()))
+        except Exception:
+            return None
+
+        return hashlib.sha1(data).hexdigest()
+
+    def session_modified(self, session):
+        """
+        Check if the session changed since it was loaded.
+
+        Odoo flags sessions as modified whenever a key is set even
+        if the value didn't change, so the serialized data is compared
+        against the one computed in :meth:`setup_session`.
+        """
+        if session.new or session.rotate:
+            return True
+
+        session_hash = self.hash_session(session)
+
+        return session_hash is None or session_hash != self.session_hash
 
     @property
     def __save_session(self):
@@ -134,7 +164,10 @@ class SessionManagementMixin(BaseHTTPRequest):
         if not self.__save_session:
             return response
 
-        if httprequest.session.should_save:
+        if (
+            httprequest.session.should_save and
+            self.session_modified(httprequest.session)
+        ):
             if httprequest.session.rotate:
                 self.app.session_store.delete(httprequest.session)
                 httprequest.session.sid = self.app.session_store.generate_key()
@@ -147,6 +180,8 @@ class SessionManagementMixin(BaseHTTPRequest):
                 httprequest.session.modified = True
 
             self.app.session_store.save(httprequest.session)
+        elif self.app.session_refresh_needed(httprequest.session):
+            self.app.refresh_session(httprequest.session)
 
         if not self.explicit_session and hasattr(response, 'set_cookie'):
             response.set_cookie(
@@ -371,9 +406,46 @@ class DbManagementMixin(
     def db(self):
         return self.httprequest.session.db
 
-    def pre_dispatch(self):
-        from odoo.http import db_filter, db_monodb
+    @property
+    def hostname(self):
+        return self.httprequest.environ.get('HTTP_HOST', '').split(':')[0]
+
+    def db_filter(self, dbs):
+        """
+        Filter the databases allowed for the current request.
+
+        When the application has a database catalog, the lookup is
+        done in memory instead of using odoo's db_filter.
+        """
+        catalog = getattr(self.app, 'db_catalog', None)
+
+        if catalog is None:
+            from odoo.http import db_filter
+            return db_filter(dbs, httprequest=self.httprequest)
+
+        allowed = catalog.db_filter(self.hostname)
 
+        return [
+            db
+            for db in dbs
+            if db in allowed
+        ]
+
+    def db_monodb(self):
+        catalog = getattr(self.app, 'db_catalog', None)
+
+        if catalog is None:
+            from odoo.http import db_monodb
+            return db_monodb(self.httprequest)
+
+        dbs = catalog.db_filter(self.hostname)
+
+        if len(dbs) == 1:
+            return dbs[0]
+
+        return None
+
+    def pre_dispatch(self):
         super().pre_dispatch()
 
         if 'db' in self.httprequest.args:
@@ -383,7 +455,7 @@ class DbManagementMixin(
 
         # Check if session.db is legit
         if db:
-            if db not in db_filter([db], httprequest=self.httprequest):
+            if db not in self.db_filter([db]):
                 _logger.warning(
                     (
                         "Logged into database '%s', but dbfilter "
@@ -395,7 +467,7 @@ class DbManagementMixin(
                 db = None
 
         if not db:
-            self.httprequest.session.db = db_monodb(self.httprequest)
+            self.httprequest.session.db = self.db_monodb()
 
     def _is_cors_preflight(self, endpoint):
         return False
@@ -1,6 +1,9 @@
 import os
 import random
 import time
+import threading
+from collections import OrderedDict
+from copy import deepcopy
 from pathlib import Path
 import logging
 
@@ -9,6 +12,141 @@ from .app import SessionStoreMixin
 _logger = logging.getLogger(__name__)
 
 
+class LRUSessionStore(object):
+    """
+    Two level session store.
+
+    Recently used sessions are kept in a bounded in-process LRU in front
+    of a backend session store. A cached session is only returned if its
+    version in the backend didn't change since it was cached. For stores
+    that keep sessions in files, the version is the mtime of the session
+    file. It prevents a worker from returning a stale session that was
+    modified by an other worker. Sessions of backends that don't expose
+    a version are never served from the cache.
+
+    Sessions are only written to the backend when their data changed
+    since they were loaded or last saved.
+
+    Any attribute not defined here is looked up on the backend store.
+
+    Attributes:
+        store (SessionStore): The backend session store.
+
+        max_size (int): Maximum number of sessions kept in memory.
+    """
+
+    def __init__(self, store, max_size=1024):
+        self.store = store
+        self.max_size = max_size
+        self.sessions = OrderedDict()
+        self.lock = threading.Lock()
+
+    def __getattr__(self, name):
+        return getattr(self.store, name)
+
+    def session_version(self, sid):
+        """
+        Returns the version of the session in the backend store.
+
+        Returns:
+            int|None|False: The mtime of the session file, None if the
+                backend doesn't expose session files and False if the
+                session file doesn't exist.
+        """
+        get_filename = getattr(self.store, 'get_session_filename', None)
+
+        if get_filename is None:
+            return None
+
+        try:
+            return os.stat(get_filename(sid)).st_mtime_ns
+        except OSError:
+            return False
+
+    def remember(self, sid, data, version):
+        if version is None or version is False:
+            self.forget(sid)
+            return
+
+        with self.lock:
+            self.sessions[sid] = (version, deepcopy(data))
+            self.sessions.move_to_end(sid)
+
+            while len(self.sessions) > self.max_size:
+                self.sessions.popitem(last=False)
+
+    def forget(self, sid):
+        with self.lock:
+            self.sessions.pop(sid, None)
+
+    def cached(self, sid, version):
+        # Without a version, a cached session can't be checked
+        if version is None or version is False:
+            return None
+
+        with self.lock:
+            cached = self.sessions.get(sid)
+
+            if cached is None or cached[0] != version:
+                return None
+
+            self.sessions.move_to_end(sid)
+            return deepcopy(cached[1])
+
+    def new(self):
+        return self.store.new()
+
+    def get(self, sid):
+        if not self.store.is_valid_key(sid):
+            return self.store.new()
+
+        version = self.session_version(sid)
+
+        data = self.cached(sid, version)
+        if data is not None:
+            return self.store.session_class(data, sid, False)
+
+        session = self.store.get(sid)
+
+        if session.new:
+            self.forget(sid)
+        else:
+            self.remember(sid, dict(session), version)
+
+        return session
+
+    def save(self, session):
+        data = dict(session)
+        version = self.session_version(session.sid)
+
+        if self.cached(session.sid, version) == data:
+            return
+
+        self.store.save(session)
+        self.remember(session.sid, data, self.session_version(session.sid))
+
+    def delete(self, session):
+        self.forget(session.sid)
+        self.store.delete(session)
+
+
+class CachedSessionStoreMixin(SessionStoreMixin):
+    """
+    Wraps the session store of the next mixin into a
+    :class:`LRUSessionStore`.
+    """
+    session_cache_size = 1024
+
+    def make_session_store(self):
+        store = super().make_session_store()
+
+        _logger.debug(
+            'HTTP sessions cached in memory (max %s)', self.session_cache_size
+        )
+
+        return LRUSessionStore(store, max_size=self.session_cache_size)
+
+
 class FileSystemSessionStoreMixin(SessionStoreMixin):
     def __init__(self, application):
         super().__init__(application)
@@ -29,6 +167,24 @@ class FileSystemSessionStoreMixin(SessionStoreMixin):
             renew_missing=True
         )
 
+    def session_mtime(self, session):
+        filename = self.session_store.get_session_filename(session.sid)
+
+        try:
+            return os.path.getmtime(filename)
+        except OSError:
+            return None
+
+    def refresh_session(self, session):
+        filename = self.session_store.get_session_filename(session.sid)
+
+        # Bumping the mtime is enough for the session gc and
+        # avoids serializing the session again.
+        try:
+            os.utime(filename)
+        except OSError:
+            super().refresh_session(session)
+
     def session_gc(self, delta=60*60*24*7):
         if random.random() > 0.001:
             return
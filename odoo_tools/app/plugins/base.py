@@ -1,6 +1,10 @@
+import os
 import importlib
 import sys
 import logging
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 
 from overlaymodule import OverlayFinder
 
@@ -10,6 +14,7 @@ from ..mixins.app import (
     EnvironmentManagerMixin
 )
 from ..mixins.sessions import (
+    CachedSessionStoreMixin,
     FileSystemSessionStoreMixin
 )
 
@@ -23,6 +28,25 @@ from ..mixins.http import (
 
 _logger = logging.getLogger(__name__)
 
+# Plugins preloading registries in the background
+_preloading = weakref.WeakSet()
+
+
+def wait_preloads():
+    """
+    Wait for the registries preloaded in the background.
+
+    Called before forking, so the preload threads don't hold the lock of
+    the registries or database connections when a prefork server forks
+    its workers.
+    """
+    for plugin in list(_preloading):
+        plugin.wait_preload()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(before=wait_preloads)
+
 
 class Plugin(object):
     def __init__(self, *args, **kwargs):
@@ -105,14 +129,52 @@ class AddonsPathPlugin(Plugin):
 
 
 class InitOdooPlugin(Plugin):
-    def __init__(self, db_name=None):
+    """
+    Initialize odoo and preload the registries of the databases.
+
+    Args:
+        db_name (str): Databases to preload as a csv value.
+
+        preload (bool): Preload the registries at startup instead of
+            loading them on their first request.
+
+        preload_jobs (int): Number of threads used to preload the
+            registries.
+
+        preload_ready (int): The application is ready once this number of
+            registries is loaded. The other registries keep being loaded in
+            the background. By default, it waits for all the registries.
+            Forking the process waits for the registries still loading.
+
+        preload_priority (callable): Key used to sort the databases before
+            loading them. It receives a database as returned by
+            ``db_list``. For example, to load the most recently active
+            databases first.
+    """
+    def __init__(
+        self,
+        db_name=None,
+        preload=True,
+        preload_jobs=1,
+        preload_ready=None,
+        preload_priority=None
+    ):
         self.db_name = db_name
+        self.preload = preload
+        self.preload_jobs = preload_jobs
+        self.preload_ready = preload_ready
+        self.preload_priority = preload_priority
+        self.ready = threading.Event()
+        self.preload_futures = []
 
     def init_environment(self):
         self.load_configuration()
 
     def postinit_environment(self):
-        self.preload_databases()
+        if self.preload:
+            self.preload_databases()
+
+        self.ready.set()
 
     def load_configuration(self):
         self.app.env.manage.initialize_odoo()
@@ -134,29 +196,183 @@ class InitOdooPlugin(Plugin):
         for db in manage.db_list(**version_filter):
             yield db
 
-    def preload_databases(self):
+    def load_registry(self, name):
         from odoo.modules.registry import Registry
 
+        application = self.app.application
+
+        # Go through the registry manager of the application to
+        # keep track of the preloaded registries.
+        if application is not None and hasattr(application, 'registries'):
+            return application.registries.get(name)
+
+        return Registry.new(name)
+
+    def sort_databases(self, databases):
+        if self.preload_priority is None:
+            return databases
+
+        return sorted(databases, key=self.preload_priority)
+
+    def preload_database(self, db):
+        try:
+            self.load_registry(db["name"])
+        except Exception:
+            _logger.error(
+                f"Couldn't load database registry {db['name']}",
+                exc_info=True
+            )
+
+    def preload_databases(self):
+        """
+        Preload the registries of the databases.
+
+        Odoo holds a lock while creating a registry, so registries
+        loaded by multiple threads are still mostly created one after the
+        other. Though, the worker can be marked ready once the first
+        registries are loaded while the others keep loading in the
+        background.
+        """
         # odoo_version = f"{self.app.env.odoo_version()}.0"
-        for db in self.get_databases():
-            try:
-                # TODO maybe load the registry with Registry(db) instead.
-                Registry.new(db["name"])
-            except Exception:
-                _logger.error(
-                    f"Couldn't load database registry {db['name']}",
-                    exc_info=True
-                )
+        databases = self.sort_databases(list(self.get_databases()))
+
+        executor = ThreadPoolExecutor(max_workers=self.preload_jobs)
+
+        futures = [
+            executor.submit(self.preload_database, db)
+            for db in databases
+        ]
+
+        executor.shutdown(wait=False)
+
+        self.preload_futures = futures
+        _preloading.add(self)
+
+        if self.preload_ready is None:
+            self.wait_preload()
+        elif self.preload_ready > 0:
+            # Ready once any preload_ready registries are loaded, they
+            # may not be the first ones submitted
+            for count, _future in enumerate(as_completed(futures), 1):
+                if count >= self.preload_ready:
+                    break
+
+    def wait_preload(self):
+        """
+        Wait until all the registries are preloaded.
+        """
+        wait(self.preload_futures)
+        _preloading.discard(self)
 
 
 class SessionStorePlugin(Plugin):
-    def __init__(self, session_type=None):
+    def __init__(
+        self,
+        session_type=None,
+        cache_size=None,
+        refresh_interval=None
+    ):
         if session_type is None:
             session_type = FileSystemSessionStoreMixin
         self.session_type = session_type
+        self.cache_size = cache_size
+        self.refresh_interval = refresh_interval
+
+    def prepare_environment(self):
+        session_type = self.session_type
+
+        if self.refresh_interval is not None:
+            session_type = type(
+                session_type.__name__,
+                (session_type,),
+                {'session_refresh_interval': self.refresh_interval}
+            )
+
+        self.app.application_mixins.insert(0, session_type)
+
+        if self.cache_size:
+            cache_type = type(
+                'CachedSessionStore',
+                (CachedSessionStoreMixin,),
+                {'session_cache_size': self.cache_size}
+            )
+            self.app.application_mixins.insert(0, cache_type)
+
+
+class RegistryManagerPlugin(Plugin):
+    """
+    Set the bounds of the registries kept loaded by the application.
+
+    Args:
+        max_size (int): Maximum number of registries loaded.
+
+        max_memory (int): Maximum resident memory in bytes before
+            unloading the least recently used registries.
+
+        max_idle (int): Delay in seconds after which unused registries
+            are unloaded.
+    """
+    def __init__(self, max_size=None, max_memory=None, max_idle=None):
+        super().__init__()
+        self.max_size = max_size
+        self.max_memory = max_memory
+        self.max_idle = max_idle
 
     def prepare_environment(self):
-        self.app.application_mixins.insert(0, self.session_type)
+        registry_type = type(
+            'RegistryManagerSettings',
+            (object,),
+            {
+                'registry_max_size': self.max_size,
+                'registry_max_memory': self.max_memory,
+                'registry_max_idle': self.max_idle,
+            }
+        )
+        self.app.application_mixins.insert(0, registry_type)
+
+
+class DbCatalogPlugin(Plugin):
+    """
+    Select the database of requests using the database catalog of the
+    environment instead of querying postgresql.
+
+    Args:
+        ttl (int): Time in seconds after which the catalog is refreshed.
+
+        refresh_interval (int): If set, the catalog is refreshed in a
+            background thread every ``refresh_interval`` seconds.
+    """
+    def __init__(self, ttl=60, refresh_interval=None):
+        super().__init__()
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+
+    def postinit_environment(self):
+        catalog = self.app.env.manage.catalog
+        catalog.ttl = self.ttl
+
+        if self.refresh_interval:
+            catalog.start(self.refresh_interval)
+
+        self.app.application.db_catalog = catalog
+
+
+class CompiledTranslationsPlugin(Plugin):
+    """
+    Load the po files from catalogs compiled with
+    ``odootools module compile-translations``.
+
+    Args:
+        cache_dir (str): Folder of the compiled catalogs.
+    """
+    def __init__(self, cache_dir):
+        super().__init__()
+        self.cache_dir = cache_dir
+
+    def init_environment(self):
+        from ...modules.compiled import install_loader
+
+        install_loader(self.cache_dir)
 
 
 class DbRoutePlugin(Plugin):
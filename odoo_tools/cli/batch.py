@@ -0,0 +1,171 @@
+"""
+Batch
+=====
+
+Run many commands of the cli in a single process. The commands share
+their :class:`Environment`, so odoo is imported, the config is read and
+the modules are listed only once, and odoo registries loaded by a
+command are reused by the next ones.
+
+Steps are described in a json or yaml document, either as a list or as
+the ``steps`` key of a mapping. A step is a command line, a list of
+arguments or a mapping with the keys ``args``, ``name`` and
+``continue_on_error``:
+
+.. code:: yaml
+
+    steps:
+      - config set db_name demo
+      - [user, create, --login, demo, --password, demo]
+      - name: Install sale
+        args: manage install sale
+        continue_on_error: true
+
+Steps without global options use the environment of the ``batch``
+command, steps passing ``-c`` or ``--exclude-odoo`` get their own.
+"""
+import json
+import time
+import shlex
+
+from ..exceptions import ArgumentError
+
+
+class Step(object):
+    """
+    A command of a batch.
+
+    Attributes:
+        args (list(str)): The arguments of the command line.
+
+        name (str): Name displayed in the report.
+
+        continue_on_error (bool): Run the next steps if it fails.
+
+        exit_code (int): Exit code of the command, None if it wasn't
+            executed.
+
+        duration (float): Execution time in seconds.
+    """
+    def __init__(self, args, name=None, continue_on_error=False):
+        self.args = args
+        self.name = name or " ".join(args)
+        self.continue_on_error = continue_on_error
+        self.exit_code = None
+        self.duration = 0.0
+
+    @classmethod
+    def parse(cls, value):
+        if isinstance(value, dict):
+            unknown = set(value) - {'args', 'name', 'continue_on_error'}
+            if unknown or 'args' not in value:
+                raise ArgumentError("Invalid step {!r}".format(value))
+
+            return cls(
+                cls.parse_args(value['args']),
+                name=value.get('name'),
+                continue_on_error=bool(value.get('continue_on_error', False)),
+            )
+
+        return cls(cls.parse_args(value))
+
+    @staticmethod
+    def parse_args(value):
+        if isinstance(value, str):
+            return shlex.split(value)
+
+        if (
+            isinstance(value, list) and
+            all(isinstance(arg, (str, int, float)) for arg in value)
+        ):
+            return [str(arg) for arg in value]
+
+        raise ArgumentError("Invalid step arguments {!r}".format(value))
+
+    @property
+    def status(self):
+        if self.exit_code is None:
+            return 'skipped'
+
+        return 'ok' if self.exit_code == 0 else 'failed'
+
+
+def load_steps(content, format=None):
+    """
+    Parse the steps of a batch.
+
+    Args:
+        content (str): A json or yaml document.
+
+        format (str): ``json`` or ``yaml``, by default yaml is used when
+            the document isn't valid json.
+
+    Returns:
+        list(Step): The steps of the batch.
+    """
+    if format != 'yaml':
+        try:
+            data = json.loads(content)
+        except ValueError as exc:
+            if format == 'json':
+                raise ArgumentError("Invalid json batch: {}".format(exc))
+            format = 'yaml'
+
+    if format == 'yaml':
+        try:
+            import yaml
+        except ImportError:
+            raise ArgumentError("PyYAML is required to read yaml batches")
+
+        try:
+            data = yaml.safe_load(content)
+        except yaml.YAMLError as exc:
+            raise ArgumentError("Invalid yaml batch: {}".format(exc))
+
+    if isinstance(data, dict):
+        data = data.get('steps')
+
+    if not isinstance(data, list):
+        raise ArgumentError("A batch must contain a list of steps")
+
+    return [Step.parse(value) for value in data]
+
+
+def run_steps(steps, run, keep_going=False, callback=None):
+    """
+    Execute the steps in order.
+
+    The execution stops at the first failing step unless ``keep_going``
+    is set or the step allows to continue on error.
+
+    Args:
+        steps (list(Step)): The steps to execute.
+
+        run (callable): Function executing the arguments of a step and
+            returning its exit code.
+
+        keep_going (bool): Continue after failing steps.
+
+        callback (callable): Called with the index and the step once
+            each step is executed.
+
+    Returns:
+        bool: True if all the steps succeeded.
+    """
+    success = True
+
+    for index, step in enumerate(steps):
+        start = time.perf_counter()
+        step.exit_code = run(step.args)
+        step.duration = time.perf_counter() - start
+
+        if callback:
+            callback(index, step)
+
+        if step.exit_code != 0:
+            success = False
+
+            if not (keep_going or step.continue_on_error):
+                break
+
+    return success
@@ -0,0 +1,73 @@
+import click
+
+from ..batch import load_steps, run_steps
+from ...exceptions import ArgumentError
+
+
+@click.command(
+    help=(
+        "Run the commands listed in a json or yaml FILE in a single "
+        "process. Reads the standard input when FILE is -."
+    )
+)
+@click.argument('file', type=click.File('r'), default='-')
+@click.option(
+    '--format',
+    'file_format',
+    type=click.Choice(['json', 'yaml']),
+    help="Format of the file, detected by default",
+)
+@click.option(
+    '--keep-going',
+    is_flag=True,
+    default=False,
+    help="Run the next steps when a step fails",
+)
+@click.pass_context
+def batch(ctx, file, file_format, keep_going):
+    from ..odot import run
+
+    try:
+        steps = load_steps(file.read(), format=file_format)
+    except (ArgumentError, IOError) as exc:
+        raise click.ClickException(str(exc))
+
+    # Steps without global options reuse the environment of the batch
+    environments = {(None, False): ctx.obj['env']}
+
+    def run_step(args):
+        return run(args, obj={'environments': environments})
+
+    def report(index, step):
+        click.echo(
+            "[{}/{}] {}: {} in {:.2f}s".format(
+                index + 1,
+                len(steps),
+                step.name,
+                step.status if step.exit_code == 0 else
+                "{} (exit code {})".format(step.status, step.exit_code),
+                step.duration,
+            ),
+            err=True
+        )
+
+    success = run_steps(
+        steps, run_step, keep_going=keep_going, callback=report
+    )
+
+    counts = {'ok': 0, 'failed': 0, 'skipped': 0}
+    for step in steps:
+        counts[step.status] += 1
+
+    click.echo(
+        "{} steps: {ok} ok, {failed} failed, {skipped} skipped "
+        "in {duration:.2f}s".format(
+            len(steps),
+            duration=sum(step.duration for step in steps),
+            **counts
+        ),
+        err=True
+    )
+
+    if not success:
+        ctx.exit(1)
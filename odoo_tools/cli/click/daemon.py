@@ -0,0 +1,80 @@
+import click
+
+from ..daemon import (
+    DaemonServer,
+    SOCKET_ENV,
+    default_socket_path,
+    request,
+)
+
+
+def socket_option(func):
+    return click.option(
+        '--socket',
+        'socket_path',
+        envvar=SOCKET_ENV,
+        default=default_socket_path,
+        type=click.Path(dir_okay=False),
+        help="Unix socket of the daemon",
+    )(func)
+
+
+@click.group(
+    help=(
+        "Keep the environment warm between commands. Set "
+        "ODOOTOOLS_DAEMON_SOCKET to forward commands to the daemon."
+    )
+)
+@click.pass_context
+def daemon(ctx):
+    pass
+
+
+@daemon.command(help="Run the daemon in the foreground.")
+@socket_option
+@click.pass_context
+def start(ctx, socket_path):
+    server = DaemonServer(socket_path)
+
+    try:
+        server.bind()
+    except RuntimeError as exc:
+        raise click.ClickException(str(exc))
+
+    click.echo("Listening on {}".format(socket_path), err=True)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.close()
+
+
+@daemon.command(help="Stop the daemon.")
+@socket_option
+@click.pass_context
+def stop(ctx, socket_path):
+    response = request(socket_path, {"action": "stop"}, timeout=5)
+
+    if response is None:
+        click.echo("The daemon isn't running", err=True)
+        ctx.exit(1)
+
+    click.echo("Stopped daemon {}".format(response['pid']))
+
+
+@daemon.command(help="Show if the daemon is running.")
+@socket_option
+@click.pass_context
+def status(ctx, socket_path):
+    response = request(socket_path, {"action": "ping"}, timeout=5)
+
+    if response is None:
+        click.echo("The daemon isn't running", err=True)
+        ctx.exit(1)
+
+    click.echo(
+        "Daemon {pid} listening on {path}, {served} commands served".format(
+            path=socket_path,
+            **response
+        )
+    )
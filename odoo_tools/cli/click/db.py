@@ -46,6 +46,13 @@ def db():
 @click.option(
     '--hostname',
 )
+@click.option(
+    '-j',
+    '--jobs',
+    type=int,
+    default=8,
+    help="Number of databases probed concurrently"
+)
 @click.pass_context
 def list(
     ctx,
@@ -55,7 +62,8 @@ def list(
     include_extra_dbs,
     hostname,
     db_name,
-    dbfilter
+    dbfilter,
+    jobs
 ):
     env = ctx.obj['env']
 
@@ -78,6 +86,7 @@ def list(
         filter_version=filter_version,
         filter_invalid=filter_invalid,
         include_extra_dbs=include_extra_dbs,
+        jobs=jobs,
     )
 
     for db in dbs:
@@ -111,8 +120,22 @@ def list(
     help="Languages to use",
     multiple=True
 )
+@click.option(
+    '--template-cache',
+    help="Create the database from a cached template database",
+    is_flag=True,
+    default=False
+)
 @click.pass_context
-def init(ctx, database, modules, country, language, with_demo):
+def init(
+    ctx,
+    database,
+    modules,
+    country,
+    language,
+    with_demo,
+    template_cache
+):
     env = ctx.obj['env']
     env.check_odoo()
     manage = env.manage.db(database)
@@ -132,7 +155,8 @@ def init(ctx, database, modules, country, language, with_demo):
         to_install,
         country=country,
         without_demo=not with_demo,
-        language=",".join(language)
+        language=",".join(language),
+        template_cache=template_cache,
     )
 
     return True
@@ -19,7 +19,7 @@ def manage():
 @manage.command(
     help="Update specified modules in a database."
 )
-@click.argument("database")
+@click.argument("database", required=False)
 @click.option(
     '-m',
     '--modules',
@@ -27,13 +27,75 @@ def manage():
     help="Modules to install",
     multiple=True
 )
+@click.option(
+    '--all-dbs',
+    is_flag=True,
+    default=False,
+    help="Update all the databases returned by db list"
+)
+@click.option(
+    '-j',
+    '--jobs',
+    type=int,
+    default=4,
+    help="Number of databases updated concurrently with --all-dbs"
+)
+@click.option(
+    '--timeout',
+    type=int,
+    help="Time in seconds after which the update of a database is killed"
+)
+@click.option(
+    '--log-dir',
+    type=click.Path(file_okay=False),
+    default='odootools-update',
+    help="Folder of the logs and state of each database"
+)
+@click.option(
+    '--resume',
+    is_flag=True,
+    default=False,
+    help="Skip databases updated by a previous run"
+)
+@click.option(
+    '--filter-version',
+    default='current'
+)
+@click.option(
+    '--include-extra-dbs',
+    default=False,
+    is_flag=True,
+    help="Include databases not present in db_name"
+)
+@click.option(
+    '-d',
+    '--db-name',
+    help="explicit db_name value ignores config value"
+)
+@click.option(
+    '--dbfilter',
+    help="explicit dbfilter"
+)
+@click.option(
+    '--hostname',
+)
 @click.pass_context
-def update(ctx, database, modules):
+def update(
+    ctx,
+    database,
+    modules,
+    all_dbs,
+    jobs,
+    timeout,
+    log_dir,
+    resume,
+    filter_version,
+    include_extra_dbs,
+    db_name,
+    dbfilter,
+    hostname
+):
     env = ctx.obj['env']
-    env.check_odoo()
-    manage = env.manage.db(database)
-
-    manage.default_entrypoints()
 
     to_update = {
         mod
@@ -41,6 +103,32 @@ def update(ctx, database, modules):
         for mod in mods
     }
 
+    if all_dbs:
+        if database:
+            raise click.UsageError("Cannot use DATABASE with --all-dbs")
+
+        return update_all(
+            ctx,
+            to_update,
+            jobs=jobs,
+            timeout=timeout,
+            log_dir=log_dir,
+            resume=resume,
+            filter_version=filter_version,
+            include_extra_dbs=include_extra_dbs,
+            db_name=db_name,
+            dbfilter=dbfilter,
+            hostname=hostname
+        )
+
+    if not database:
+        raise click.UsageError("Missing argument DATABASE or --all-dbs")
+
+    env.check_odoo()
+    manage = env.manage.db(database)
+
+    manage.default_entrypoints()
+
     manage.install_modules(
         to_update,
         phase="update modules",
@@ -50,6 +138,70 @@ def update(ctx, database, modules):
     return True
 
 
+def update_all(
+    ctx,
+    modules,
+    jobs,
+    timeout,
+    log_dir,
+    resume,
+    filter_version,
+    include_extra_dbs,
+    db_name,
+    dbfilter,
+    hostname
+):
+    from ...api.fleet import FleetUpdate
+
+    env = ctx.obj['env']
+
+    if filter_version == 'current':
+        version = env.odoo_version()
+        filter_version = "{}.0".format(version) if version else False
+
+    if filter_version == 'any':
+        filter_version = False
+
+    dbs = env.manage.db_list(
+        db_name=db_name,
+        dbfilter=dbfilter,
+        hostname=hostname,
+        filter_missing=True,
+        filter_invalid=True,
+        filter_version=filter_version,
+        include_extra_dbs=include_extra_dbs,
+    )
+
+    fleet = FleetUpdate(
+        env,
+        modules,
+        log_dir,
+        jobs=jobs,
+        timeout=timeout,
+        resume=resume,
+    )
+
+    results = fleet.run([db['name'] for db in dbs])
+
+    for result in results:
+        print("{name}\t{status}\t{duration:.1f}s\t{log}".format(**result))
+
+    failed = [
+        result['name']
+        for result in results
+        if result['status'] not in ('done', 'skipped')
+    ]
+
+    print(
+        "{} databases, {} failed".format(len(results), len(failed))
+    )
+
+    if failed:
+        ctx.exit(1)
+
+    return True
+
+
 @manage.command(
     help="Build Asset"
 )
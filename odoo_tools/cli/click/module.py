@@ -2,9 +2,11 @@ import sys
 import click
 import json
 from toposort import toposort_flatten
-from .utils import path_complete
+from .utils import path_complete, MODULE_TYPE
 from ...compat import Path
 from ...modules.search import build_dependencies
+from ...utilities.requirements import RequirementsLock
+from ...configuration.wheelhouse import Wheelhouse
 
 
 @click.group()
@@ -335,6 +337,14 @@ def show_dependencies(
     is_flag=True,
     default=False
 )
+@click.option(
+    '--lock-file',
+    help=(
+        "Store the requirements in this file and reuse them until "
+        "their inputs change"
+    ),
+    type=click.Path(dir_okay=False),
+)
 @click.pass_context
 def requirements(
     ctx,
@@ -343,7 +353,8 @@ def requirements(
     add_rule,
     package_map,
     lookup_requirements,
-    sort
+    sort,
+    lock_file
 ):
     env = ctx.obj['env']
     env.context.package_map_file = package_map
@@ -357,9 +368,11 @@ def requirements(
     package_maps = env.package_map()
 
     requirements = env.modules.requirements(
+        lookup_requirements=lookup_requirements,
         package_map=package_maps,
         extra_paths=found_files,
-        extra_rules=set(add_rule)
+        extra_rules=set(add_rule),
+        lock=RequirementsLock(lock_file) if lock_file else None
     )
 
     if sort:
@@ -367,3 +380,185 @@ def requirements(
         requirements.sort()
 
     print("\n".join(requirements))
+
+
+@module.command(
+    help="Build the wheels of the requirements of modules"
+)
+@click.option(
+    '-o',
+    '--output',
+    type=click.Path(file_okay=False),
+    required=True,
+    help="Folder of the wheels"
+)
+@click.option(
+    '-j',
+    '--jobs',
+    type=int,
+    default=4,
+    show_default=True,
+    help="Number of requirements built concurrently"
+)
+@click.option(
+    '-f',
+    '--find-links',
+    help="Local folder or url of packages used to build wheels",
+    multiple=True
+)
+@click.option(
+    '--index-url',
+    help="Base url of the package index"
+)
+@click.option(
+    '--no-index',
+    help="Only use the packages of --find-links",
+    is_flag=True,
+    default=False
+)
+@click.option(
+    '-p',
+    '--path',
+    help="Add custom requirements file path",
+    multiple=True
+)
+@click.option(
+    '--add-rule',
+    help="Add extra requirements rule",
+    multiple=True
+)
+@click.option(
+    '--package-map',
+    help="Package map to resolve some modules that can't be installed",
+)
+@click.option(
+    '--timeout',
+    type=int,
+    help="Time in seconds after which the build of a requirement is killed"
+)
+@click.pass_context
+def wheelhouse(
+    ctx,
+    output,
+    jobs,
+    find_links,
+    index_url,
+    no_index,
+    path,
+    add_rule,
+    package_map,
+    timeout
+):
+    env = ctx.obj['env']
+    env.context.package_map_file = package_map
+
+    found_files = env.requirement_files() | set(path)
+
+    requirements = env.modules.requirements(
+        package_map=env.package_map(),
+        extra_paths=found_files,
+        extra_rules=set(add_rule)
+    )
+
+    builder = Wheelhouse(
+        output,
+        find_links=find_links,
+        index_url=index_url,
+        no_index=no_index,
+        jobs=jobs,
+        timeout=timeout
+    )
+
+    results = builder.build(requirements)
+
+    failed = [
+        result
+        for result in results
+        if result['status'] != 'done'
+    ]
+
+    for result in results:
+        print("{status} {requirement} ({duration}s)".format(**result))
+
+    print("{} requirements, {} failed".format(len(results), len(failed)))
+
+    if failed:
+        ctx.exit(1)
+
+
+@module.command(
+    "extract-terms",
+    help="Write the pot files of modules without a database"
+)
+@click.option(
+    '-m',
+    '--modules',
+    type=MODULE_TYPE,
+    help="Modules to extract, defaults to all modules",
+    multiple=True
+)
+@click.option(
+    '-j',
+    '--jobs',
+    type=int,
+    help="Number of processes, defaults to the number of cpus"
+)
+@click.pass_context
+def extract_terms(ctx, modules, jobs):
+    env = ctx.obj['env']
+
+    names = [
+        mod
+        for mods in modules
+        for mod in mods
+    ] or None
+
+    for path in env.modules.extract_translations(names, jobs=jobs):
+        print(path)
+
+
+@module.command(
+    "compile-translations",
+    help="Compile the po files of modules into binary catalogs"
+)
+@click.option(
+    '-m',
+    '--modules',
+    type=MODULE_TYPE,
+    help="Modules to compile, defaults to all modules",
+    multiple=True
+)
+@click.option(
+    '-j',
+    '--jobs',
+    type=int,
+    help="Number of processes, defaults to the number of cpus"
+)
+@click.option(
+    '--cache-dir',
+    type=click.Path(file_okay=False),
+    required=True,
+    help="Folder of the compiled catalogs"
+)
+@click.pass_context
+def compile_translations(ctx, modules, jobs, cache_dir):
+    env = ctx.obj['env']
+
+    names = [
+        mod
+        for mods in modules
+        for mod in mods
+    ] or None
+
+    results = env.modules.compile_translations(
+        Path(cache_dir),
+        names,
+        jobs=jobs
+    )
+
+    for po_path, catalog_path, compiled in results:
+        print("{} {} {}".format(
+            "compiled" if compiled else "cached",
+            po_path,
+            catalog_path
+        ))
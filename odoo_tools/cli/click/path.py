@@ -23,8 +23,14 @@ def addons_paths():
     is_flag=True,
     default=False
 )
+@click.option(
+    '--timings',
+    help="Print the time spent in each phase of the lookup",
+    is_flag=True,
+    default=False
+)
 @click.pass_context
-def list_addons_paths(ctx, addons_path, sorted):
+def list_addons_paths(ctx, addons_path, sorted, timings):
     env = ctx.obj['env']
 
     if addons_path:
@@ -42,6 +48,10 @@ def list_addons_paths(ctx, addons_path, sorted):
     for path in paths:
         print(path)
 
+    if timings:
+        for phase, duration in env.addons_paths_timings.items():
+            click.echo("{}: {:.3f}s".format(phase, duration), err=True)
+
 
 @addons_paths.command("add")
 @click.argument(
@@ -0,0 +1,382 @@
+"""
+Daemon
+======
+
+Each call to ``odootools`` imports its commands, reads the odoo config
+and scans the addons paths again. Scripts issuing many commands can
+instead start a daemon keeping this state warm between commands:
+
+.. code:: bash
+
+    odootools daemon start --socket /run/user/1000/odootools.sock &
+    export ODOOTOOLS_DAEMON_SOCKET=/run/user/1000/odootools.sock
+
+    odootools module show web
+    odootools db list
+
+When ``ODOOTOOLS_DAEMON_SOCKET`` is set, the cli forwards its arguments,
+working directory and environment variables to the daemon listening on
+this Unix socket and prints its output. The cli runs the command itself
+when the daemon isn't running.
+
+The daemon keeps one :class:`Environment` per config file and per value
+of the environment variables used by odootools, so commands sharing them
+share the modules already listed. Modules are listed again when the
+addons paths change. Commands are executed one at a time and can't read
+the standard input, so the commands ``daemon``, ``entrypoint`` and
+``shell`` and the batches read from the standard input are never
+forwarded.
+"""
+import os
+import sys
+import json
+import socket
+import logging
+import tempfile
+from io import StringIO
+from contextlib import contextmanager, redirect_stdout, redirect_stderr
+
+from ..env import SOCKET_ENV
+
+
+_logger = logging.getLogger(__name__)
+
+# Commands that need a terminal or manage the daemon itself
+NOT_FORWARDED = {'daemon', 'entrypoint', 'shell'}
+
+# Options of the main command followed by a value
+VALUE_OPTIONS = {'-c', '--config', '--log-level'}
+
+# Options of the batch command followed by a value
+BATCH_VALUE_OPTIONS = {'--format'}
+
+
+def default_socket_path():
+    folder = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(folder, "odootools-{}.sock".format(os.getuid()))
+
+
+def send_message(sock, data):
+    sock.sendall(json.dumps(data).encode('utf-8'))
+    sock.shutdown(socket.SHUT_WR)
+
+
+def receive_message(sock):
+    chunks = []
+
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+
+    return json.loads(b''.join(chunks).decode('utf-8'))
+
+
+def request(path, data, timeout=None):
+    """
+    Send a request to the daemon listening on ``path``.
+
+    Returns:
+        dict: The response or None if the daemon isn't running.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+
+    try:
+        try:
+            sock.connect(str(path))
+        except (FileNotFoundError, ConnectionRefusedError):
+            return None
+
+        send_message(sock, data)
+        return receive_message(sock)
+    finally:
+        sock.close()
+
+
+def environment_key(environ, cwd):
+    """
+    Returns the key of the environment variables used by odootools.
+
+    Other variables such as ``PWD`` or ``SHLVL`` change between shells
+    and don't affect the commands.
+    """
+    from ..env import EnvironmentVariables
+
+    return json.dumps([
+        cwd,
+        sorted(
+            (key, value)
+            for key, value in environ.items()
+            if key.startswith('ODOO') or key in EnvironmentVariables.__fields__
+        ),
+    ])
+
+
+@contextmanager
+def isolated_logging():
+    """
+    Configure the root logger for a single command.
+
+    Handlers added by the command, for example by ``--log-level``, write
+    to the output of this command and are removed once it's done.
+    """
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    level = root.level
+
+    root.handlers = []
+
+    try:
+        yield
+    finally:
+        for handler in root.handlers:
+            handler.close()
+
+        root.handlers = handlers
+        root.setLevel(level)
+
+
+class ClosedInput(StringIO):
+    """
+    Standard input of the commands executed by the daemon, reading it
+    fails instead of returning an empty input.
+    """
+    def read(self, *args):
+        raise IOError("The daemon can't read the standard input")
+
+    def readline(self, *args):
+        return self.read()
+
+    def readlines(self, *args):
+        return self.read()
+
+    def __next__(self):
+        return self.read()
+
+
+class DaemonServer(object):
+    """
+    Server executing the commands of the cli sent to a Unix socket.
+
+    Args:
+        path (str): Path of the socket.
+
+    Attributes:
+        environments (dict): Environments cached by the cli for each
+            :func:`environment_key`.
+
+        served (int): Number of commands executed.
+    """
+    def __init__(self, path):
+        self.path = str(path)
+        self.environments = {}
+        self.served = 0
+        self.running = False
+        self.sock = None
+
+    def bind(self):
+        if os.path.exists(self.path):
+            if request(self.path, {"action": "ping"}, timeout=1) is not None:
+                raise RuntimeError(
+                    "A daemon is already listening on {}".format(self.path)
+                )
+            os.unlink(self.path)
+
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+        # Only the user running the daemon can connect to it
+        umask = os.umask(0o177)
+        try:
+            self.sock.bind(self.path)
+        finally:
+            os.umask(umask)
+
+        self.sock.listen(16)
+
+    def serve_forever(self):
+        if self.sock is None:
+            self.bind()
+
+        self.running = True
+        _logger.info("Listening on %s", self.path)
+
+        try:
+            while self.running:
+                connection, _ = self.sock.accept()
+                with connection:
+                    try:
+                        data = receive_message(connection)
+                    except ValueError:
+                        _logger.warning("Invalid request", exc_info=True)
+                        continue
+
+                    response = self.dispatch(data)
+                    connection.sendall(json.dumps(response).encode('utf-8'))
+        finally:
+            self.close()
+
+    def close(self):
+        self.running = False
+
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    def dispatch(self, data):
+        action = data.get('action', 'run')
+
+        if action == 'ping':
+            return {"pid": os.getpid(), "served": self.served}
+        elif action == 'stop':
+            self.running = False
+            return {"pid": os.getpid(), "served": self.served}
+        elif action == 'run':
+            return self.run(
+                data.get('args', []),
+                data.get('environ', {}),
+                data.get('cwd')
+            )
+
+        return {"error": "Unknown action {}".format(action)}
+
+    def run(self, args, environ, cwd=None):
+        """
+        Execute the cli with ``args`` as if it was started in ``cwd``
+        with the environment variables ``environ``.
+
+        Returns:
+            dict: The ``exit_code`` and the ``stdout`` and ``stderr``
+            of the command.
+        """
+        from .odot import run
+
+        stdout = StringIO()
+        stderr = StringIO()
+
+        saved_environ = dict(os.environ)
+        saved_cwd = os.getcwd()
+        saved_stdin = sys.stdin
+
+        # Commands started by the command, like the workers of a fleet
+        # update, must not be forwarded to this busy daemon
+        environ = dict(environ)
+        environ.pop(SOCKET_ENV, None)
+
+        cwd = cwd or saved_cwd
+        environments = self.environments.setdefault(
+            environment_key(environ, cwd), {}
+        )
+
+        try:
+            os.environ.clear()
+            os.environ.update(environ)
+            os.chdir(cwd)
+            sys.stdin = ClosedInput()
+
+            with redirect_stdout(stdout), redirect_stderr(stderr), \
+                    isolated_logging():
+                exit_code = run(args, obj={'environments': environments})
+        finally:
+            sys.stdin = saved_stdin
+            os.chdir(saved_cwd)
+            os.environ.clear()
+            os.environ.update(saved_environ)
+
+        self.served += 1
+
+        return {
+            "exit_code": exit_code,
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue(),
+        }
+
+
+def first_argument(args, value_options):
+    """
+    Returns the index and the value of the first argument of ``args``
+    that isn't an option or the value of an option in ``value_options``.
+
+    Returns:
+        tuple: ``(index, argument)`` or ``(None, None)``.
+    """
+    index = 0
+
+    while index < len(args):
+        arg = args[index]
+
+        if arg == '--':
+            if index + 1 < len(args):
+                return index + 1, args[index + 1]
+            break
+        elif arg in value_options:
+            index += 1
+        elif arg == '-' or not arg.startswith('-'):
+            return index, arg
+
+        index += 1
+
+    return None, None
+
+
+def is_forwarded(args):
+    """
+    Returns whether the command called with ``args`` can run in the
+    daemon, which can't read the standard input of the client.
+    """
+    index, name = first_argument(args, VALUE_OPTIONS)
+
+    if name in NOT_FORWARDED:
+        return False
+
+    if name == 'batch':
+        _, file = first_argument(args[index + 1:], BATCH_VALUE_OPTIONS)
+        return file not in (None, '-')
+
+    return True
+
+
+def forward(args, path):
+    """
+    Run the cli with ``args`` in the daemon listening on ``path``.
+
+    Returns:
+        int: The exit code or None if the daemon isn't running.
+    """
+    response = request(path, {
+        "action": "run",
+        "args": list(args),
+        "environ": dict(os.environ),
+        "cwd": os.getcwd(),
+    })
+
+    if response is None or 'exit_code' not in response:
+        return None
+
+    sys.stdout.write(response['stdout'])
+    sys.stdout.flush()
+    sys.stderr.write(response['stderr'])
+    sys.stderr.flush()
+
+    return response['exit_code']
+
+
+def main():
+    """
+    Entry point of the ``odootools`` script.
+    """
+    args = sys.argv[1:]
+    path = os.environ.get(SOCKET_ENV)
+
+    if path and is_forwarded(args):
+        exit_code = forward(args, path)
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    from .odot import command
+
+    command()
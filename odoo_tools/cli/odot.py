@@ -1,11 +1,13 @@
+import sys
 import click
 import logging
+import traceback
 
 from ..odoo import Environment
-from .registry import registry
+from .registry import registry, LazyGroup
 
 
-@click.group()
+@click.group(cls=LazyGroup)
 @click.option(
     '-c',
     '--config',
@@ -21,13 +23,27 @@ from .registry import registry
 @click.pass_context
 def command(ctx, config, log_level, exclude_odoo):
     ctx.ensure_object(dict)
-    env = Environment()
 
-    if config:
-        env.context.odoo_rc = config
+    # The daemon shares environments between the commands it runs
+    environments = ctx.obj.get('environments')
+    key = (config, exclude_odoo)
 
-    if exclude_odoo:
-        env.context.exclude_odoo = exclude_odoo
+    if environments is not None and key in environments:
+        env = environments[key]
+        # Modules and config may have changed since the previous command
+        env.modules.revalidate()
+        env.revalidate_config()
+    else:
+        env = Environment()
+
+        if config:
+            env.context.odoo_rc = config
+
+        if exclude_odoo:
+            env.context.exclude_odoo = exclude_odoo
+
+        if environments is not None:
+            environments[key] = env
 
     ctx.obj['env'] = env
 
@@ -35,5 +51,33 @@ def command(ctx, config, log_level, exclude_odoo):
         logging.basicConfig(level=log_level)
 
 
+def run(args, obj=None):
+    """
+    Run the cli with ``args`` in the current process.
+
+    Args:
+        args (list(str)): The arguments of the command line.
+
+        obj (dict): The object of the click context. Environments stored
+            in ``obj['environments']`` are shared between commands.
+
+    Returns:
+        int: The exit code of the command.
+    """
+    try:
+        command.main(args=list(args), prog_name='odootools', obj=obj)
+    except SystemExit as exc:
+        if exc.code is None or isinstance(exc.code, int):
+            return exc.code or 0
+
+        print(exc.code, file=sys.stderr)
+        return 1
+    except Exception:
+        traceback.print_exc()
+        return 1
+
+    return 0
+
+
 registry.set_main(command)
 registry.load()
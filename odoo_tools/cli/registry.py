@@ -1,9 +1,78 @@
-from pkg_resources import iter_entry_points
+import click
+
+from ..entrypoints import iter_entry_points
+
+
+# Former names of commands, still accepted on the command line and by
+# the entry points extending them
+ALIASES = {
+    'addons_paths': 'path',
+}
+
+
+class LazyGroup(click.Group):
+    """
+    Click group loading its commands when they are invoked.
+
+    Commands are added with :meth:`add_lazy_command` and a callable
+    returning the command, so the module defining a command is only
+    imported when the command is used or when the help is displayed.
+
+    The name given to a lazy command is only a hint, commands are
+    registered with their own name once loaded. Aliases added with
+    :meth:`add_alias` invoke a command under another name without
+    listing it in the help.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = {}
+        self.aliases = {}
+
+    def add_lazy_command(self, name, loader):
+        self.lazy_commands[name] = loader
+
+    def add_alias(self, alias, name):
+        self.aliases[alias] = name
+
+    def load_command(self, name):
+        command = self.lazy_commands.pop(name)()
+        self.add_command(command)
+
+    def load_commands(self):
+        for name in list(self.lazy_commands):
+            self.load_command(name)
+
+    def list_commands(self, ctx):
+        self.load_commands()
+        return super().list_commands(ctx)
+
+    def get_command(self, ctx, name):
+        name = self.aliases.get(name, name)
+
+        if name not in self.commands:
+            if name in self.lazy_commands:
+                self.load_command(name)
+            else:
+                self.load_commands()
+
+        return super().get_command(ctx, name)
 
 
 class CommandRegistry(object):
+    """
+    Registry of the commands of the odootools cli.
+
+    Commands are registered from the ``odootools.command`` entry points
+    and extended by the ``odootools.command.ext`` entry points. The
+    entry points are only loaded when the command is needed, so the name
+    of an entry point must be the name of its command, with underscores
+    in place of dashes. Extensions can use the former names listed in
+    :data:`ALIASES`.
+    """
     def __init__(self):
         self.groups = {}
+        self.extensions = {}
+        self.aliases = dict(ALIASES)
         self.main_command = None
         self.loaded = set()
 
@@ -11,26 +80,58 @@ class CommandRegistry(object):
         self.main_command = command
 
     def get(self, name):
-        return self.groups[name]
+        command = self.groups[name]
+
+        if not isinstance(command, click.Command):
+            command = command.load()
+            self.groups[name] = command
+
+        for ep in self.extensions.pop(name, []):
+            command.add_command(ep.load())
+
+        return command
 
     def register(self, name, command):
+        """
+        Register a command or an entry point loading a command.
+        """
         self.groups[name] = command
 
+    def extend(self, name, ep):
+        name = self.aliases.get(name, name)
+        command = self.groups[name]
+
+        if isinstance(command, click.Command):
+            command.add_command(ep.load())
+        else:
+            self.extensions.setdefault(name, []).append(ep)
+
     def register_commands(self):
         for ep in iter_entry_points(group='odootools.command'):
-            self.register(ep.name, ep.load())
+            self.register(ep.name, ep)
 
         for ep in iter_entry_points(group='odootools.command.ext'):
-            command = self.groups[ep.name]
-            obj = ep.load()
-            command.add_command(obj)
+            self.extend(ep.name, ep)
 
     def load(self):
-        for key, value in self.groups.items():
+        for key in list(self.groups):
             if key in self.loaded:
                 continue
+
             self.loaded.add(key)
-            self.main_command.add_command(value)
+
+            if isinstance(self.main_command, LazyGroup):
+                self.main_command.add_lazy_command(
+                    key.replace('_', '-'),
+                    lambda key=key: self.get(key)
+                )
+            else:
+                self.main_command.add_command(self.get(key))
+
+        if isinstance(self.main_command, LazyGroup):
+            for alias, name in self.aliases.items():
+                for key in {alias, alias.replace('_', '-')}:
+                    self.main_command.add_alias(key, name.replace('_', '-'))
 
 
 registry = CommandRegistry()
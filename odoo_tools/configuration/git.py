@@ -3,12 +3,10 @@ from subprocess import PIPE
 from .misc import run, cd
 from tempfile import TemporaryDirectory
 from urllib.parse import urlparse
-import giturlparse
 import os
 
 import logging
 from odoo_tools.compat import Path
-from cryptography.fernet import Fernet
 from contextlib import contextmanager
 
 _logger = logging.getLogger(__name__)
@@ -25,6 +23,8 @@ def ssh_command(addon, decrypt_key=None):
 
         # Decrypt key if possible
         if decrypt_key:
+            from cryptography.fernet import Fernet
+
             fernet = Fernet(decrypt_key)
             key_data = fernet.decrypt(key_data)
 
@@ -53,6 +53,8 @@ def fetch_addons(addon, output_directory, decrypt_key=None, credentials=None):
     if credentials is None:
         credentials = {}
 
+    import giturlparse
+
     origin_url = addon.url
 
     parsed = giturlparse.parse(origin_url)
@@ -9,8 +9,6 @@ from .misc import (
 from tempfile import TemporaryDirectory
 from six import ensure_binary, ensure_str
 import logging
-import requests
-from packaging.version import parse as version_parse
 from .pip import pip_command
 
 _logger = logging.getLogger(__name__)
@@ -41,6 +39,8 @@ class OdooSource(object):
 
     @property
     def parsed_version(self):
+        from packaging.version import parse as version_parse
+
         return version_parse(self.version)
 
     @property
@@ -242,6 +242,8 @@ class OfficialRelease(OdooSource):
             _logger.info("Skipping fetch %s as file is already cached", url)
             return
 
+        import requests
+
         data_size = 0
 
         with requests.get(url, stream=True) as req:
@@ -1,7 +1,27 @@
 import sys
 
 
-def pip_command(user=None, target=None, upgrade=False):
+def index_args(find_links=None, index_url=None, no_index=False):
+    args = []
+
+    if no_index:
+        args.append('--no-index')
+    elif index_url:
+        args += ['--index-url', str(index_url)]
+
+    for link in find_links or []:
+        args += ['--find-links', str(link)]
+
+    return args
+
+
+def pip_command(
+    user=None,
+    target=None,
+    upgrade=False,
+    find_links=None,
+    no_index=False
+):
     base_install_args = [
         sys.executable,
         '-m',
@@ -28,4 +48,25 @@ def pip_command(user=None, target=None, upgrade=False):
     if upgrade:
         args.append('-U')
 
+    args += index_args(find_links, no_index=no_index)
+
     return base_install_args + args
+
+
+def pip_wheel_command(
+    wheel_dir,
+    find_links=None,
+    index_url=None,
+    no_index=False
+):
+    """
+    Returns the pip command building the wheels of requirements and of
+    their dependencies in ``wheel_dir``.
+    """
+    return [
+        sys.executable,
+        '-m',
+        'pip',
+        'wheel',
+        '--wheel-dir', str(wheel_dir),
+    ] + index_args(find_links, index_url, no_index)
@@ -0,0 +1,197 @@
+import os
+import time
+import logging
+import tempfile
+import subprocess
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+
+from ..compat import Path
+from .pip import pip_wheel_command
+
+
+_logger = logging.getLogger(__name__)
+
+
+class Wheelhouse(object):
+    """
+    Folder of wheels used to install requirements without network.
+
+    Each requirement is built with ``pip wheel`` in its own process and
+    at most ``jobs`` requirements are built at the same time. Wheels
+    already in the wheelhouse are reused instead of being built again.
+
+    All the requirements are passed as constraints to each build, so
+    dependencies shared by many requirements resolve to the same
+    versions as if they were built together.
+
+    .. code:: python
+
+        wheelhouse = Wheelhouse('wheels', find_links=['/mnt/sdists'])
+        wheelhouse.build(env.modules.requirements())
+
+    Requirements can then be installed without network with
+    ``pip install --no-index --find-links wheels``.
+
+    Attributes:
+        path (Path): The wheelhouse folder.
+
+        find_links (list): Local folders or urls of packages used to
+            build wheels.
+
+        index_url (str): The package index, ignored when ``no_index``
+            is set.
+
+        no_index (bool): Only use ``find_links`` and the wheelhouse.
+
+        jobs (int): Number of requirements built concurrently.
+
+        timeout (int): Time in seconds after which a build is killed.
+    """
+    def __init__(
+        self,
+        path,
+        find_links=None,
+        index_url=None,
+        no_index=False,
+        jobs=4,
+        timeout=None
+    ):
+        self.path = Path(path)
+        self.find_links = list(find_links or [])
+        self.index_url = index_url
+        self.no_index = no_index
+        self.jobs = jobs
+        self.timeout = timeout
+
+    def command(self, requirement, wheel_dir, constraints=None):
+        args = pip_wheel_command(
+            wheel_dir,
+            # Reuse the wheels already built
+            find_links=[self.path] + self.find_links,
+            index_url=self.index_url,
+            no_index=self.no_index,
+        )
+
+        if constraints:
+            args += ['--constraint', str(constraints)]
+
+        return args + [requirement]
+
+    def constraints(self, requirements):
+        """
+        Returns the constraints matching ``requirements``.
+
+        pip doesn't accept links and extras in constraints, links are
+        skipped and extras removed.
+        """
+        from packaging.requirements import Requirement, InvalidRequirement
+
+        constraints = []
+
+        for line in requirements:
+            try:
+                requirement = Requirement(line)
+            except InvalidRequirement:
+                continue
+
+            if requirement.url:
+                continue
+
+            constraint = requirement.name + str(requirement.specifier)
+            if requirement.marker is not None:
+                constraint += "; {}".format(requirement.marker)
+
+            constraints.append(constraint)
+
+        return constraints
+
+    def build_requirement(self, requirement, constraints=None):
+        """
+        Build the wheels of ``requirement`` and its dependencies.
+
+        Wheels are built in a temporary folder and moved to the
+        wheelhouse once done so concurrent builds never see partial
+        files.
+
+        Args:
+            requirement (str): The requirement to build.
+
+            constraints (Path): A constraints file passed to pip.
+
+        Returns:
+            dict: ``{"requirement": .., "status": .., "wheels": ..,
+            "duration": .., "output": ..}`` where status is one of
+            ``done``, ``failed`` or ``timeout``.
+        """
+        result = {
+            "requirement": requirement,
+            "wheels": [],
+            "output": "",
+        }
+
+        start = time.monotonic()
+
+        with tempfile.TemporaryDirectory(dir=str(self.path)) as tmp_dir:
+            try:
+                proc = subprocess.run(
+                    self.command(requirement, tmp_dir, constraints),
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    timeout=self.timeout,
+                    universal_newlines=True,
+                )
+            except subprocess.TimeoutExpired:
+                result['status'] = 'timeout'
+            else:
+                result['output'] = proc.stdout
+                result['status'] = 'done' if proc.returncode == 0 else 'failed'
+
+            for wheel in sorted(Path(tmp_dir).glob('*.whl')):
+                target = self.path / wheel.name
+                os.replace(str(wheel), str(target))
+                result['wheels'].append(target)
+
+        result['duration'] = round(time.monotonic() - start, 3)
+
+        if result['status'] == 'done':
+            _logger.info(
+                "Built %s in %.1fs", requirement, result['duration']
+            )
+        else:
+            _logger.error(
+                "Building %s %s:\n%s",
+                requirement,
+                result['status'],
+                result['output']
+            )
+
+        return result
+
+    def build(self, requirements):
+        """
+        Build the wheels of ``requirements`` in the wheelhouse.
+
+        Returns:
+            list(dict): The result of each requirement, sorted by
+            requirement.
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        requirements = sorted(requirements)
+
+        if not requirements:
+            return []
+
+        max_workers = max(1, min(self.jobs or 1, len(requirements)))
+
+        with tempfile.TemporaryDirectory(dir=str(self.path)) as tmp_dir:
+            constraints = Path(tmp_dir) / 'constraints.txt'
+            constraints.write_text(
+                "\n".join(self.constraints(requirements)) + "\n"
+            )
+
+            build = partial(self.build_requirement, constraints=constraints)
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(build, requirements))
@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 
 
 def fetch_db_version(cursor):
@@ -25,7 +26,14 @@ def get_tables(cursor, tables):
     return [row[0] for row in cursor.fetchall()]
 
 
-def db_filter(dbs, dbfilter, hostname):
+@lru_cache(maxsize=1024)
+def compile_db_filter(dbfilter, hostname):
+    """
+    Returns the compiled dbfilter rule for a hostname.
+
+    ``%h`` is replaced by the hostname and ``%d`` by its first
+    subdomain (other than www).
+    """
     if hostname:
         domain, _, rest = hostname.partition('.')
 
@@ -37,8 +45,14 @@ def db_filter(dbs, dbfilter, hostname):
     else:
         rule = dbfilter.replace('%h', '.+').replace('%d', '.+')
 
+    return re.compile(rule)
+
+
+def db_filter(dbs, dbfilter, hostname):
+    rule = compile_db_filter(dbfilter, hostname)
+
     return [
         db
         for db in dbs
-        if re.match(rule, db['name'])
+        if rule.match(db['name'])
     ]
@@ -9,6 +9,7 @@ import logging
 from ..utils import random_string
 from ..compat import pipe, Path
 from ..configuration.pip import pip_command
+from ..utilities.requirements import RequirementsLock
 
 
 _logger = logging.getLogger(__name__)
@@ -83,12 +84,30 @@ def install_python_dependencies(env):
 
     package_map = env.package_map()
 
+    lock = None
+    digest = None
+
+    if env.context.requirement_file_path:
+        lock = RequirementsLock(env.context.requirement_file_path)
+        digest = env.modules.requirements_hash(
+            package_map=package_map,
+            extra_paths=requirement_files,
+        )
+
+        if lock.is_installed(digest):
+            _logger.info(
+                "Python requirements didn't change since they were "
+                "installed, skipping pip"
+            )
+            return
+
     # Convert the set to a sorted list to prevent causing
     # changes with files with the same set but in a different
     # order.
     requirements = list(env.modules.requirements(
         package_map=package_map,
         extra_paths=requirement_files,
+        lock=lock,
     ))
     requirements.sort()
     data = "\n".join(requirements)
@@ -103,12 +122,25 @@ def install_python_dependencies(env):
             _logger.info("Requirements:\n%s", data)
             fout.write(data)
 
-        args = pip_command(user=True) + [
-            "-r", str(file_path)
-        ]
+        if env.context.wheelhouse_path:
+            _logger.info(
+                "Installing packages from %s", env.context.wheelhouse_path
+            )
+            args = pip_command(
+                user=True,
+                find_links=[env.context.wheelhouse_path],
+                no_index=True
+            )
+        else:
+            args = pip_command(user=True)
+
+        args += ["-r", str(file_path)]
 
         retcode = pipe(args)
 
+    if lock is not None and retcode == 0:
+        lock.save(digest, requirements, installed=True)
+
     if env.context.strict_mode and retcode != 0:
         raise Exception("Failed to install pip dependencies")
 
@@ -1,11 +1,186 @@
-import pkg_resources
+"""
+Entry Points
+============
+
+Entry points of the installed distributions are read with
+:mod:`importlib.metadata` once per process and grouped by entry point
+group, so looking up many groups only scans the installed distributions
+once.
+
+The index can also be persisted between processes by setting the
+environment variable ``ODOOTOOLS_ENTRY_POINTS_CACHE`` to the path of a
+json file. The persisted index is only used while the folders of
+``sys.path`` keep the same modification time, installing or removing a
+distribution invalidates it.
+"""
+import os
+import sys
+import json
+import logging
 from collections import defaultdict
 
+
+_logger = logging.getLogger(__name__)
+
+CACHE_ENV = 'ODOOTOOLS_ENTRY_POINTS_CACHE'
+
 custom_entrypoints = defaultdict(list)
 
+_index = None
+
+
+def _metadata():
+    try:
+        from importlib import metadata
+    except ImportError:
+        import importlib_metadata as metadata
+
+    return metadata
+
+
+def path_fingerprint(paths=None):
+    """
+    Returns the modification time of each folder of ``paths``.
+
+    Args:
+        paths (list(str)): Folders to check, defaults to ``sys.path``.
+    """
+    fingerprint = []
+
+    for path in sys.path if paths is None else paths:
+        try:
+            mtime = os.stat(path or '.').st_mtime_ns
+        except OSError:
+            mtime = None
+
+        fingerprint.append([path, mtime])
+
+    return fingerprint
+
+
+def scan_entry_points():
+    """
+    Returns all the entry points of the installed distributions.
+
+    Returns:
+        dict: Lists of ``(name, value)`` by group.
+    """
+    metadata = _metadata()
+
+    index = defaultdict(list)
+    seen = set()
+
+    for dist in metadata.distributions():
+        name = (dist.metadata['Name'] or '').lower().replace('_', '-')
+
+        # The first distribution found on sys.path shadows the others
+        if name:
+            if name in seen:
+                continue
+            seen.add(name)
+
+        for ep in dist.entry_points:
+            index[ep.group].append((ep.name, ep.value))
+
+    return dict(index)
+
+
+def load_index(path, fingerprint):
+    try:
+        with open(path, 'r') as fin:
+            data = json.load(fin)
+    except (IOError, ValueError):
+        return None
+
+    if data.get('path') != fingerprint:
+        return None
+
+    return data.get('groups')
+
+
+def save_index(path, fingerprint, groups):
+    data = {
+        "path": fingerprint,
+        "groups": groups,
+    }
+
+    tmp_path = "{}.{}.tmp".format(path, os.getpid())
+
+    try:
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+        with open(tmp_path, 'w') as fout:
+            json.dump(data, fout)
+
+        os.replace(tmp_path, path)
+    except (IOError, OSError):
+        _logger.warning(
+            "Cannot write the entry points index in %s", path, exc_info=True
+        )
+
+
+def get_index():
+    """
+    Returns the entry points index of the process, building it if
+    needed.
+    """
+    global _index
+
+    if _index is not None:
+        return _index
+
+    cache_path = os.environ.get(CACHE_ENV)
+    groups = None
+
+    if cache_path:
+        fingerprint = path_fingerprint()
+        groups = load_index(cache_path, fingerprint)
+
+    if groups is None:
+        groups = scan_entry_points()
+
+        if cache_path:
+            save_index(cache_path, fingerprint, groups)
+
+    metadata = _metadata()
+
+    _index = {
+        group: [
+            metadata.EntryPoint(name, value, group)
+            for name, value in entries
+        ]
+        for group, entries in groups.items()
+    }
+
+    return _index
+
+
+def clear_entry_points_cache():
+    """
+    Forget the entry points of the process, the installed distributions
+    are scanned again on the next lookup.
+    """
+    global _index
+    _index = None
+
+
+def iter_entry_points(group):
+    """
+    Returns the entry points of ``group``.
+
+    Args:
+        group (str): Name of the entry point group.
+
+    Returns:
+        list: Entry points having a ``name`` and a ``load`` method.
+    """
+    return list(get_index().get(group, []))
+
 
 def execute_entrypoint(name, env):
-    for ep in pkg_resources.iter_entry_points(group=name):
+    for ep in iter_entry_points(name):
         functor = ep.load()
         functor(env)
 
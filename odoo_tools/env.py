@@ -3,10 +3,16 @@ Environment Variables
 =====================
 """
 from os import environ
+from inspect import getattr_static
+from types import MappingProxyType
 from pathlib import Path
 from .utils import obj_set, to_csv, from_bool, to_bool
 
 
+# Socket of the daemon running the commands of the cli
+SOCKET_ENV = 'ODOOTOOLS_DAEMON_SOCKET'
+
+
 class EnvironmentVariable(property):
     def __init__(
         self,
@@ -27,9 +33,15 @@ class EnvironmentVariable(property):
         self.__name = name
 
     def __get__(self, owner, klass):
+        return self.read(environ)
+
+    def read(self, variables):
+        """
+        Returns the value of the variable in the mapping ``variables``.
+        """
         for name in [self.__name] + self.alternate_names:
             try:
-                value = environ[name]
+                value = variables[name]
                 if self.deserializer:
                     value = self.deserializer(value)
                 break
@@ -249,6 +261,13 @@ class EnvironmentVariables(object):
     :str: Path of the requirement file to be saved. (Default: None)
     """
 
+    WHEELHOUSE_PATH = StoredEnv()
+    """
+    :str: Folder of wheels built with ``odootools module wheelhouse``.
+    When set, pip installs requirements from this folder only, without
+    using the package index. (Default: None)
+    """
+
     def __init__(self):
         self._values = {}
 
@@ -257,8 +276,97 @@ class EnvironmentVariables(object):
         for attr in cls.__fields__:
             yield attr
 
+    @classmethod
+    def snapshot(cls, variables=None):
+        """
+        Parse all the variables at once.
+
+        Args:
+            variables (Mapping): The environment variables, defaults to
+                ``os.environ``.
+
+        Returns:
+            EnvironmentSnapshot: The parsed variables.
+        """
+        return EnvironmentSnapshot(variables, cls)
+
     def values(self):
         return {
             field: getattr(self, field)
             for field in self.fields()
         }
+
+
+def freeze(value):
+    if isinstance(value, set):
+        return frozenset(value)
+
+    return value
+
+
+class EnvironmentSnapshot(object):
+    """
+    Read only values of :class:`EnvironmentVariables`.
+
+    :class:`EnvironmentVariables` reads and converts a variable from
+    ``os.environ`` the first time it's accessed. A snapshot parses all
+    the variables when it's created and never reads ``os.environ``
+    again, sets are stored as frozensets. Use :meth:`refresh` to parse
+    the current environment variables.
+
+    .. code:: python
+
+        envvars = EnvironmentVariables.snapshot()
+        envvars.ODOO_RC
+
+        envvars = envvars.refresh()
+
+    Attributes:
+        environ (Mapping): Read only copy of the environment variables
+            parsed by the snapshot.
+    """
+    __slots__ = ('environ', '_values', '_klass')
+
+    def __init__(self, variables=None, klass=None):
+        if klass is None:
+            klass = EnvironmentVariables
+
+        variables = dict(environ if variables is None else variables)
+
+        values = {
+            field: freeze(getattr_static(klass, field).read(variables))
+            for field in klass.fields()
+        }
+
+        object.__setattr__(self, 'environ', MappingProxyType(variables))
+        object.__setattr__(self, '_values', values)
+        object.__setattr__(self, '_klass', klass)
+
+    def __getattr__(self, name):
+        # _values isn't set yet on instances created without __init__,
+        # for example by copy
+        try:
+            return object.__getattribute__(self, '_values')[name]
+        except (KeyError, AttributeError):
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Environment snapshots are read only")
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def fields(self):
+        return iter(self._values)
+
+    def values(self):
+        return dict(self._values)
+
+    def refresh(self):
+        """
+        Returns a new snapshot of the current environment variables.
+        """
+        return EnvironmentSnapshot(klass=self._klass)
@@ -0,0 +1,255 @@
+"""
+Compiled Translations
+=====================
+
+Parsing po files is a large part of the time spent loading languages.
+This module compiles the po files of modules into binary catalogs stored
+in a cache folder and installs a loader in odoo using them instead of
+parsing the po files again.
+
+A catalog contains the rows returned by the ``TranslationFileReader``
+of odoo for a po file, serialized with :mod:`marshal`. Catalogs are
+named after the sha1 of the po file, of the pot file merged into it, of
+the odoo version and of the catalog format, so a catalog is never used
+for a file that changed since it was compiled or by another version of
+odoo, and identical files share the same catalog.
+
+.. code:: python
+
+    compile_translations(manifests, '/var/cache/odootools/translations')
+
+    # Before loading languages in odoo
+    install_loader('/var/cache/odootools/translations')
+"""
+import os
+import marshal
+import hashlib
+import logging
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+
+from ..compat import Path
+
+
+_logger = logging.getLogger(__name__)
+
+CATALOG_SUFFIX = '.cat'
+
+# Changes when the content of the catalogs changes
+CATALOG_FORMAT = 2
+
+
+def get_pot_path(po_path):
+    """
+    Returns the pot file merged into ``po_path`` by odoo if it exists.
+    """
+    po_path = Path(po_path)
+    pot_path = po_path.with_name(po_path.parent.parent.name + '.pot')
+    return pot_path if pot_path.exists() else None
+
+
+def odoo_version():
+    import odoo.release
+
+    return odoo.release.version
+
+
+def odoo_reader():
+    """
+    Returns the reader used by odoo to load translation files, never the
+    loader installed by :func:`install_loader`.
+    """
+    from odoo.tools import translate
+
+    reader = getattr(translate, 'TranslationFileReader', None)
+
+    if reader is None:
+        # Odoo versions older than 13.0
+        def reader(source, fileformat='po'):
+            return translate.PoFileReader(source)
+
+    return getattr(reader, 'original', reader)
+
+
+def catalog_hash(content, pot_content=None, version=None):
+    check = hashlib.sha1(
+        "{}\0{}\0".format(CATALOG_FORMAT, version).encode('utf-8')
+    )
+    check.update(content)
+
+    if pot_content is not None:
+        check.update(b'\0')
+        check.update(pot_content)
+
+    return check.hexdigest()
+
+
+def catalog_path(cache_dir, content_hash):
+    return Path(cache_dir) / content_hash[:2] / (content_hash + CATALOG_SUFFIX)
+
+
+def read_rows(po_path, content):
+    """
+    Returns the rows odoo loads from a po file, merging the pot file
+    next to it like odoo does.
+    """
+    source = BytesIO(content)
+    source.name = str(po_path)
+
+    return list(odoo_reader()(source, fileformat='po'))
+
+
+def compile_po(po_path, cache_dir):
+    """
+    Compile a po file in the cache folder.
+
+    Returns:
+        tuple(Path, bool): The catalog and whether it was compiled, a
+        catalog already in the cache isn't compiled again.
+    """
+    po_path = Path(po_path)
+    content = po_path.read_bytes()
+
+    pot_path = get_pot_path(po_path)
+    pot_content = pot_path.read_bytes() if pot_path else None
+
+    path = catalog_path(
+        cache_dir, catalog_hash(content, pot_content, odoo_version())
+    )
+
+    if path.exists():
+        return path, False
+
+    rows = read_rows(po_path, content)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name("{}.{}.tmp".format(path.name, os.getpid()))
+
+    with tmp_path.open('wb') as fout:
+        marshal.dump(rows, fout)
+
+    os.replace(str(tmp_path), str(path))
+
+    return path, True
+
+
+def compile_module(module_path, cache_dir):
+    """
+    Compile the po files of the module located in ``module_path``.
+
+    Returns:
+        list(tuple): ``(po_path, catalog_path, compiled)`` for each po
+        file of the module.
+    """
+    results = []
+
+    for folder in ['i18n', 'i18n_extra']:
+        for po_path in sorted((Path(module_path) / folder).glob('*.po')):
+            try:
+                path, compiled = compile_po(po_path, cache_dir)
+            except (IOError, UnicodeDecodeError):
+                _logger.warning("Cannot compile %s", po_path, exc_info=True)
+                continue
+
+            results.append((po_path, path, compiled))
+
+    return results
+
+
+def compile_translations(manifests, cache_dir, jobs=None):
+    """
+    Compile the po files of many modules using a pool of processes.
+
+    Args:
+        manifests (list(Manifest)): The modules to compile.
+
+        cache_dir (Path): Folder of the compiled catalogs.
+
+        jobs (int): Number of processes, defaults to the number of cpus.
+
+    Returns:
+        list(tuple): ``(po_path, catalog_path, compiled)`` for each po
+        file.
+    """
+    paths = [str(manifest.path) for manifest in manifests]
+    cache_dir = str(cache_dir)
+
+    if jobs == 1 or len(paths) <= 1:
+        results = [compile_module(path, cache_dir) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(
+                compile_module,
+                paths,
+                [cache_dir] * len(paths)
+            ))
+
+    return [
+        result
+        for module_results in results
+        for result in module_results
+    ]
+
+
+def load_compiled(cache_dir, source):
+    """
+    Returns the compiled rows of the po file opened as ``source``.
+
+    Returns:
+        list(dict): The rows or None if the file isn't in the cache, in
+        which case ``source`` is rewinded.
+    """
+    po_path = getattr(source, 'name', None)
+
+    if not isinstance(po_path, str) or not po_path.endswith('.po'):
+        return None
+
+    position = source.tell()
+    content = source.read()
+
+    pot_path = get_pot_path(po_path)
+    pot_content = pot_path.read_bytes() if pot_path else None
+
+    path = catalog_path(
+        cache_dir, catalog_hash(content, pot_content, odoo_version())
+    )
+
+    try:
+        with path.open('rb') as fin:
+            rows = marshal.load(fin)
+    except (IOError, EOFError, ValueError, TypeError):
+        source.seek(position)
+        return None
+
+    _logger.debug("Loading %s from %s", po_path, path)
+
+    return rows
+
+
+def install_loader(cache_dir):
+    """
+    Make odoo load po files from the compiled catalogs of ``cache_dir``.
+
+    Po files without a catalog are parsed by odoo as usual.
+    """
+    from odoo.tools import translate
+
+    original = translate.TranslationFileReader
+
+    if getattr(original, 'compiled_cache_dir', None) is not None:
+        original = original.original
+
+    def TranslationFileReader(source, *args, **kwargs):
+        fileformat = args[0] if args else kwargs.get('fileformat', 'po')
+
+        if fileformat == 'po':
+            rows = load_compiled(cache_dir, source)
+            if rows is not None:
+                return rows
+
+        return original(source, *args, **kwargs)
+
+    TranslationFileReader.original = original
+    TranslationFileReader.compiled_cache_dir = cache_dir
+
+    translate.TranslationFileReader = TranslationFileReader
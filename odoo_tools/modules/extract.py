@@ -0,0 +1,436 @@
+"""
+Static Term Extraction
+======================
+
+Extract the translatable terms of a module from its sources without
+a database. It covers the most common sources of terms:
+
+- python: ``_()`` and ``_lt()`` calls, field labels, help and selection
+  values and model descriptions.
+- xml data files: views, templates, menus and action names.
+- static files: ``_t()`` and ``_lt()`` calls in javascript and QWeb
+  templates.
+
+The rows have the same format as the rows exported by odoo so they can
+be written with :class:`PoFileWriter`. Terms stored in other records of
+data files aren't extracted.
+"""
+import re
+import sys
+import ast
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+from lxml import etree
+
+from ..compat import Path
+from .translate import PoFileWriter
+
+
+_logger = logging.getLogger(__name__)
+
+PYTHON_COMMENT = 'odoo-python'
+WEB_COMMENT = 'openerp-web'
+
+TRANSLATED_ATTRS = {
+    'string',
+    'help',
+    'sum',
+    'avg',
+    'confirm',
+    'placeholder',
+    'alt',
+    'title',
+    'aria-label',
+    'data-tooltip',
+}
+
+ACTION_MODELS = {
+    'ir.actions.act_window',
+    'ir.actions.act_url',
+    'ir.actions.client',
+    'ir.actions.report',
+    'ir.actions.server',
+}
+
+# Position of the string argument of fields taking other
+# positional arguments first.
+STRING_POSITION = {
+    'Many2one': 1,
+    'One2many': 2,
+    'Many2many': 4,
+    'Selection': 1,
+    'Reference': 1,
+    'Many2oneReference': 1,
+}
+
+JS_TERM = re.compile(
+    r"""\b_l?t\(\s*(?P<quote>['"`])(?P<term>(?:\\.|(?!(?P=quote)).)*?)"""
+    r"""(?P=quote)\s*[,)]""",
+    re.DOTALL
+)
+
+
+def normalize(term):
+    return " ".join(term.split())
+
+
+def is_translatable(term):
+    return any(char.isalpha() for char in term)
+
+
+def xmlid(module, name):
+    return name if '.' in name else "{}.{}".format(module, name)
+
+
+def model_xmlid(model):
+    return model.replace('.', '_')
+
+
+def node_terms(node):
+    """
+    Yields the translatable terms of a view architecture or a QWeb
+    template with the line number of each term.
+    """
+    if not isinstance(node.tag, str):
+        return
+
+    if node.get('t-translation') == 'off' or node.tag in ('script', 'style'):
+        return
+
+    for attr, value in node.attrib.items():
+        if attr in TRANSLATED_ATTRS:
+            yield node.sourceline, value
+
+    if node.text:
+        yield node.sourceline, node.text
+
+    for child in node:
+        yield from node_terms(child)
+
+        if child.tail:
+            yield child.sourceline, child.tail
+
+
+def literal(node):
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if sys.version_info < (3, 8) and isinstance(node, ast.Str):
+        return node.s
+    return None
+
+
+class PythonExtractor(ast.NodeVisitor):
+    def __init__(self, module, path):
+        self.module = module
+        self.path = path
+        self.rows = []
+        self.model = None
+
+    def push(self, type, name, res_id, source, comments=None):
+        source = source.strip()
+        if source:
+            self.rows.append((
+                self.module, type, name, res_id, source, '', comments or []
+            ))
+
+    def visit_Call(self, node):
+        func = node.func
+        if isinstance(func, ast.Name) and func.id in ('_', '_lt'):
+            term = literal(node.args[0]) if node.args else None
+            if term:
+                self.push(
+                    'code', self.path, node.lineno, term, [PYTHON_COMMENT]
+                )
+
+        self.generic_visit(node)
+
+    def visit_ClassDef(self, node):
+        attrs = {}
+        for stmt in node.body:
+            if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1:
+                target = stmt.targets[0]
+                if isinstance(target, ast.Name):
+                    attrs[target.id] = stmt.value
+
+        model = literal(attrs.get('_name')) if '_name' in attrs else None
+        inherit = attrs.get('_inherit')
+        if not model and inherit is not None:
+            if isinstance(inherit, ast.List) and inherit.elts:
+                inherit = inherit.elts[0]
+            model = literal(inherit)
+
+        previous, self.model = self.model, model
+
+        if model and '_name' in attrs and '_description' in attrs:
+            description = literal(attrs['_description'])
+            if description:
+                self.push(
+                    'model',
+                    'ir.model,name',
+                    "{}.model_{}".format(self.module, model_xmlid(model)),
+                    description
+                )
+
+        if model:
+            for name, value in attrs.items():
+                if isinstance(value, ast.Call):
+                    self.field_terms(name, value)
+
+        self.generic_visit(node)
+        self.model = previous
+
+    def field_terms(self, name, call):
+        func = call.func
+        if not (
+            isinstance(func, ast.Attribute) and
+            isinstance(func.value, ast.Name) and
+            func.value.id == 'fields'
+        ):
+            return
+
+        ftype = func.attr
+        kwargs = {
+            keyword.arg: keyword.value
+            for keyword in call.keywords
+            if keyword.arg
+        }
+
+        field_id = "{}.field_{}__{}".format(
+            self.module, model_xmlid(self.model), name
+        )
+
+        position = STRING_POSITION.get(ftype, 0)
+        string = None
+        if 'string' in kwargs:
+            string = literal(kwargs['string'])
+        elif len(call.args) > position:
+            string = literal(call.args[position])
+        elif 'related' not in kwargs:
+            label = name
+            if label.endswith('_ids'):
+                label = label[:-4]
+            elif label.endswith('_id'):
+                label = label[:-3]
+            string = label.replace('_', ' ').title()
+
+        if string:
+            self.push(
+                'model', 'ir.model.fields,field_description', field_id, string
+            )
+
+        help = literal(kwargs['help']) if 'help' in kwargs else None
+        if help:
+            self.push('model', 'ir.model.fields,help', field_id, help)
+
+        selection = kwargs.get('selection') or kwargs.get('selection_add')
+        if selection is None and ftype == 'Selection' and call.args:
+            selection = call.args[0]
+
+        if isinstance(selection, ast.List):
+            for item in selection.elts:
+                if not isinstance(item, ast.Tuple) or len(item.elts) != 2:
+                    continue
+
+                value, label = (literal(elt) for elt in item.elts)
+                if value is None or not label:
+                    continue
+
+                self.push(
+                    'model',
+                    'ir.model.fields.selection,name',
+                    "{}.selection__{}__{}__{}".format(
+                        self.module,
+                        model_xmlid(self.model),
+                        name,
+                        value.replace('.', '_').replace(' ', '_').lower()
+                    ),
+                    label
+                )
+
+
+def extract_python(module, path, display_path):
+    with path.open('rb') as fin:
+        source = fin.read()
+
+    try:
+        tree = ast.parse(source, filename=str(path))
+    except SyntaxError:
+        _logger.warning("Cannot parse %s", path, exc_info=True)
+        return []
+
+    extractor = PythonExtractor(module, display_path)
+    extractor.visit(tree)
+
+    return extractor.rows
+
+
+def extract_data(module, path):
+    rows = []
+
+    def push(name, res_id, term):
+        term = normalize(term)
+        if is_translatable(term):
+            rows.append((module, 'model', name, res_id, term, '', []))
+
+    tree = etree.parse(str(path))
+
+    for node in tree.iter('record', 'template', 'menuitem'):
+        record_id = node.get('id')
+        if not record_id:
+            continue
+
+        res_id = xmlid(module, record_id)
+
+        if node.tag == 'template':
+            for _, term in node_terms(node):
+                push('ir.ui.view,arch_db', res_id, term)
+
+        elif node.tag == 'menuitem':
+            if node.get('name'):
+                push('ir.ui.menu,name', res_id, node.get('name'))
+
+        elif node.get('model') == 'ir.ui.view':
+            for field in node.iterfind("field[@name='arch']"):
+                for child in field:
+                    for _, term in node_terms(child):
+                        push('ir.ui.view,arch_db', res_id, term)
+
+        elif node.get('model') in ACTION_MODELS:
+            for field in node.iterfind("field[@name='name']"):
+                if field.text:
+                    push(
+                        "{},name".format(node.get('model')),
+                        res_id,
+                        field.text
+                    )
+
+    return rows
+
+
+def extract_qweb(module, path, display_path):
+    rows = []
+    tree = etree.parse(str(path))
+
+    for lineno, term in node_terms(tree.getroot()):
+        term = normalize(term)
+        if is_translatable(term):
+            rows.append((
+                module, 'code', display_path, lineno, term, '', [WEB_COMMENT]
+            ))
+
+    return rows
+
+
+def extract_js(module, path, display_path):
+    rows = []
+    content = path.read_text(encoding='utf-8')
+
+    for match in JS_TERM.finditer(content):
+        term = match.group('term')
+        term = re.sub(r"\\(.)", r"\1", term)
+        lineno = content.count('\n', 0, match.start()) + 1
+
+        if term.strip():
+            rows.append((
+                module, 'code', display_path, lineno, term, '', [WEB_COMMENT]
+            ))
+
+    return rows
+
+
+def extract_terms(manifest):
+    """
+    Extract the translatable terms of a module.
+
+    Args:
+        manifest (Manifest): The module to extract terms from.
+
+    Returns:
+        list(tuple): Rows of ``(module, type, name, res_id, source,
+        value, comments)``.
+    """
+    module = manifest.technical_name
+    root = manifest.path
+    rows = []
+
+    def display_path(path):
+        return "addons/{}/{}".format(module, path.relative_to(root).as_posix())
+
+    for path in sorted(root.glob('**/*.py')):
+        rows += extract_python(module, path, display_path(path))
+
+    for data_file in manifest.data:
+        path = root / data_file
+        if path.suffix == '.xml' and path.exists():
+            try:
+                rows += extract_data(module, path)
+            except etree.XMLSyntaxError:
+                _logger.warning("Cannot parse %s", path, exc_info=True)
+
+    for path in sorted(root.glob('static/src/**/*')):
+        try:
+            if path.suffix == '.js':
+                rows += extract_js(module, path, display_path(path))
+            elif path.suffix == '.xml':
+                rows += extract_qweb(module, path, display_path(path))
+        except (etree.XMLSyntaxError, UnicodeDecodeError):
+            _logger.warning("Cannot parse %s", path, exc_info=True)
+
+    return rows
+
+
+def write_pot(manifest, rows):
+    """
+    Write the rows in the pot file of the module.
+
+    Returns:
+        Path: The path of the pot file.
+    """
+    module = manifest.technical_name
+    pot_path = manifest.path / 'i18n' / "{}.pot".format(module)
+    pot_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with pot_path.open('wb') as buffer:
+        writer = PoFileWriter(buffer, None)
+        writer.write_rows(rows)
+
+    return pot_path
+
+
+def export_pot(module_path):
+    """
+    Extract the terms of the module located in ``module_path`` and write
+    its pot file.
+    """
+    from ..api.objects import Manifest
+
+    manifest = Manifest.from_path(Path(module_path))
+    rows = extract_terms(manifest)
+
+    _logger.info(
+        "Extracted %s terms from %s", len(rows), manifest.technical_name
+    )
+
+    return write_pot(manifest, rows)
+
+
+def export_pot_files(manifests, jobs=None):
+    """
+    Write the pot files of many modules using a pool of processes.
+
+    Args:
+        manifests (list(Manifest)): The modules to export.
+
+        jobs (int): Number of processes, defaults to the number of cpus.
+
+    Returns:
+        list(Path): The pot files written.
+    """
+    paths = [str(manifest.path) for manifest in manifests]
+
+    if jobs == 1 or len(paths) <= 1:
+        return [export_pot(path) for path in paths]
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(export_pot, paths))
@@ -0,0 +1,343 @@
+"""
+Streaming PO files
+==================
+
+Parse and write po files one entry at a time.
+
+:class:`PoStream` parses a po file line by line and yields ``polib.POEntry``
+objects as soon as they are complete, so a file never has to be loaded
+or decoded at once. :class:`PoStreamWriter` serializes entries directly
+to a buffer with the same formatting as polib.
+"""
+import codecs
+
+import polib
+from polib import unescape
+
+from ..compat import Path
+
+
+BOM = codecs.BOM_UTF8.decode('utf-8')
+
+PREVIOUS_KEYWORDS = {
+    'msgctxt': 'previous_msgctxt',
+    'msgid': 'previous_msgid',
+    'msgid_plural': 'previous_msgid_plural',
+}
+
+# Methods of PoParser handling each kind of comment, other comments are
+# translator comments
+COMMENT_HANDLERS = {
+    '#.': 'parse_extracted_comment',
+    '#:': 'parse_occurrences',
+    '#,': 'parse_flags',
+    '#|': 'parse_previous',
+}
+
+
+class PoStream(object):
+    """
+    Iterable over the entries of a po file.
+
+    The header and the metadata of the file are available once the
+    header entry has been read.
+
+    Args:
+        source (str|Path|file): A path or a file object opened in binary
+            or text mode.
+
+    Attributes:
+        header (str): Comment at the top of the file.
+
+        metadata (dict): Metadata stored in the header entry.
+
+        metadata_is_fuzzy (list): Flags of the header entry.
+    """
+    def __init__(self, source, encoding='utf-8'):
+        self.source = source
+        self.encoding = encoding
+        self.header = ''
+        self.metadata = {}
+        self.metadata_is_fuzzy = []
+
+    def lines(self):
+        if isinstance(self.source, (str, Path)):
+            with open(str(self.source), 'r', encoding=self.encoding) as fin:
+                yield from fin
+            return
+
+        for line in self.source:
+            if isinstance(line, bytes):
+                line = line.decode(self.encoding)
+            yield line
+
+    def __iter__(self):
+        for entry in self.parse():
+            if entry.msgid == '' and entry.msgctxt is None:
+                self.set_metadata(entry)
+                continue
+
+            yield entry
+
+    def set_metadata(self, entry):
+        self.metadata_is_fuzzy = entry.flags
+        key = None
+
+        for msg in entry.msgstr.splitlines():
+            try:
+                key, val = msg.split(':', 1)
+                self.metadata[key] = val.strip()
+            except ValueError:
+                if key is not None:
+                    self.metadata[key] += '\n' + msg.strip()
+
+    def syntax_error(self, lineno):
+        return IOError(
+            'Syntax error in po file {} (line {})'.format(
+                self.source if isinstance(self.source, (str, Path)) else '',
+                lineno
+            )
+        )
+
+    def parse(self):
+        """
+        Yields all the entries of the file including the header entry.
+        """
+        parser = PoParser(self)
+
+        for lineno, line in enumerate(self.lines(), 1):
+            if lineno == 1 and line.startswith(BOM):
+                line = line[len(BOM):]
+
+            entry = parser.feed(lineno, line)
+            if entry is not None:
+                yield entry
+
+        entry = parser.finish()
+        if entry is not None:
+            yield entry
+
+
+class PoParser(object):
+    """
+    State of the parsing of a po file by :class:`PoStream`.
+
+    Lines are passed one at a time to :meth:`feed`, an entry is returned
+    once the next one starts.
+
+    Args:
+        stream (PoStream): The stream receiving the header.
+    """
+    def __init__(self, stream):
+        self.stream = stream
+        self.entry = None
+        self.field = None
+        # Set when a msgstr was read, the next keyword starts a new entry
+        self.complete = False
+        self.started = False
+        self.header = []
+
+    def feed(self, lineno, line):
+        """
+        Parse a line.
+
+        Returns:
+            polib.POEntry: The previous entry if ``line`` starts a new one.
+        """
+        line = line.strip()
+
+        if not line or line.startswith('#~|'):
+            return None
+
+        obsolete = False
+
+        if line.startswith('#~') and len(line.split(None, 1)) > 1:
+            line = line[2:].strip()
+            obsolete = True
+
+        if line[0] == '"':
+            self.parse_continuation(lineno, line)
+            return None
+
+        if line[0] == '#':
+            return self.parse_comment(lineno, line)
+
+        return self.parse_keyword(lineno, line, obsolete)
+
+    def finish(self):
+        """
+        Returns the last entry once all the lines were parsed.
+        """
+        if not self.started:
+            self.stream.header = '\n'.join(self.header)
+
+        if self.entry is not None and self.complete:
+            return self.entry
+
+        return None
+
+    def start_entry(self, lineno):
+        """
+        Start a new entry if the current one is complete.
+
+        Returns:
+            polib.POEntry: The completed entry.
+        """
+        completed = None
+
+        if self.complete:
+            completed = self.entry
+            self.entry, self.complete = None, False
+
+        if self.entry is None:
+            self.entry = polib.POEntry(linenum=lineno)
+
+        return completed
+
+    def parse_continuation(self, lineno, line):
+        if self.field is None:
+            raise self.stream.syntax_error(lineno)
+
+        value = unescape(line[1:-1])
+        entry = self.entry
+
+        if isinstance(self.field, tuple):
+            entry.msgstr_plural[self.field[1]] += value
+        else:
+            setattr(entry, self.field, getattr(entry, self.field) + value)
+
+    def parse_comment(self, lineno, line):
+        marker = line[:2]
+
+        if (
+            not self.started and self.entry is None and
+            marker not in COMMENT_HANDLERS
+        ):
+            self.header.append(line[2:])
+            return None
+
+        completed = self.start_entry(lineno)
+        self.field = None
+
+        handler = COMMENT_HANDLERS.get(marker, 'parse_translator_comment')
+        getattr(self, handler)(lineno, line, line[2:].strip())
+
+        return completed
+
+    def parse_extracted_comment(self, lineno, line, content):
+        if content:
+            if self.entry.comment:
+                self.entry.comment += '\n'
+            self.entry.comment += line[3:]
+
+    def parse_occurrences(self, lineno, line, content):
+        for occurrence in content.split():
+            path, _, number = occurrence.rpartition(':')
+            if path and number.isdigit():
+                self.entry.occurrences.append((path, number))
+            else:
+                self.entry.occurrences.append((occurrence, ''))
+
+    def parse_flags(self, lineno, line, content):
+        if content:
+            self.entry.flags += [
+                flag.strip()
+                for flag in content.split(',')
+            ]
+
+    def parse_previous(self, lineno, line, content):
+        keyword, _, value = content.partition(' ')
+
+        if keyword not in PREVIOUS_KEYWORDS:
+            raise self.stream.syntax_error(lineno)
+
+        self.field = PREVIOUS_KEYWORDS[keyword]
+        setattr(self.entry, self.field, unescape(value.strip()[1:-1]))
+
+    def parse_translator_comment(self, lineno, line, content):
+        comment = line.lstrip('#')
+        if comment.startswith(' '):
+            comment = comment[1:]
+
+        if self.entry.tcomment:
+            self.entry.tcomment += '\n'
+        self.entry.tcomment += comment
+
+    def parse_keyword(self, lineno, line, obsolete):
+        keyword, _, value = line.partition(' ')
+        value = value.lstrip()
+
+        if len(value) < 2 or value[0] != '"' or value[-1] != '"':
+            raise self.stream.syntax_error(lineno)
+
+        value = unescape(value[1:-1])
+
+        if keyword in ('msgctxt', 'msgid'):
+            return self.parse_msgid(lineno, keyword, value, obsolete)
+
+        if self.entry is None:
+            raise self.stream.syntax_error(lineno)
+
+        if keyword == 'msgid_plural':
+            self.entry.msgid_plural = value
+            self.field = keyword
+        elif keyword == 'msgstr':
+            self.entry.msgstr = value
+            self.field = keyword
+            self.complete = True
+        elif keyword.startswith('msgstr['):
+            index = int(keyword[7:-1])
+            self.entry.msgstr_plural[index] = value
+            self.field = ('msgstr_plural', index)
+            self.complete = True
+        else:
+            raise self.stream.syntax_error(lineno)
+
+        return None
+
+    def parse_msgid(self, lineno, keyword, value, obsolete):
+        completed = self.start_entry(lineno)
+
+        if not self.started:
+            self.started = True
+            self.stream.header = '\n'.join(self.header)
+
+        self.entry.obsolete = obsolete
+        setattr(self.entry, keyword, value)
+        self.field = keyword
+
+        return completed
+
+
+class PoStreamWriter(object):
+    """
+    Write po entries to a binary buffer one at a time.
+
+    The output is identical to ``str(polib.POFile)`` when the entries
+    are written in the same order.
+    """
+    def __init__(self, buffer, encoding='utf-8', wrapwidth=78):
+        self.buffer = buffer
+        self.encoding = encoding
+        self.wrapwidth = wrapwidth
+
+    def write_text(self, text):
+        self.buffer.write(text.encode(self.encoding))
+
+    def write_header(self, header='', metadata=None, fuzzy=None):
+        """
+        Write the header comment and the metadata entry.
+        """
+        pofile = polib.POFile(wrapwidth=self.wrapwidth)
+        pofile.header = header
+        pofile.metadata = metadata or {}
+        pofile.metadata_is_fuzzy = fuzzy or []
+
+        self.write_text(str(pofile))
+
+    def write_entry(self, entry):
+        self.write_text('\n' + entry.__unicode__(self.wrapwidth))
+
+    def write_entries(self, entries):
+        for entry in entries:
+            self.write_entry(entry)
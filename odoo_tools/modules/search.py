@@ -8,14 +8,14 @@ can be used to determine which folder contains installable modules
 and it can also be used to predetermine which module would require
 to be installed if a given module was installed.
 """
+import time
 import logging
 
 from odoo_tools.compat import Path, module_path
+from ..entrypoints import iter_entry_points
 from ..api.objects import Manifest
 
 
-import pkg_resources
-
 _logger = logging.getLogger(__name__)
 
 
@@ -375,38 +375,51 @@ def base_addons_path():
     return odoo_path
 
 
-def find_addons_paths(paths, options=False):
+def find_addons_paths(paths, options=False, timings=None):
     """
     Find addons in provided paths.
 
     Args:
       paths (List<Path>): A list of paths to search for addons.
 
+      timings (dict): Receives the time in seconds spent in the phases
+        ``entrypoints`` and ``modules``.
+
     Returns:
       Set<Manifest>: A list of manifests
     """
     filters = set()
     filters.add('installable')
 
+    if timings is None:
+        timings = {}
+
     if options and not options.exclude_odoo:
         odoo_path = base_addons_path()
         if odoo_path:
             paths.add(odoo_path)
 
+    start = time.perf_counter()
+
     if options and options.include_odoo_entrypoints:
         entry_point = "odoo_addons_paths"
-        for ep in pkg_resources.iter_entry_points(group=entry_point):
+        for ep in iter_entry_points(entry_point):
             functor = ep.load()
             new_paths = functor()
 
             if new_paths:
                 paths |= new_paths
 
+    timings['entrypoints'] = time.perf_counter() - start
+    start = time.perf_counter()
+
     modules = find_modules_paths(
         paths,
         filters=filters
     )
 
+    timings['modules'] = time.perf_counter() - start
+
     found_paths = set()
 
     for manifest in modules:
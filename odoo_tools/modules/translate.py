@@ -11,10 +11,14 @@ in order to prefill some already translated terms, it has to be able
 to load them into odoo first.
 """
 import re
+import json
 import polib
+import hashlib
 import logging
+from collections import OrderedDict
 from ..compat import Path
 from datetime import datetime
+from .pofile import PoStream, PoStreamWriter
 
 _logger = logging.getLogger()
 
@@ -48,6 +52,76 @@ def get_comments(entry):
     return comments
 
 
+def entry_fingerprint(entry):
+    """
+    Returns a digest of everything rendered for ``entry`` in a po file.
+    """
+    data = [
+        entry.msgctxt,
+        entry.msgid,
+        entry.msgid_plural,
+        entry.msgstr,
+        sorted(entry.msgstr_plural.items()),
+        entry.comment,
+        entry.tcomment,
+        entry.occurrences,
+        sorted(entry.flags),
+        entry.previous_msgctxt,
+        entry.previous_msgid,
+        entry.previous_msgid_plural,
+        entry.obsolete,
+    ]
+
+    return hashlib.sha1(
+        json.dumps(data, default=str).encode('utf-8')
+    ).digest()
+
+
+def entry_key(entry):
+    """
+    Returns the key identifying ``entry`` in a po file.
+    """
+    return (entry.msgctxt, entry.msgid)
+
+
+def merge_entries(entries, refpot):
+    """
+    Merge ``entries`` with the entries of the template ``refpot`` one
+    entry at a time, like :meth:`polib.POFile.merge`.
+
+    Entries missing from the template become obsolete and the entries
+    of the template missing from ``entries`` are yielded last.
+
+    Args:
+        entries (iterable): Entries of a po file.
+
+        refpot (iterable): Entries of the reference template.
+    """
+    references = OrderedDict()
+    for ref in refpot:
+        references.setdefault(entry_key(ref), ref)
+
+    seen = set()
+
+    for entry in entries:
+        key = entry_key(entry)
+        ref = references.get(key)
+
+        if ref is None:
+            entry.obsolete = True
+        else:
+            entry.merge(ref)
+            seen.add(key)
+
+        yield entry
+
+    for key, ref in references.items():
+        if key not in seen:
+            entry = polib.POEntry()
+            entry.merge(ref)
+            yield entry
+
+
 class PoFileReader(object):
     """ Iterate over po file to return Odoo translation entries """
     def __init__(self, source, options=None):
@@ -73,9 +147,17 @@ class PoFileReader(object):
             return False
 
         pot_path = None
-
+        self.refpot = None
+
+        if options.get('streaming') and not isinstance(source, polib.POFile):
+            # entries are parsed lazily while iterating
+            self.pofile = PoStream(source)
+            pot_path = get_pot_path(
+                str(source) if isinstance(source, (str, Path))
+                else getattr(source, 'name', None)
+            )
         # polib accepts a path or the file content as a string, not a fileobj
-        if isinstance(source, str):
+        elif isinstance(source, str):
             self.pofile = polib.pofile(source)
             pot_path = get_pot_path(source)
         elif isinstance(source, polib.POFile):
@@ -83,18 +165,26 @@ class PoFileReader(object):
         else:
             # either a BufferedIOBase or result from NamedTemporaryFile
             self.pofile = polib.pofile(source.read().decode())
-            pot_path = get_pot_path(source.name)
+            pot_path = get_pot_path(getattr(source, 'name', None))
 
         if options.get('read_pot') and pot_path:
             # Make a reader for the POT file
             # (Because the POT comments are correct on GitHub but the
             # PO comments tends to be outdated. See LP bug 933496.)
-            self.pofile.merge(polib.pofile(pot_path))
+            if isinstance(self.pofile, PoStream):
+                # entries are merged while iterating
+                self.refpot = polib.pofile(pot_path)
+            else:
+                self.pofile.merge(polib.pofile(pot_path))
 
         self.options = options
 
     def __iter__(self):
-        for entry in self.pofile:
+        entries = self.pofile
+        if self.refpot is not None:
+            entries = merge_entries(entries, self.refpot)
+
+        for entry in entries:
             if entry.obsolete:
                 continue
 
@@ -180,18 +270,101 @@ class PoFileReader(object):
 
 
 class PoFileWriter(object):
-    """ Iterate over po file to return Odoo translation entries """
-    def __init__(self, target, lang, pofile=None):
+    """
+    Write Odoo translation entries in a po file.
+
+    In streaming mode, entries are indexed by context and source instead
+    of being searched in a ``polib.POFile`` and they are serialized one
+    at a time with :class:`PoStreamWriter`. Streaming is enabled
+    automatically when ``pofile`` is a :class:`PoStream`.
+    """
+    def __init__(self, target, lang, pofile=None, streaming=False):
 
         self.buffer = target
         self.lang = lang
-        if pofile is not None:
+        # Set by callers writing the buffer to a file only when needed
+        self.changed = False
+        self.streaming = streaming or isinstance(pofile, PoStream)
+
+        if self.streaming:
+            self.po = polib.POFile()
+            self.entries = OrderedDict()
+            self.msgids = {}
+            self.obsolete_entries = []
+
+            if pofile is not None:
+                for entry in pofile:
+                    self.append(entry)
+
+                self.po.header = pofile.header
+                self.po.metadata = pofile.metadata
+                self.po.metadata_is_fuzzy = pofile.metadata_is_fuzzy
+        elif pofile is not None:
             self.po = pofile
         else:
             self.po = polib.POFile()
 
     def merge(self, pofile):
-        self.po.merge(pofile)
+        if not self.streaming:
+            self.po.merge(pofile)
+            return
+
+        entries = list(merge_entries(self.iter_entries(), pofile))
+
+        self.entries = OrderedDict()
+        self.msgids = {}
+        self.obsolete_entries = []
+
+        for entry in entries:
+            self.append(entry)
+
+    def find(self, source, msgctxt=False):
+        """
+        Returns the entry of ``source``, with any context when
+        ``msgctxt`` is False like :meth:`polib.POFile.find`.
+        """
+        if not self.streaming:
+            return self.po.find(st=source, msgctxt=msgctxt)
+
+        if msgctxt is False:
+            return self.entries.get((None, source)) or self.msgids.get(source)
+
+        return self.entries.get((msgctxt, source))
+
+    def append(self, entry):
+        if not self.streaming:
+            self.po.append(entry)
+        elif entry.obsolete:
+            self.obsolete_entries.append(entry)
+        else:
+            self.entries.setdefault(entry_key(entry), entry)
+            self.msgids.setdefault(entry.msgid, entry)
+
+    def iter_entries(self):
+        if self.streaming:
+            yield from self.entries.values()
+            yield from self.obsolete_entries
+        else:
+            yield from self.po
+
+    def fingerprint(self):
+        """
+        Returns a digest of the header, the metadata and the entries.
+
+        Comparing the fingerprint before and after adding entries tells
+        if the file has to be written again.
+        """
+        check = hashlib.sha1()
+        check.update(json.dumps([
+            self.po.header,
+            self.po.metadata,
+            self.po.metadata_is_fuzzy,
+        ], sort_keys=True).encode('utf-8'))
+
+        for entry in self.iter_entries():
+            check.update(entry_fingerprint(entry))
+
+        return check.hexdigest()
 
     def write_rows(self, rows):
         # we now group the translations by source. That means one translation
@@ -225,8 +398,22 @@ class PoFileWriter(object):
 
         self.write()
 
+    def release(self):
+        """
+        Returns the description and version of odoo used in headers.
+
+        Files can be written without odoo, for example from terms
+        extracted from the sources.
+        """
+        try:
+            import odoo.release as release
+        except ImportError:
+            return "Odoo Server", ""
+
+        return release.description, release.version
+
     def generate_header(self):
-        import odoo.release as release
+        description, _ = self.release()
 
         modules = set([])
 
@@ -235,16 +422,16 @@ class PoFileWriter(object):
             "This file contains the translation of the following modules:"
             "\n%s"
         ) % (
-            release.description, ''.join("\t* %s\n" % m for m in modules)
+            description, ''.join("\t* %s\n" % m for m in modules)
         )
 
     def generate_metadata(self):
-        import odoo.release as release
+        description, version = self.release()
 
         now = datetime.utcnow().strftime('%Y-%m-%d %H:%M+0000')
         self.po.metadata = {
             'Project-Id-Version': "%s %s" % (
-                release.description, release.version
+                description, version
             ),
             'Report-Msgid-Bugs-To': '',
             'POT-Creation-Date': now,
@@ -263,17 +450,28 @@ class PoFileWriter(object):
         if not self.po.metadata:
             self.generate_metadata()
 
-        self.buffer.write(str(self.po).encode())
+        if not self.streaming:
+            self.buffer.write(str(self.po).encode())
+            return
+
+        writer = PoStreamWriter(self.buffer, wrapwidth=self.po.wrapwidth)
+        writer.write_header(
+            self.po.header,
+            self.po.metadata,
+            self.po.metadata_is_fuzzy
+        )
+        writer.write_entries(self.entries.values())
+        writer.write_entries(self.obsolete_entries)
 
     def add_entry(self, modules, tnrs, source, trad, comments=None):
-        entry = self.po.find(st=source)
+        entry = self.find(source)
 
         if not entry:
             entry = polib.POEntry(
                 msgid=source,
                 msgstr=trad,
             )
-            self.po.append(entry)
+            self.append(entry)
 
         entry_modules = list(get_modules(entry))
         for module in modules:
@@ -312,7 +510,8 @@ class PoFileWriter(object):
         if code and "python-format" not in entry.flags:
             entry.flags.append("python-format")
 
-        entry.flags = list(set(entry.flags))
+        # sorted so the output doesn't depend on the hash seed
+        entry.flags = sorted(set(entry.flags))
 
     def add_entries(self, entries):
         for module, type, name, res_id, source, value, comments in entries:
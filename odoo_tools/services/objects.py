@@ -1,4 +1,3 @@
-import giturlparse
 
 from . import fields
 from . import models
@@ -110,6 +109,8 @@ class RepoConfig(models.ParentedObject, models.Extendable, models.BaseModel):
         Returns:
             str: the path of the repo
         """
+        import giturlparse
+
         url = giturlparse.parse(self.url.lower())
 
         if url.valid:
@@ -1,9 +1,62 @@
+import os
+import re
+import sys
+import json
+import hashlib
+import logging
 from collections import defaultdict
+from urllib.parse import urlparse
 
-from pip._internal.network.session import PipSession
-from pip._internal.req.req_file import parse_requirements
-from pip._internal.req.constructors import (
-    install_req_from_parsed_requirement
+from ..compat import Path
+from ..exceptions import ArgumentError
+
+
+_logger = logging.getLogger(__name__)
+
+EGG_NAME = re.compile(r"[#&]egg=([^&]+)")
+
+URL_SCHEMES = {
+    'http',
+    'https',
+    'file',
+    'ftp',
+    'git+http',
+    'git+https',
+    'git+ssh',
+    'git+git',
+    'git+file',
+    'hg+http',
+    'hg+https',
+    'svn+http',
+    'svn+https',
+    'bzr+http',
+    'bzr+https',
+}
+
+# Options of requirement files that don't describe a requirement
+IGNORED_OPTIONS = (
+    '-i',
+    '--index-url',
+    '--extra-index-url',
+    '--no-index',
+    '-f',
+    '--find-links',
+    '--pre',
+    '--trusted-host',
+    '--prefer-binary',
+    '--require-hashes',
+    '--only-binary',
+    '--no-binary',
+    '--use-feature',
+    '-c',
+    '--constraint',
+)
+
+# Options following a requirement on the same logical line, they only
+# apply to the installation of this requirement
+REQUIREMENT_OPTIONS = re.compile(
+    r"\s+(?:--hash|--global-option|--install-option|--config-settings)"
+    r"(?:=|\s).*$"
 )
 
 
@@ -15,7 +68,440 @@ class Requirement(object):
         self.editable = False
 
 
-def merge_requirements(files):
+def format_requirements(requirements, links):
+    result = []
+    for key, value in requirements.items():
+        if value.links:
+            result.append("%s" % sorted(value.links)[0])
+        else:
+            requirement_line = [key]
+
+            if value.extras:
+                extras = [str(extra) for extra in value.extras]
+                extras.sort()
+                requirement_line.append("[{}]".format(
+                    ",".join(extras)
+                ))
+
+            if value.specifiers:
+                specifiers = [str(spec) for spec in value.specifiers]
+                specifiers.sort()
+                requirement_line.append(",".join(specifiers))
+
+            result.append(" ".join(requirement_line))
+
+    for link in links:
+        result.append(link)
+
+    return result
+
+
+class RequirementMerger(object):
+    """
+    Merge requirements from strings and requirement files.
+
+    Requirements are parsed with ``packaging``, markers are evaluated
+    once per distinct marker and the specifiers and extras of the same
+    package are merged.
+
+    .. code:: python
+
+        merger = RequirementMerger()
+        merger.add_file('requirements.txt')
+        merger.add_string('requests >2')
+        merger.result()
+
+    Requirement files support the options ``-r``, ``-e`` and lines
+    continued with ``\\``, other pip options are ignored. Options of a
+    single requirement such as ``--hash`` are dropped, they can't apply
+    to merged requirements.
+    """
+    def __init__(self):
+        self.requirements = defaultdict(Requirement)
+        self.links = set()
+        self.markers = {}
+        self.files = set()
+
+    def evaluate_marker(self, marker):
+        if marker is None:
+            return True
+
+        key = str(marker)
+        if key not in self.markers:
+            self.markers[key] = marker.evaluate()
+
+        return self.markers[key]
+
+    def add_file(self, filename):
+        path = Path(filename).resolve()
+
+        # Prevent loops between files including each other
+        if path in self.files:
+            return
+
+        self.files.add(path)
+
+        with path.open('r', encoding='utf-8') as fin:
+            self.add_string(fin.read(), path.parent, str(path))
+
+    def add_string(self, content, base_path=None, source='<string>'):
+        """
+        Add the requirements of ``content`` in the requirement file format.
+
+        Args:
+            content (str): One or many requirements.
+
+            base_path (Path): Folder used to resolve relative paths.
+
+            source (str): Name used in error messages.
+        """
+        from packaging.markers import InvalidMarker
+        from packaging.requirements import InvalidRequirement
+
+        for lineno, line in self.logical_lines(content):
+            try:
+                self.add_line(line, base_path)
+            except (InvalidRequirement, InvalidMarker) as exc:
+                raise ArgumentError(
+                    "Invalid requirement in {} line {}: {}".format(
+                        source, lineno, exc
+                    )
+                )
+
+    def logical_lines(self, content):
+        buffer = []
+        start = None
+
+        for lineno, line in enumerate(content.splitlines(), 1):
+            if line.lstrip().startswith('#'):
+                line = ''
+            else:
+                line = re.sub(r"(^|\s+)#.*$", "", line)
+
+            if start is None:
+                start = lineno
+
+            if line.endswith('\\'):
+                buffer.append(line[:-1])
+                continue
+
+            buffer.append(line)
+            logical = " ".join(buffer).strip()
+            buffer = []
+
+            if logical:
+                yield start, logical
+
+            start = None
+
+        if buffer and " ".join(buffer).strip():
+            yield start, " ".join(buffer).strip()
+
+    def split_option(self, line):
+        option, _, value = line.partition(' ')
+        if '=' in option:
+            option, _, value = option.partition('=')
+
+        return option, value.strip()
+
+    def included_file(self, line, base_path=None):
+        """
+        Returns:
+            Path: The file included by ``line`` with ``-r`` or None.
+        """
+        if not line.startswith('-'):
+            return None
+
+        option, value = self.split_option(line)
+
+        if option not in ('-r', '--requirement'):
+            return None
+
+        path = Path(value)
+        if base_path is not None and not path.is_absolute():
+            path = Path(base_path) / path
+
+        return path
+
+    def add_line(self, line, base_path=None):
+        editable = False
+
+        line = REQUIREMENT_OPTIONS.sub('', line)
+
+        if line.startswith('-'):
+            option, value = self.split_option(line)
+
+            if option in ('-r', '--requirement'):
+                self.add_file(self.included_file(line, base_path))
+                return
+
+            if option in ('-e', '--editable'):
+                editable = True
+                line = value
+            elif option in IGNORED_OPTIONS or option.startswith('--'):
+                return
+            else:
+                from packaging.requirements import InvalidRequirement
+
+                raise InvalidRequirement("Unknown option {}".format(option))
+
+        if self.is_link(line):
+            self.add_link(line, base_path, editable)
+            return
+
+        from packaging.requirements import Requirement as PackagingRequirement
+
+        requirement = PackagingRequirement(line)
+
+        if not self.evaluate_marker(requirement.marker):
+            return
+
+        value = self.requirements[requirement.name.lower()]
+        value.extras |= set(requirement.extras)
+        value.specifiers |= set(requirement.specifier)
+        if requirement.url:
+            value.links.add(requirement.url)
+        value.editable |= editable
+
+    def is_link(self, line):
+        url, _, _ = line.partition(';')
+        url = url.strip()
+
+        scheme = urlparse(url).scheme
+        if scheme in URL_SCHEMES:
+            return True
+
+        if url.startswith(('.', '/', '~')):
+            return True
+
+        return False
+
+    def add_link(self, line, base_path=None, editable=False):
+        url, _, marker = line.partition(';')
+        url = url.strip()
+
+        from packaging.markers import Marker
+
+        if marker.strip() and not self.evaluate_marker(Marker(marker)):
+            return
+
+        if not urlparse(url).scheme:
+            url, sep, fragment = url.partition('#')
+            path = Path(url).expanduser()
+            if base_path is not None and not path.is_absolute():
+                path = Path(base_path) / path
+            url = path.resolve().as_uri() + sep + fragment
+
+        match = EGG_NAME.search(url)
+
+        if not match:
+            self.links.add(url)
+            return
+
+        value = self.requirements[match.group(1).lower()]
+        value.links.add(url)
+        value.editable |= editable
+
+    def result(self):
+        """
+        Returns:
+            list(str): The merged requirements, one per package.
+        """
+        return format_requirements(self.requirements, sorted(self.links))
+
+
+def merge_requirements(files=None, rules=None):
+    """
+    Merge the requirements of requirement files and of single
+    requirement rules.
+
+    Args:
+        files (iterable): Paths of requirement files.
+
+        rules (iterable): Requirements such as ``requests >2``.
+
+    Returns:
+        list(str): The merged requirements.
+    """
+    merger = RequirementMerger()
+
+    for filename in sorted(str(filename) for filename in files or []):
+        merger.add_file(filename)
+
+    for rule in sorted(rules or []):
+        merger.add_string(rule)
+
+    return merger.result()
+
+
+def requirement_files(files):
+    """
+    Returns the requirement files ``files`` and the files they include
+    with ``-r``, recursively.
+
+    Returns:
+        list(Path): The resolved paths of the files, sorted.
+    """
+    merger = RequirementMerger()
+    result = set()
+    pending = [Path(filename) for filename in files or []]
+
+    while pending:
+        path = pending.pop().resolve()
+
+        if path in result:
+            continue
+
+        result.add(path)
+
+        try:
+            content = path.read_text(encoding='utf-8')
+        except (IOError, UnicodeDecodeError):
+            continue
+
+        for _, line in merger.logical_lines(content):
+            included = merger.included_file(line, path.parent)
+            if included is not None:
+                pending.append(included)
+
+    return sorted(result)
+
+
+def requirements_hash(dependencies, files, package_map=None, rules=None):
+    """
+    Returns a digest of everything used to compute requirements.
+
+    Args:
+        dependencies (dict): Python external dependencies by module.
+
+        files (iterable): Paths of requirement files, their content and
+            the content of the files they include are part of the digest.
+
+        package_map (dict): The package map applied to dependencies.
+
+        rules (iterable): Extra requirements.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    check = hashlib.sha1()
+
+    data = {
+        "python": sys.executable,
+        "version": list(sys.version_info[:3]),
+        "dependencies": {
+            name: sorted(packages)
+            for name, packages in dependencies.items()
+        },
+        "package_map": package_map or {},
+        "rules": sorted(rules or []),
+        "files": [str(path) for path in requirement_files(files)],
+    }
+    check.update(json.dumps(data, sort_keys=True).encode('utf-8'))
+
+    for filename in data['files']:
+        try:
+            with open(filename, 'rb') as fin:
+                check.update(fin.read())
+        except IOError:
+            # Included files created later change the digest
+            check.update(b'\0')
+
+    return check.hexdigest()
+
+
+class RequirementsLock(object):
+    """
+    Cache of merged requirements keyed by the digest of their inputs.
+
+    The merged requirements are written in ``path`` and the digest in
+    ``<path>.lock`` with a flag telling if they were installed. When the
+    digest of the inputs didn't change, requirements don't have to be
+    merged again and installed requirements don't have to be passed
+    to pip again.
+
+    Packages removed from the python environment by other means than
+    odootools aren't detected, remove the lock file to install them
+    again.
+
+    Attributes:
+        path (Path): The requirements file.
+
+        lock_path (Path): The file storing the digest.
+    """
+    def __init__(self, path):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + '.lock')
+
+    def load(self):
+        try:
+            with self.lock_path.open('r') as fin:
+                data = json.load(fin)
+            requirements = self.path.read_text().splitlines()
+        except (IOError, ValueError):
+            return {}
+
+        data['requirements'] = [req for req in requirements if req]
+
+        return data
+
+    def get(self, digest):
+        """
+        Returns:
+            list(str): The requirements computed for ``digest`` or None.
+        """
+        data = self.load()
+
+        if data.get('hash') != digest:
+            return None
+
+        return data['requirements']
+
+    def is_installed(self, digest):
+        data = self.load()
+        return data.get('hash') == digest and data.get('installed', False)
+
+    def save(self, digest, requirements, installed=False):
+        """
+        Store ``requirements`` for ``digest``.
+
+        The cache is only an optimization, failing to write it is logged
+        and ignored.
+        """
+        data = {
+            "hash": digest,
+            "installed": installed,
+        }
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+            for path, content in [
+                (self.path, "\n".join(requirements)),
+                (self.lock_path, json.dumps(data, indent=2)),
+            ]:
+                tmp_path = path.with_name(path.name + '.tmp')
+                tmp_path.write_text(content)
+                os.replace(str(tmp_path), str(path))
+        except IOError:
+            _logger.warning(
+                "Cannot write requirements in %s", self.path, exc_info=True
+            )
+
+
+def merge_requirements_pip(files):
+    """
+    Merge requirement files using the parser of pip.
+
+    It supports every option of pip but it's much slower than
+    :func:`merge_requirements` and relies on pip internals.
+    """
+    from pip._internal.network.session import PipSession
+    from pip._internal.req.req_file import parse_requirements
+    from pip._internal.req.constructors import (
+        install_req_from_parsed_requirement
+    )
+
     requirements = defaultdict(lambda: Requirement())
     links = set()
 
@@ -45,28 +531,4 @@ def merge_requirements(files):
                 requirements[name].links |= {requirement.link.url}
             requirements[name].editable |= requirement.editable
 
-    result = []
-    for key, value in requirements.items():
-        if value.links:
-            result.append("%s" % value.links.pop())
-        else:
-            requirement_line = [key]
-
-            if value.extras:
-                extras = [str(extra) for extra in value.extras]
-                extras.sort()
-                requirement_line.append("[{}]".format(
-                    ",".join(extras)
-                ))
-
-            if value.specifiers:
-                specifiers = [str(spec) for spec in value.specifiers]
-                specifiers.sort()
-                requirement_line.append(",".join(specifiers))
-
-            result.append(" ".join(requirement_line))
-
-    for link in links:
-        result.append(link)
-
-    return result
+    return format_requirements(requirements, links)
@@ -53,6 +53,7 @@ setuptools.setup(
         "password-strength",
         "psycopg2",
         "overlaymodule",
+        "importlib_metadata; python_version < '3.8'",
     ],
     extras_require={
         "docs": [
@@ -62,6 +63,9 @@ setuptools.setup(
             "sphinx-click",
             "sphinxcontrib.asciinema",
         ],
+        "yaml": [
+            "pyyaml",
+        ],
         "test": [
             "mock",
             "pytest",
@@ -76,14 +80,14 @@ setuptools.setup(
     python_requires='>=3.6',
     entry_points={
         "console_scripts": [
-            "odootools = odoo_tools.cli.odot:command",
+            "odootools = odoo_tools.cli.daemon:main",
         ],
         "odootools.registry": [
             "registry = odoo_tools.cli.registry:registry",
         ],
         "odootools.command": [
             "module = odoo_tools.cli.click.module:module",
-            "addons_paths = odoo_tools.cli.click.path:addons_paths",
+            "path = odoo_tools.cli.click.path:addons_paths",
             "config = odoo_tools.cli.click.config:config",
             "entrypoint = odoo_tools.cli.click.entrypoint:entrypoint",
             "shell = odoo_tools.cli.click.shell:shell",
@@ -93,6 +97,8 @@ setuptools.setup(
             "user = odoo_tools.cli.click.users:user",
             "db = odoo_tools.cli.click.db:db",
             "gen = odoo_tools.cli.click.gen:gen",
+            "daemon = odoo_tools.cli.click.daemon:daemon",
+            "batch = odoo_tools.cli.click.batch:batch",
         ]
     },
     package_data={
@@ -35,6 +35,27 @@ def test_session_store_mixin():
         session_store.make_session_store()
 
 
+def test_session_store_refresh():
+    session_store = SessionStoreMixin()
+    session = MagicMock()
+
+    assert session_store.session_mtime(session) is None
+    assert session_store.session_refresh_needed(session) is False
+
+    with patch.object(session_store, 'session_mtime') as mtime, \
+         patch('time.time') as time:
+        time.return_value = 10000
+        mtime.return_value = 10000 - session_store.session_refresh_interval
+        assert session_store.session_refresh_needed(session) is False
+
+        mtime.return_value -= 1
+        assert session_store.session_refresh_needed(session) is True
+
+    session_store._session_store = MagicMock()
+    session_store.refresh_session(session)
+    session_store._session_store.save.assert_called_once_with(session)
+
+
 def test_custom_session_store():
     class Base(object):
         def _request_type(self):
@@ -0,0 +1,134 @@
+import pytest
+from mock import MagicMock, patch
+
+from odoo_tools.app.mixins.registries import (
+    RegistryManager,
+    RegistryInfo,
+    get_rss,
+)
+
+
+@pytest.fixture
+def modules():
+    return {
+        "odoo": MagicMock(),
+        "odoo.modules": MagicMock(),
+        "odoo.modules.registry": MagicMock(),
+    }
+
+
+def test_get_rss():
+    rss = get_rss()
+    assert rss is None or rss > 0
+
+    with patch('builtins.open') as fopen:
+        fopen.side_effect = OSError
+        assert get_rss() is None
+
+
+def test_registry_info():
+    info = RegistryInfo('test', MagicMock(), 1.5, 100)
+    assert info.hits == 0
+
+    info.touch()
+    values = info.values()
+    assert values['hits'] == 1
+    assert values['load_time'] == 1.5
+    assert values['memory'] == 100
+
+
+def test_registry_manager_lazy_load(modules):
+    registries = {
+        'a': MagicMock(),
+        'b': MagicMock(),
+    }
+    registry = modules['odoo.modules.registry'].Registry
+    registry.side_effect = lambda name: registries[name]
+
+    manager = RegistryManager()
+
+    with patch.dict('sys.modules', modules):
+        assert manager.metrics() == {}
+        assert manager.get('a') == registries['a']
+        assert manager.get('a') == registries['a']
+        assert manager.get('b') == registries['b']
+
+    metrics = manager.metrics()
+    assert set(metrics.keys()) == {'a', 'b'}
+    assert metrics['a']['hits'] == 2
+    assert metrics['b']['hits'] == 1
+    registry.delete.assert_not_called()
+
+
+def test_registry_manager_reloaded(modules):
+    registry = modules['odoo.modules.registry'].Registry
+    registry.side_effect = [MagicMock(), MagicMock()]
+
+    manager = RegistryManager()
+
+    with patch.dict('sys.modules', modules):
+        reg1 = manager.get('a')
+        # Registry replaced by odoo
+        reg2 = manager.get('a')
+
+    assert reg1 != reg2
+    assert manager.registries['a'].registry == reg2
+    assert manager.registries['a'].hits == 1
+
+
+def test_registry_manager_max_size(modules):
+    registry = modules['odoo.modules.registry'].Registry
+    registry.side_effect = lambda name: f"registry-{name}"
+
+    manager = RegistryManager(max_size=2)
+
+    with patch.dict('sys.modules', modules):
+        manager.get('a')
+        manager.get('b')
+        manager.get('a')
+        manager.get('c')
+
+    assert list(manager.registries.keys()) == ['a', 'c']
+    registry.delete.assert_called_once_with('b')
+
+    assert manager.unload('missing') is None
+
+
+def test_registry_manager_max_memory(modules):
+    registry = modules['odoo.modules.registry'].Registry
+    registry.side_effect = lambda name: f"registry-{name}"
+
+    manager = RegistryManager(max_memory=250)
+
+    rss = iter([0, 100, 100, 100, 200, 200, 200, 300, 300])
+
+    with patch.dict('sys.modules', modules), \
+         patch('odoo_tools.app.mixins.registries.get_rss') as get_rss:
+        get_rss.side_effect = lambda: next(rss)
+
+        manager.get('a')
+        manager.get('b')
+        manager.get('c')
+
+    assert list(manager.registries.keys()) == ['b', 'c']
+    assert manager.registries['c'].memory == 100
+    registry.delete.assert_called_once_with('a')
+
+
+def test_registry_manager_max_idle(modules):
+    registry = modules['odoo.modules.registry'].Registry
+    registry.side_effect = lambda name: f"registry-{name}"
+
+    manager = RegistryManager(max_idle=60)
+
+    with patch.dict('sys.modules', modules), \
+         patch('time.time') as time:
+        time.return_value = 0
+        manager.get('a')
+        time.return_value = 30
+        manager.get('b')
+        time.return_value = 80
+        manager.get('b')
+
+    assert list(manager.registries.keys()) == ['b']
+    registry.delete.assert_called_once_with('a')
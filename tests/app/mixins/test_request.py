@@ -147,6 +147,60 @@ def test_session_mixin(modules):
         assert response == ""
 
 
+class MockSession(dict):
+    def __init__(self, data, sid='sissid', new=False):
+        super().__init__(data)
+        self.sid = sid
+        self.new = new
+        self.rotate = False
+        self.should_save = True
+        self.context = self.setdefault('context', {})
+
+
+def test_session_mixin_dirty_tracking(modules):
+    app = MagicMock()
+    app.session_refresh_needed.return_value = False
+
+    Custom = type('Custom', (SessionManagementMixin, BaseRequest), {})
+
+    httprequest = MagicMock()
+    httprequest.args = {}
+    httprequest.headers = {}
+    httprequest.cookies = {
+        "session_id": "sissid"
+    }
+
+    session = MockSession({'uid': 1})
+    app.session_store.get.return_value = session
+
+    with patch.dict('sys.modules', modules):
+        request = Custom(app, httprequest)
+
+        # Setting the same value doesn't count as a modification
+        session['uid'] = 1
+        request.get_response("")
+        app.session_store.save.assert_not_called()
+        app.refresh_session.assert_not_called()
+
+        # Refresh of the session expiry
+        app.session_refresh_needed.return_value = True
+        request.get_response("")
+        app.session_store.save.assert_not_called()
+        app.refresh_session.assert_called_once_with(session)
+
+        session['uid'] = 2
+        request.get_response("")
+        app.session_store.save.assert_called_once_with(session)
+
+        app.session_store.save.reset_mock()
+        session['uid'] = 1
+        session.new = True
+        request.get_response("")
+        app.session_store.save.assert_called_once_with(session)
+
+    assert request.hash_session({'a': lambda: None}) is None
+
+
 def test_web_management_mixin(modules):
     app = MagicMock()
     httprequest = MagicMock()
@@ -248,6 +302,35 @@ def test_db_management(modules):
         request.post_dispatch('')
 
 
+def test_db_management_catalog(modules):
+    app = MagicMock()
+    app.db_catalog.db_filter.return_value = ['db1']
+    httprequest = MagicMock()
+    httprequest.environ = {'HTTP_HOST': 'www.example.com:8069'}
+    httprequest.args = {}
+    httprequest.session.db = None
+
+    with patch('sys.modules', modules):
+        request = DbManagementMixin(app, httprequest)
+
+        assert request.hostname == 'www.example.com'
+        assert request.db_filter(['db1', 'db2']) == ['db1']
+        assert request.db_monodb() == 'db1'
+
+        request.pre_dispatch()
+        assert httprequest.session.db == 'db1'
+        app.db_catalog.db_filter.assert_called_with('www.example.com')
+        modules['odoo.http'].db_monodb.assert_not_called()
+
+        app.db_catalog.db_filter.return_value = ['db1', 'db2']
+        assert request.db_monodb() is None
+
+        # Without catalog, odoo is used
+        app.db_catalog = None
+        modules['odoo.http'].db_monodb.return_value = 'db3'
+        assert request.db_monodb() == 'db3'
+
+
 def test_request_full(modules):
     app = MagicMock()
     httprequest = MagicMock()
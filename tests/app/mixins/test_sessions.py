@@ -1,7 +1,14 @@
+import os
 import pytest
 from mock import patch, MagicMock
 
-from odoo_tools.app.mixins.sessions import FileSystemSessionStoreMixin
+import pickle
+from odoo_tools.app.mixins.sessions import (
+    FileSystemSessionStoreMixin,
+    CachedSessionStoreMixin,
+    LRUSessionStore,
+)
+from odoo_tools.app.mixins.app import SessionStoreMixin
 
 
 @pytest.fixture
@@ -23,6 +30,99 @@ class MockSession(object):
     pass
 
 
+class MockDictSession(dict):
+    def __init__(self, data, sid, new=False):
+        super().__init__(data)
+        self.sid = sid
+        self.new = new
+
+
+class MockFileStore(object):
+    session_class = MockDictSession
+
+    def __init__(self, path):
+        self.path = path
+        self.loads = 0
+        self.saves = 0
+
+    def is_valid_key(self, sid):
+        return bool(sid)
+
+    def get_session_filename(self, sid):
+        return str(self.path / f"{sid}.sess")
+
+    def new(self):
+        return self.session_class({}, 'new', True)
+
+    def get(self, sid):
+        self.loads += 1
+        try:
+            with open(self.get_session_filename(sid), 'rb') as fin:
+                data = pickle.load(fin)
+        except IOError:
+            return self.session_class({}, sid, True)
+        return self.session_class(data, sid, False)
+
+    def save(self, session):
+        self.saves += 1
+        with open(self.get_session_filename(session.sid), 'wb') as fout:
+            pickle.dump(dict(session), fout)
+
+    def delete(self, session):
+        os.unlink(self.get_session_filename(session.sid))
+
+
+class MockMemoryStore(object):
+    """
+    Store without session files, like a redis or database store.
+    """
+    session_class = MockDictSession
+
+    def __init__(self):
+        self.data = {}
+        self.loads = 0
+        self.saves = 0
+
+    def is_valid_key(self, sid):
+        return bool(sid)
+
+    def new(self):
+        return self.session_class({}, 'new', True)
+
+    def get(self, sid):
+        self.loads += 1
+        if sid not in self.data:
+            return self.session_class({}, sid, True)
+        return self.session_class(dict(self.data[sid]), sid, False)
+
+    def save(self, session):
+        self.saves += 1
+        self.data[session.sid] = dict(session)
+
+    def delete(self, session):
+        self.data.pop(session.sid, None)
+
+
+def test_lru_store_without_version():
+    backend = MockMemoryStore()
+    store = LRUSessionStore(backend)
+
+    session = MockDictSession({'uid': 1}, 'abc')
+    store.save(session)
+    assert backend.saves == 1
+
+    # An other worker modifies the session
+    backend.data['abc'] = {'uid': 2}
+
+    assert store.get('abc') == {'uid': 2}
+    assert backend.loads == 1
+    assert store.sessions == {}
+
+    # Unchanged sessions are saved as they can't be compared
+    store.save(MockDictSession({'uid': 2}, 'abc'))
+    assert backend.saves == 2
+
+
 def test_fs_mixin(modules):
     app = MagicMock()
 
@@ -80,3 +180,109 @@ def test_fs_mixin(modules):
         store.session_gc(delta=10)
         time.assert_called_once()
         unlink.assert_called_once()
+
+
+def test_lru_session_store(tmp_path):
+    backend = MockFileStore(tmp_path)
+    store = LRUSessionStore(backend, max_size=2)
+
+    assert store.path == tmp_path
+
+    session = store.get('a')
+    assert session.new is True
+    assert backend.loads == 1
+
+    session['uid'] = 1
+    store.save(session)
+    assert backend.saves == 1
+
+    # Served from memory without reloading
+    session = store.get('a')
+    assert session == {'uid': 1}
+    assert session.new is False
+    assert backend.loads == 1
+
+    # Unmodified sessions aren't written back
+    store.save(session)
+    assert backend.saves == 1
+
+    # Modifications on a loaded session do not leak in the cache
+    session['uid'] = 2
+    assert store.get('a') == {'uid': 1}
+
+    store.save(session)
+    assert backend.saves == 2
+
+    # Session written by an other worker
+    other = MockDictSession({'uid': 3}, 'a')
+    backend.save(other)
+    filename = backend.get_session_filename('a')
+    stat = os.stat(filename)
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+
+    assert store.get('a') == {'uid': 3}
+    assert backend.loads == 2
+
+    # LRU is bounded
+    for sid in ['b', 'c']:
+        session = store.get(sid)
+        session.sid = sid
+        session['uid'] = sid
+        store.save(session)
+
+    assert list(store.sessions.keys()) == ['b', 'c']
+
+    store.delete(session)
+    assert list(store.sessions.keys()) == ['b']
+    assert store.get('c').new is True
+
+    assert store.get(None).new is True
+    assert store.new().new is True
+
+
+def test_cached_session_store_mixin():
+    class BaseApp(object):
+        def __init__(self, application):
+            self.app = application
+
+    class MockStoreMixin(SessionStoreMixin):
+        def make_session_store(self):
+            return MagicMock()
+
+    Custom = type(
+        'Custom', (CachedSessionStoreMixin, MockStoreMixin, BaseApp), {}
+    )
+
+    store = Custom(MagicMock())
+    sstore = store.session_store
+
+    assert isinstance(sstore, LRUSessionStore)
+    assert sstore.max_size == CachedSessionStoreMixin.session_cache_size
+
+
+def test_fs_mixin_refresh(tmp_path):
+    class BaseApp(object):
+        def __init__(self, application):
+            self.app = application
+
+    Custom = type('Custom', (FileSystemSessionStoreMixin, BaseApp), {})
+
+    store = Custom(MagicMock())
+    store._session_store = MockFileStore(tmp_path)
+
+    session = MockDictSession({'uid': 1}, 'a')
+
+    assert store.session_mtime(session) is None
+
+    # Missing session files are saved again
+    store.refresh_session(session)
+    assert store.session_store.saves == 1
+
+    filename = store.session_store.get_session_filename('a')
+    os.utime(filename, (0, 0))
+    assert store.session_mtime(session) == 0
+    assert store.session_refresh_needed(session) is True
+
+    store.refresh_session(session)
+    assert store.session_store.saves == 1
+    assert store.session_refresh_needed(session) is False
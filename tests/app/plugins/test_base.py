@@ -2,6 +2,7 @@ from pathlib import Path
 import pytest
 from mock import MagicMock, patch
 import sys
+import threading
 from odoo_tools.app.application import OdooApplication
 from odoo_tools.app.plugins.base import (
     Plugin,
@@ -9,9 +10,13 @@ from odoo_tools.app.plugins.base import (
     AddonsPathPlugin,
     InitOdooPlugin,
     SessionStorePlugin,
+    RegistryManagerPlugin,
+    DbCatalogPlugin,
+    CompiledTranslationsPlugin,
     DbRoutePlugin,
     AssetsPlugin,
     OdooWSGIHandler,
+    wait_preloads,
 )
 
 
@@ -134,16 +139,118 @@ def test_init_odoo_plugin(modules):
         "filter_version": "15.0",
     }
 
+    with patch.dict('sys.modules', modules):
+        plugin.postinit_environment()
+
+    app.application.registries.get.assert_called_once_with('test')
+
+    app.application = None
     with patch.dict('sys.modules', modules):
         plugin.postinit_environment()
 
     registry = modules['odoo.modules.registry']
+    registry.Registry.new.assert_called_once_with('test')
     registry.Registry.new.side_effect = MockException
 
     # Does not crash if db can't be loaded
     with patch.dict('sys.modules', modules):
         plugin.postinit_environment()
 
+    # Registries are loaded lazily
+    registry.Registry.new.reset_mock()
+    plugin = InitOdooPlugin(db, preload=False)
+    plugin.register(app)
+    with patch.dict('sys.modules', modules):
+        plugin.postinit_environment()
+    registry.Registry.new.assert_not_called()
+
+
+def test_init_odoo_plugin_parallel():
+    app = MagicMock()
+    app.env.manage.db_list.return_value = [
+        {'name': 'a', 'active': 1},
+        {'name': 'b', 'active': 3},
+        {'name': 'c', 'active': 2},
+    ]
+
+    plugin = InitOdooPlugin(
+        preload_jobs=2,
+        preload_priority=lambda db: -db['active']
+    )
+    plugin.register(app)
+
+    loaded = []
+    with patch.object(plugin, 'load_registry') as load_registry:
+        load_registry.side_effect = loaded.append
+        plugin.postinit_environment()
+
+    assert plugin.ready.is_set()
+    assert set(loaded) == {'a', 'b', 'c'}
+
+    # Ready once the first database is loaded
+    release = threading.Event()
+    loaded = []
+
+    def load_registry(name):
+        if name != 'b':
+            release.wait(5)
+        loaded.append(name)
+
+    plugin = InitOdooPlugin(
+        preload_jobs=1,
+        preload_ready=1,
+        preload_priority=lambda db: -db['active']
+    )
+    plugin.register(app)
+
+    with patch.object(plugin, 'load_registry') as load:
+        load.side_effect = load_registry
+        plugin.postinit_environment()
+        assert loaded == ['b']
+        assert plugin.ready.is_set()
+        threading.Timer(0.1, release.set).start()
+
+        # Forking waits for the registries loading in the background
+        wait_preloads()
+        assert loaded == ['b', 'c', 'a']
+
+
+def test_init_odoo_plugin_preload_ready_uneven():
+    app = MagicMock()
+    app.env.manage.db_list.return_value = [
+        {'name': 'a', 'active': 1},
+        {'name': 'b', 'active': 3},
+        {'name': 'c', 'active': 2},
+    ]
+
+    release = threading.Event()
+    loaded = []
+
+    def load_registry(name):
+        # The first database submitted is the slowest to load
+        if name == 'b':
+            release.wait(5)
+        loaded.append(name)
+
+    plugin = InitOdooPlugin(
+        preload_jobs=3,
+        preload_ready=2,
+        preload_priority=lambda db: -db['active']
+    )
+    plugin.register(app)
+
+    with patch.object(plugin, 'load_registry') as load:
+        load.side_effect = load_registry
+        plugin.postinit_environment()
+
+        # Ready once two registries are loaded, whichever they are
+        assert plugin.ready.is_set()
+        assert sorted(loaded) == ['a', 'c']
+
+        release.set()
+        wait_preloads()
+        assert sorted(loaded) == ['a', 'b', 'c']
+
 
 def test_session_store_plugin():
     app = MagicMock()
@@ -165,6 +272,66 @@ def test_session_store_plugin():
     assert app.application_mixins[-1] == 1
     assert len(app.application_mixins) == 2
 
+    app.application_mixins = [1]
+    plugin = SessionStorePlugin(store, cache_size=10)
+    plugin.register(app)
+    plugin.prepare_environment()
+    assert app.application_mixins[1:] == [store, 1]
+    assert app.application_mixins[0].session_cache_size == 10
+
+    app.application_mixins = [1]
+    plugin = SessionStorePlugin(refresh_interval=60)
+    plugin.register(app)
+    plugin.prepare_environment()
+    assert app.application_mixins[0].session_refresh_interval == 60
+    assert len(app.application_mixins) == 2
+
+
+def test_registry_manager_plugin():
+    app = MagicMock()
+    app.application_mixins = [1]
+
+    plugin = RegistryManagerPlugin(max_size=10, max_idle=60)
+    plugin.register(app)
+    plugin.prepare_environment()
+
+    settings = app.application_mixins[0]
+    assert app.application_mixins[-1] == 1
+    assert settings.registry_max_size == 10
+    assert settings.registry_max_memory is None
+    assert settings.registry_max_idle == 60
+
+
+def test_db_catalog_plugin():
+    app = MagicMock()
+    catalog = app.env.manage.catalog
+
+    plugin = DbCatalogPlugin(ttl=30)
+    plugin.register(app)
+    plugin.postinit_environment()
+
+    assert catalog.ttl == 30
+    catalog.start.assert_not_called()
+    assert app.application.db_catalog == catalog
+
+    plugin = DbCatalogPlugin(refresh_interval=10)
+    plugin.register(app)
+    plugin.postinit_environment()
+
+    catalog.start.assert_called_once_with(10)
+
+
+def test_compiled_translations_plugin():
+    app = MagicMock()
+
+    plugin = CompiledTranslationsPlugin('/tmp/catalogs')
+    plugin.register(app)
+
+    with patch('odoo_tools.modules.compiled.install_loader') as loader:
+        plugin.init_environment()
+
+    loader.assert_called_once_with('/tmp/catalogs')
+
 
 def test_db_route():
     app = MagicMock()
@@ -0,0 +1,116 @@
+import json
+from mock import patch
+
+import pytest
+
+from odoo_tools.cli.odot import command
+from odoo_tools.cli.batch import Step, load_steps, run_steps
+from odoo_tools.api.modules import ModuleApi
+from odoo_tools.exceptions import ArgumentError
+from tests.utils import generate_odoo_dir, generate_addons
+
+
+def test_load_steps():
+    steps = load_steps(json.dumps([
+        "module ls --only-name",
+        ["config", "get", "db_name"],
+        {"args": "db list", "name": "list", "continue_on_error": True},
+    ]))
+
+    assert [step.args for step in steps] == [
+        ['module', 'ls', '--only-name'],
+        ['config', 'get', 'db_name'],
+        ['db', 'list'],
+    ]
+    assert steps[0].name == "module ls --only-name"
+    assert steps[2].name == "list"
+    assert steps[2].continue_on_error
+
+    yaml_steps = load_steps(
+        "steps:\n"
+        "  - module ls --only-name\n"
+        "  - [config, get, db_name]\n"
+    )
+    assert [step.args for step in yaml_steps] == [
+        ['module', 'ls', '--only-name'],
+        ['config', 'get', 'db_name'],
+    ]
+
+    with pytest.raises(ArgumentError):
+        load_steps('{"steps": "module ls"}')
+
+    with pytest.raises(ArgumentError):
+        load_steps('[{"command": "module ls"}]')
+
+    with pytest.raises(ArgumentError):
+        load_steps('module ls', format='json')
+
+
+def test_run_steps():
+    steps = [
+        Step(['a']),
+        Step(['b'], continue_on_error=True),
+        Step(['c']),
+        Step(['d']),
+        Step(['e']),
+    ]
+    codes = {'a': 0, 'b': 1, 'c': 2, 'd': 0, 'e': 0}
+
+    assert not run_steps(steps, lambda args: codes[args[0]])
+    assert [step.status for step in steps] == [
+        'ok', 'failed', 'failed', 'skipped', 'skipped'
+    ]
+
+    for step in steps:
+        step.exit_code = None
+
+    assert not run_steps(
+        steps, lambda args: codes[args[0]], keep_going=True
+    )
+    assert [step.status for step in steps] == [
+        'ok', 'failed', 'failed', 'ok', 'ok'
+    ]
+
+
+def test_batch_command(runner, tmp_path):
+    odoo_dir, addons_dir = generate_odoo_dir(tmp_path)
+    generate_addons(addons_dir, ['a', 'b'])
+
+    batch = tmp_path / 'batch.yml'
+    batch.write_text(
+        "- module ls --only-name\n"
+        "- module ls --only-name\n"
+    )
+
+    with patch.object(
+        ModuleApi, 'list', autospec=True, side_effect=ModuleApi.list
+    ) as list_modules:
+        result = runner.invoke(
+            command,
+            ['batch', str(batch)],
+            env={'ODOO_BASE_PATH': str(odoo_dir)}
+        )
+
+    assert result.exit_code == 0, result.output
+    assert "[1/2] module ls --only-name: ok" in result.output
+    assert "2 steps: 2 ok, 0 failed, 0 skipped" in result.output
+
+    # Both steps received the environment of the batch command
+    envs = {call.args[0].environment for call in list_modules.mock_calls}
+    assert len(envs) == 1
+
+
+def test_batch_command_failure(runner):
+    result = runner.invoke(
+        command,
+        ['batch', '-'],
+        input='["unknown", "platform arch", "platform arch"]'
+    )
+
+    assert result.exit_code == 1
+    assert "[1/3] unknown: failed (exit code 2)" in result.output
+    assert "3 steps: 0 ok, 1 failed, 2 skipped" in result.output
+
+    result = runner.invoke(command, ['batch', '-'], input='{}')
+    assert result.exit_code == 1
+    assert "A batch must contain a list of steps" in result.output
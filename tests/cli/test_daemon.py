@@ -0,0 +1,192 @@
+import os
+import sys
+import logging
+import threading
+from io import StringIO
+from mock import patch
+
+import pytest
+
+from odoo_tools.cli import daemon
+from odoo_tools.cli.daemon import (
+    DaemonServer,
+    forward,
+    is_forwarded,
+    main,
+    request,
+)
+from tests.utils import generate_odoo_dir, generate_addons
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = DaemonServer(tmp_path / 'odootools.sock')
+    server.bind()
+
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+
+    yield server
+
+    if server.running:
+        request(server.path, {"action": "stop"}, timeout=5)
+    thread.join(5)
+
+
+def test_daemon_run(server, tmp_path, capsys):
+    odoo_dir, addons_dir = generate_odoo_dir(tmp_path)
+    generate_addons(addons_dir, ['a', 'b'])
+
+    with patch.dict(os.environ, {'ODOO_BASE_PATH': str(odoo_dir)}):
+        assert forward(['module', 'ls', '--only-name'], server.path) == 0
+        output = capsys.readouterr().out
+        assert set(output.split()) == {'a', 'b'}
+
+        assert forward(['module', 'ls', '--only-name'], server.path) == 0
+        assert set(capsys.readouterr().out.split()) == {'a', 'b'}
+
+    # Both commands used the same environment
+    assert len(server.environments) == 1
+    environments, = server.environments.values()
+    assert list(environments) == [(None, False)]
+
+    # The environment of the daemon isn't modified by the client
+    assert 'ODOO_BASE_PATH' not in os.environ
+
+    assert forward(['unknown'], server.path) == 2
+    assert "No such command" in capsys.readouterr().err
+
+    response = request(server.path, {"action": "ping"})
+    assert response == {"pid": os.getpid(), "served": 3}
+
+
+def test_daemon_stop(server):
+    response = request(server.path, {"action": "stop"}, timeout=5)
+    assert response['pid'] == os.getpid()
+
+    # The socket is removed once the server stops
+    for _ in range(50):
+        if not os.path.exists(server.path):
+            break
+        threading.Event().wait(0.1)
+
+    assert not os.path.exists(server.path)
+    assert request(server.path, {"action": "ping"}) is None
+
+
+def test_daemon_already_running(server):
+    with pytest.raises(RuntimeError):
+        DaemonServer(server.path).bind()
+
+
+def test_forward_without_daemon(tmp_path):
+    assert forward(['module', 'ls'], tmp_path / 'missing.sock') is None
+
+
+def test_main_forward(tmp_path):
+    socket_path = str(tmp_path / 'odootools.sock')
+
+    with patch.object(daemon, 'forward') as mocked_forward, \
+            patch('odoo_tools.cli.odot.command') as command, \
+            patch.dict(os.environ, {daemon.SOCKET_ENV: socket_path}):
+
+        mocked_forward.return_value = 0
+        with patch.object(sys, 'argv', ['odootools', 'db', 'list']):
+            with pytest.raises(SystemExit):
+                main()
+        mocked_forward.assert_called_once_with(['db', 'list'], socket_path)
+        assert command.call_count == 0
+
+        # Falls back to the local cli when the daemon isn't running
+        mocked_forward.return_value = None
+        with patch.object(sys, 'argv', ['odootools', 'db', 'list']):
+            main()
+        assert command.call_count == 1
+
+        mocked_forward.reset_mock()
+        with patch.object(sys, 'argv', ['odootools', 'shell']):
+            main()
+        assert mocked_forward.call_count == 0
+        assert command.call_count == 2
+
+
+def test_is_forwarded():
+    assert is_forwarded(['db', 'list'])
+    assert is_forwarded(['-c', 'odoo.cfg', 'module', 'ls'])
+    # Only the name of the command matters
+    assert is_forwarded(['module', 'show', 'shell'])
+    assert is_forwarded(['--log-level', 'shell', 'module', 'ls'])
+
+    assert not is_forwarded(['shell'])
+    assert not is_forwarded(['--config=odoo.cfg', 'shell'])
+    assert not is_forwarded(['daemon', 'start'])
+    assert not is_forwarded(['--log-level', 'INFO', 'entrypoint', 'odoo'])
+
+    # Batches read from the standard input run locally
+    assert not is_forwarded(['batch'])
+    assert not is_forwarded(['batch', '-'])
+    assert not is_forwarded(['batch', '--format', 'yaml'])
+    assert not is_forwarded(['batch', '--keep-going', '--', '-'])
+    assert is_forwarded(['batch', 'steps.yml'])
+    assert is_forwarded(['batch', '--format', 'yaml', 'steps'])
+
+
+def test_main_batch_stdin(server, capsys):
+    argv = ['odootools', 'batch']
+    stdin = StringIO('["platform arch", "platform arch"]')
+
+    with patch.object(sys, 'argv', argv), \
+            patch.object(sys, 'stdin', stdin), \
+            patch.dict(os.environ, {daemon.SOCKET_ENV: server.path}):
+        with pytest.raises(SystemExit) as exc:
+            main()
+
+    # The batch ran locally with the standard input of the client
+    assert exc.value.code in (None, 0)
+    assert "2 steps: 2 ok, 0 failed, 0 skipped" in capsys.readouterr().err
+    assert request(server.path, {"action": "ping"})['served'] == 0
+
+
+def test_daemon_closed_stdin(server):
+    response = server.run(['batch', '-'], dict(os.environ))
+
+    assert response['exit_code'] == 1
+    assert "can't read the standard input" in response['stderr']
+
+
+def test_daemon_clears_socket(server, capsys):
+    environ = dict(os.environ)
+    environ[daemon.SOCKET_ENV] = server.path
+
+    seen = []
+
+    def fake_run(args, obj=None):
+        seen.append(os.environ.get(daemon.SOCKET_ENV))
+        return 0
+
+    with patch('odoo_tools.cli.odot.run', side_effect=fake_run):
+        response = server.run(['db', 'list'], environ)
+
+    assert response['exit_code'] == 0
+    assert seen == [None]
+
+
+def test_daemon_logging(server):
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+
+    def fake_run(args, obj=None):
+        logging.basicConfig(level='INFO')
+        logging.getLogger('odoo_tools.test').info("command %s", args[0])
+        return 0
+
+    with patch('odoo_tools.cli.odot.run', side_effect=fake_run):
+        first = server.run(['first'], dict(os.environ))
+        second = server.run(['second'], dict(os.environ))
+
+    # Each command logs in its own output
+    assert 'command first' in first['stderr']
+    assert 'command second' not in first['stderr']
+    assert 'command second' in second['stderr']
+
+    assert root.handlers == handlers
@@ -0,0 +1,178 @@
+import sys
+import json
+import click
+import subprocess
+from mock import MagicMock
+
+from odoo_tools.cli.registry import CommandRegistry, LazyGroup
+
+
+# Modules that must only be imported by the commands using them
+HEAVY_MODULES = [
+    'cryptography',
+    'docutils',
+    'giturlparse',
+    'lxml',
+    'pip',
+    'polib',
+    'psycopg2',
+    'ptpython',
+    'requests',
+]
+
+# Time in seconds allowed to import the cli
+IMPORT_BUDGET = 0.6
+
+
+def import_cli():
+    code = (
+        "import sys, json, time\n"
+        "start = time.perf_counter()\n"
+        "import odoo_tools.cli.odot\n"
+        "duration = time.perf_counter() - start\n"
+        "print(json.dumps([duration, sorted(sys.modules)]))\n"
+    )
+
+    # The first import may compile the sources
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+    output = subprocess.run(
+        [sys.executable, '-c', code],
+        check=True,
+        stdout=subprocess.PIPE,
+    ).stdout
+
+    return json.loads(output)
+
+
+def test_import_budget():
+    duration, modules = import_cli()
+
+    imported = [
+        name
+        for name in HEAVY_MODULES
+        if name in modules
+    ]
+
+    assert imported == []
+    assert not any(
+        name.startswith('odoo_tools.cli.click.')
+        for name in modules
+    )
+    assert duration < IMPORT_BUDGET
+
+
+def test_lazy_group(runner):
+    @click.group(cls=LazyGroup)
+    def main():
+        pass
+
+    @click.command('other-name')
+    def cmd():
+        print('cmd')
+
+    loader = MagicMock(return_value=cmd)
+    main.add_lazy_command('cmd', loader)
+
+    loader.assert_not_called()
+
+    result = runner.invoke(main, ['other-name'])
+
+    assert result.output == 'cmd\n'
+    loader.assert_called_once_with()
+
+    result = runner.invoke(main, ['--help'])
+    assert 'other-name' in result.output
+
+
+def test_registry_lazy_load(runner):
+    @click.group(cls=LazyGroup)
+    def main():
+        pass
+
+    @click.group()
+    def group():
+        pass
+
+    @click.command()
+    def sub():
+        print('sub')
+
+    ep = MagicMock()
+    ep.name = 'group'
+    ep.load.return_value = group
+
+    ext = MagicMock()
+    ext.name = 'group'
+    ext.load.return_value = sub
+
+    registry = CommandRegistry()
+    registry.register('group', ep)
+    registry.extend('group', ext)
+    registry.set_main(main)
+    registry.load()
+
+    ep.load.assert_not_called()
+    ext.load.assert_not_called()
+
+    result = runner.invoke(main, ['group', 'sub'])
+
+    assert result.output == 'sub\n'
+    ep.load.assert_called_once_with()
+    ext.load.assert_called_once_with()
+
+
+def test_registry_command_names():
+    @click.group(cls=LazyGroup)
+    def main():
+        pass
+
+    registry = CommandRegistry()
+    registry.register_commands()
+    registry.set_main(main)
+    registry.load()
+
+    assert 'path' in main.lazy_commands
+    assert 'module' in main.lazy_commands
+    assert main.aliases['addons_paths'] == 'path'
+    assert main.aliases['addons-paths'] == 'path'
+
+    # Invoking a command only loads its entry point
+    for name, loader in list(main.lazy_commands.items()):
+        assert loader().name == name
+
+
+def test_registry_alias(runner):
+    @click.group(cls=LazyGroup)
+    def main():
+        pass
+
+    @click.group('path')
+    def path():
+        pass
+
+    @click.command()
+    def sub():
+        print('sub')
+
+    ep = MagicMock()
+    ep.name = 'path'
+    ep.load.return_value = path
+
+    # Extensions registered under the former name of the command
+    ext = MagicMock()
+    ext.name = 'addons_paths'
+    ext.load.return_value = sub
+
+    registry = CommandRegistry()
+    registry.register('path', ep)
+    registry.extend('addons_paths', ext)
+    registry.set_main(main)
+    registry.load()
+
+    for name in ['path', 'addons_paths', 'addons-paths']:
+        result = runner.invoke(main, [name, 'sub'])
+        assert result.output == 'sub\n'
+
+    result = runner.invoke(main, ['--help'])
+    assert 'addons' not in result.output
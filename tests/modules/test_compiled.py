@@ -0,0 +1,155 @@
+import polib
+import pytest
+from mock import MagicMock, patch
+
+from odoo_tools.modules.search import Manifest
+from odoo_tools.modules.translate import PoFileWriter
+from odoo_tools.modules.compiled import (
+    compile_translations,
+    install_loader,
+    load_compiled,
+)
+
+
+def odoo_rows(source, fileformat='po'):
+    po = polib.pofile(source.read().decode('utf-8'))
+
+    for entry in po:
+        for occurrence, line in entry.occurrences:
+            yield {
+                'src': entry.msgid,
+                'value': entry.msgstr,
+                'res_id': occurrence,
+                'comments': [entry.comment],
+            }
+
+
+@pytest.fixture
+def odoo():
+    odoo = MagicMock()
+    odoo.release.version = '14.0'
+    odoo.tools.translate.TranslationFileReader = odoo_rows
+    modules = {
+        'odoo': odoo,
+        'odoo.release': odoo.release,
+        'odoo.tools': odoo.tools,
+        'odoo.tools.translate': odoo.tools.translate,
+    }
+
+    with patch.dict('sys.modules', modules):
+        yield odoo
+
+
+def make_module(path, translation):
+    manifest = Manifest(path)
+    manifest.save()
+
+    rows = [
+        (
+            path.name, 'model', 'ir.ui.menu,name',
+            '{}.menu'.format(path.name), 'Sales', translation, []
+        ),
+        (
+            path.name, 'code', 'addons/{}/a.py'.format(path.name), 3,
+            'Cancel', 'Annuler', ['odoo-python']
+        ),
+    ]
+
+    i18n = path / 'i18n'
+    i18n.mkdir()
+
+    with (i18n / 'fr.po').open('wb') as buffer:
+        writer = PoFileWriter(buffer, 'fr')
+        writer.po.header = 'header'
+        writer.po.metadata = {'Language': 'fr'}
+        writer.write_rows(rows)
+
+    return manifest
+
+
+def test_compile_translations(tmp_path, odoo):
+    cache_dir = tmp_path / 'cache'
+    manifests = [
+        make_module(tmp_path / 'sale', 'Ventes'),
+        make_module(tmp_path / 'stock', 'Ventes'),
+    ]
+
+    results = compile_translations(manifests, cache_dir, jobs=2)
+
+    assert [result[0] for result in results] == [
+        tmp_path / 'sale' / 'i18n' / 'fr.po',
+        tmp_path / 'stock' / 'i18n' / 'fr.po',
+    ]
+    assert all(compiled for _, _, compiled in results)
+
+    # Compiled again only when the po file changed
+    po_path = tmp_path / 'sale' / 'i18n' / 'fr.po'
+    po_path.write_bytes(po_path.read_bytes().replace(b'Ventes', b'Vente'))
+
+    results2 = compile_translations(manifests, cache_dir, jobs=1)
+    assert [compiled for _, _, compiled in results2] == [True, False]
+    assert results2[1][1] == results[1][1]
+    assert results2[0][1] != results[0][1]
+
+    with po_path.open('rb') as source:
+        rows = load_compiled(cache_dir, source)
+
+    with po_path.open('rb') as source:
+        assert rows == list(odoo_rows(source))
+
+    assert rows[0]['value'] in ('Vente', 'Annuler')
+
+    # Another version of odoo doesn't use the same catalogs
+    odoo.release.version = '15.0'
+
+    with po_path.open('rb') as source:
+        assert load_compiled(cache_dir, source) is None
+
+    results3 = compile_translations(manifests, cache_dir, jobs=1)
+    assert [compiled for _, _, compiled in results3] == [True, True]
+
+
+def test_load_compiled_missing(tmp_path, odoo):
+    manifest = make_module(tmp_path / 'sale', 'Ventes')
+    po_path = manifest.path / 'i18n' / 'fr.po'
+
+    with po_path.open('rb') as source:
+        assert load_compiled(tmp_path / 'cache', source) is None
+        assert source.tell() == 0
+
+
+def test_install_loader(tmp_path, odoo):
+    manifest = make_module(tmp_path / 'sale', 'Ventes')
+    cache_dir = tmp_path / 'cache'
+    compile_translations([manifest], cache_dir)
+
+    calls = []
+
+    def original(source, fileformat='po', *args, **kwargs):
+        calls.append((source, fileformat, args, kwargs))
+        return []
+
+    odoo.tools.translate.TranslationFileReader = original
+
+    install_loader(cache_dir)
+    # Installing twice keeps the original reader
+    install_loader(cache_dir)
+
+    reader = odoo.tools.translate.TranslationFileReader
+    assert reader.original is original
+
+    with (manifest.path / 'i18n' / 'fr.po').open('rb') as source:
+        rows = reader(source, fileformat='po')
+
+    assert isinstance(rows, list)
+    assert len(rows) == 2
+    assert calls == []
+
+    source = MagicMock()
+    reader(source, fileformat='csv')
+    assert calls == [(source, 'csv', (), {})]
+
+    # Files without a catalog get every argument
+    source = MagicMock()
+    reader(source, 'po', 'extra', lang='fr')
+    assert calls[-1] == (source, 'po', ('extra',), {'lang': 'fr'})
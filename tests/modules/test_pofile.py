@@ -0,0 +1,234 @@
+from io import BytesIO
+
+import polib
+
+from odoo_tools.modules.pofile import PoStream, PoStreamWriter
+from odoo_tools.modules.translate import PoFileReader, PoFileWriter
+
+
+SAMPLE = '''# Translation of Odoo Server.
+# This file contains the translation of the following modules:
+# \t* sale
+#
+msgid ""
+msgstr ""
+"Project-Id-Version: Odoo Server 14.0\\n"
+"Language: fr\\n"
+"Content-Type: text/plain; charset=UTF-8\\n"
+"Plural-Forms: \\n"
+
+#. module: sale
+#: model:ir.model.fields,field_description:sale.field_sale_order__name
+#: code:addons/sale/models/sale.py:12
+#, python-format
+msgid "Order Reference"
+msgstr "R\xe9f\xe9rence"
+
+#. module: sale
+#: code:addons/sale/models/sale.py:40
+#, fuzzy
+#| msgid "Old text"
+msgid ""
+"A very long sentence that is split on multiple lines because it "
+"doesn't fit on one line"
+msgstr ""
+"Une tr\xe8s longue phrase"
+" sur plusieurs lignes \\"quoted\\""
+
+# translator comment
+msgctxt "context"
+msgid "One order"
+msgid_plural "%d orders"
+msgstr[0] "Une commande"
+msgstr[1] "%d commandes"
+
+#~ msgid "Removed"
+#~ msgstr "Supprim\xe9"
+'''
+
+
+def entry_data(entry):
+    return (
+        entry.msgctxt,
+        entry.msgid,
+        entry.msgid_plural,
+        entry.msgstr,
+        dict(entry.msgstr_plural),
+        entry.comment,
+        entry.tcomment,
+        entry.occurrences,
+        entry.flags,
+        entry.previous_msgid,
+        entry.obsolete,
+    )
+
+
+def test_po_stream_matches_polib(tmp_path):
+    po_path = tmp_path / 'fr.po'
+    po_path.write_text(SAMPLE, encoding='utf-8')
+
+    expected = polib.pofile(str(po_path))
+
+    for source in [po_path, str(po_path), BytesIO(SAMPLE.encode('utf-8'))]:
+        stream = PoStream(source)
+        entries = list(stream)
+
+        assert [entry_data(entry) for entry in entries] == [
+            entry_data(entry) for entry in expected
+        ]
+        assert stream.header == expected.header
+        assert stream.metadata == expected.metadata
+
+
+def test_po_stream_is_lazy():
+    lines = iter(SAMPLE.encode('utf-8').splitlines(True))
+    stream = iter(PoStream(lines))
+
+    entry = next(stream)
+    assert entry.msgid == "Order Reference"
+    # Only the first line of the next entry was read
+    assert next(lines).startswith(b'#: code:addons/sale/models/sale.py:40')
+
+
+def test_po_stream_syntax_error():
+    stream = PoStream(BytesIO(b'msgid "a"\nmsgstr b\n'))
+
+    try:
+        list(stream)
+    except IOError as exc:
+        assert 'line 2' in str(exc)
+    else:
+        assert False, "Expected a syntax error"
+
+
+def test_po_stream_writer_matches_polib():
+    pofile = polib.pofile(SAMPLE)
+
+    buffer = BytesIO()
+    writer = PoStreamWriter(buffer)
+    writer.write_header(
+        pofile.header,
+        pofile.metadata,
+        pofile.metadata_is_fuzzy
+    )
+    writer.write_entries(
+        entry for entry in pofile if not entry.obsolete
+    )
+    writer.write_entries(pofile.obsolete_entries())
+
+    assert buffer.getvalue().decode('utf-8') == str(pofile)
+
+
+def test_streaming_reader():
+    buffer = BytesIO(SAMPLE.encode('utf-8'))
+
+    reader = PoFileReader(buffer, options={"streaming": True})
+    rows = list(reader)
+
+    assert isinstance(reader.pofile, PoStream)
+    assert rows[0]['src'] == "Order Reference"
+    assert rows[0]['value'] == "R\xe9f\xe9rence"
+
+
+def test_streaming_writer_matches_writer(tmp_path):
+    rows = [
+        (
+            'sale', 'model', 'ir.model.fields,field_description',
+            'sale.field_sale_order__name', 'Order Reference', 'Ref', []
+        ),
+        (
+            'sale', 'code', 'addons/sale/models/sale.py', 12,
+            'Order Reference', 'Ref', ['odoo-python']
+        ),
+        (
+            'sale', 'code', 'addons/sale/models/sale.py', 20,
+            'Cancel', 'Annuler', ['odoo-python']
+        ),
+    ]
+
+    outputs = []
+    for streaming in [False, True]:
+        buffer = BytesIO()
+        writer = PoFileWriter(buffer, None, streaming=streaming)
+        writer.po.header = 'header'
+        writer.po.metadata = {'Language': 'fr'}
+        writer.write_rows(rows)
+        outputs.append(buffer.getvalue())
+
+    assert outputs[0] == outputs[1]
+
+    # Entries of an existing file are kept and updated
+    existing = PoStream(BytesIO(outputs[0]))
+    buffer = BytesIO()
+    writer = PoFileWriter(buffer, None, pofile=existing)
+    assert writer.streaming is True
+    writer.po.header = 'header'
+    writer.write_rows(rows[2:])
+
+    assert buffer.getvalue() == outputs[0]
+
+
+POT = '''msgid ""
+msgstr ""
+
+#. module: sale
+#: code:addons/sale/models/sale.py:14
+msgid "Order Reference"
+msgstr ""
+
+msgctxt "other"
+msgid "Order Reference"
+msgstr ""
+
+#. module: sale
+msgid "New term"
+msgstr ""
+'''
+
+
+def test_streaming_writer_context():
+    writer = PoFileWriter(BytesIO(), 'fr', streaming=True)
+
+    first = polib.POEntry(msgid="Order", msgstr="Commande")
+    second = polib.POEntry(msgid="Order", msgctxt="sort", msgstr="Ordre")
+    writer.append(first)
+    writer.append(second)
+
+    assert list(writer.iter_entries()) == [first, second]
+    assert writer.find("Order") is first
+    assert writer.find("Order", msgctxt="sort") is second
+    assert writer.find("Order", msgctxt="other") is None
+
+
+def test_streaming_writer_merge():
+    pot = polib.pofile(POT)
+
+    pofile = polib.pofile(SAMPLE)
+    pofile.merge(pot)
+
+    writer = PoFileWriter(BytesIO(), 'fr', streaming=True)
+    for entry in polib.pofile(SAMPLE):
+        writer.append(entry)
+    writer.merge(pot)
+
+    assert sorted(map(entry_data, writer.iter_entries()), key=repr) == (
+        sorted(map(entry_data, pofile), key=repr)
+    )
+
+
+def test_streaming_reader_pot(tmp_path):
+    folder = tmp_path / 'sale' / 'i18n'
+    folder.mkdir(parents=True)
+    (folder / 'sale.pot').write_text(POT, encoding='utf-8')
+    (folder / 'fr.po').write_text(SAMPLE, encoding='utf-8')
+
+    options = {"streaming": True, "read_pot": True}
+    rows = list(PoFileReader(str(folder / 'fr.po'), options=options))
+
+    options = {"read_pot": True}
+    expected = list(PoFileReader(str(folder / 'fr.po'), options=options))
+
+    assert rows == expected
+    assert rows[0]['name'] == 'addons/sale/models/sale.py'
+    assert rows[0]['res_id'] == 14
+    assert rows[0]['value'] == "R\xe9f\xe9rence"
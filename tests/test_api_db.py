@@ -1,3 +1,4 @@
+import pytest
 from unittest.mock import patch, PropertyMock, MagicMock
 from psycopg2 import OperationalError
 from odoo_tools.api.db import set_missing_keys, DbApi
@@ -70,20 +71,10 @@ def test_unmark_modules():
 
 
 def test_mark_modules():
-    def mod(name):
-        module = MagicMock()
-        module.name = name
-        return module
-
     manage = MagicMock()
     dbapi = DbApi(manage, 'dbtest')
-    dbapi.env = MagicMock()
-    mod_mock = MagicMock()
-    mod_mock.search.return_value = []
-    env_mock = {
-        'ir.module.module': mod_mock
-    }
-    dbapi.env.return_value.__enter__.return_value = env_mock
+    dbapi.installed_modules = MagicMock()
+    dbapi.installed_modules.return_value = set()
 
     dbapi.config = {
         'init': {
@@ -104,19 +95,13 @@ def test_mark_modules():
         }
     }
 
-    mod_mock.search.return_value = [
-        mod('stock')
-    ]
+    dbapi.installed_modules.return_value = {'stock'}
 
     dbapi.mark_modules({'website', 'stock'})
 
     assert dbapi.config['init'] == {'website': 1}
     assert dbapi.config['update'] == {'stock': 1}
 
-    mod_mock.search.return_value = [
-        mod('stock')
-    ]
-
     dbapi.config = {
         'init': {
         },
@@ -129,10 +114,7 @@ def test_mark_modules():
     assert dbapi.config['init'] == {}
     assert dbapi.config['update'] == {'stock': 1}
 
-    mod_mock.search.return_value = [
-        mod('stock'),
-        mod('sale'),
-    ]
+    dbapi.installed_modules.return_value = {'stock', 'sale'}
 
     dbapi.config = {
         'init': {
@@ -147,15 +129,31 @@ def test_mark_modules():
     assert dbapi.config['update'] == {'stock': 1, 'sale': 1}
 
 
+def test_installed_modules():
+    manage = MagicMock()
+    dbapi = DbApi(manage, 'dbtest')
+
+    conn = manage.db_connect.return_value
+    cr = conn.cursor.return_value
+    cr.fetchall.return_value = [('stock',)]
+
+    with patch('odoo_tools.api.db.get_tables') as get_tables:
+        get_tables.return_value = ['ir_module_module']
+
+        assert dbapi.installed_modules({'stock'}) == {'stock'}
+        manage.db_connect.assert_called_once_with('dbtest', pooled=True)
+        conn.close.assert_called_once()
+        assert cr.execute.call_args[0][1] == (('stock',),)
+
+        get_tables.return_value = []
+        with pytest.raises(KeyError):
+            dbapi.installed_modules({'stock'})
+
+
 def test_mark_modules_error():
     manage = MagicMock()
     dbapi = DbApi(manage, 'dbtest')
-    dbapi.env = MagicMock()
-    mod_mock = MagicMock()
-    env_mock = {
-        'ir.module.module': mod_mock
-    }
-    dbapi.env.return_value.__enter__.return_value = env_mock
+    dbapi.installed_modules = MagicMock()
 
     dbapi.config = {
         'init': {
@@ -164,17 +162,19 @@ def test_mark_modules_error():
         }
     }
 
-    mod_mock.search.side_effect = Exception("Something went wrong")
+    dbapi.installed_modules.side_effect = Exception("Something went wrong")
     dbapi.mark_modules({'website'})
     assert dbapi.config['init'] == {}
     assert dbapi.config['update'] == {}
 
-    mod_mock.search.side_effect = OperationalError("Something went wrong")
+    dbapi.installed_modules.side_effect = OperationalError(
+        "Something went wrong"
+    )
     dbapi.mark_modules({'website'})
     assert dbapi.config['init'] == {}
     assert dbapi.config['update'] == {}
 
-    mod_mock.search.side_effect = KeyError("Something went wrong")
+    dbapi.installed_modules.side_effect = KeyError("Something went wrong")
     dbapi.mark_modules({'website'})
     assert dbapi.config['init'] == {}
     assert dbapi.config['update'] == {}
@@ -200,3 +200,54 @@ def test_manage():
     env.odoo_version.return_value = 14
     with manage(env):
         manager.manage.assert_not_called()
+
+
+def test_export_translation_terms():
+    manage = MagicMock()
+    dbapi = DbApi(manage, 'dbtest')
+    dbapi.env = MagicMock()
+    env = dbapi.env.return_value.__enter__.return_value
+    env.cr.fetchall.return_value = [('sale',), ('stock',)]
+
+    terms = {
+        'sale': [('sale', 'b'), ('sale', 'a')],
+        'stock': [('stock', 'c')],
+    }
+    calls = []
+
+    def trans_generate(language, modules, cr):
+        calls.append(list(modules))
+        mods = terms if 'all' in modules else modules
+        return [
+            term
+            for mod in mods
+            for term in terms[mod]
+        ]
+
+    def export(*args, **kwargs):
+        return [
+            (language, module, list(rows))
+            for language, module, rows in dbapi.export_translation_terms(
+                *args, **kwargs
+            )
+        ]
+
+    expected = [
+        ('fr', 'sale', [('sale', 'a'), ('sale', 'b')]),
+        ('fr', 'stock', [('stock', 'c')]),
+    ]
+
+    with patch.object(dbapi, 'translation_generator') as generator:
+        generator.return_value = trans_generate
+
+        assert export(['fr'], ['sale', 'stock']) == expected
+        assert calls == [['sale', 'stock']]
+
+        calls.clear()
+        assert export(['fr'], ['sale', 'stock'], streaming=True) == expected
+        assert calls == [['sale'], ['stock']]
+
+        calls.clear()
+        assert export(['fr'], ['all'], streaming=True) == expected
+        assert calls == [['sale'], ['stock']]
+        env.cr.execute.assert_called_once()
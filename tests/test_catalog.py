@@ -0,0 +1,122 @@
+import time
+from mock import MagicMock, patch
+
+from odoo_tools.api.catalog import DatabaseCatalog
+from odoo_tools.db import compile_db_filter
+
+
+def make_manage(dbfilter=None):
+    manage = MagicMock()
+    manage.environment.get_config.return_value = dbfilter
+    manage.db_list.return_value = [
+        {"name": "www", "version": "15.0", "status": "ok"},
+        {"name": "shop", "version": "15.0", "status": "ok"},
+    ]
+    return manage
+
+
+def test_catalog_ttl():
+    manage = make_manage()
+    catalog = DatabaseCatalog(manage, ttl=60)
+
+    assert catalog.expired() is True
+    assert catalog.names() == ['www', 'shop']
+    assert catalog.get('shop')['name'] == 'shop'
+    assert catalog.get('nope') is None
+    assert manage.db_list.call_count == 1
+
+    with patch('time.time') as mock_time:
+        mock_time.return_value = catalog.refreshed_at + 61
+        assert catalog.expired() is True
+        catalog.names()
+
+    assert manage.db_list.call_count == 2
+
+    catalog.refresh()
+    assert manage.db_list.call_count == 3
+
+    catalog.ttl = None
+    catalog.refreshed_at = 0
+    assert catalog.expired() is False
+
+
+def test_catalog_single_refresh():
+    manage = make_manage()
+    catalog = DatabaseCatalog(manage, ttl=60)
+    catalog.refresh()
+
+    stale = catalog._databases
+    catalog.refreshed_at -= 61
+
+    # An other thread is refreshing the catalog
+    with catalog._lock:
+        assert catalog.databases() is stale
+
+    assert manage.db_list.call_count == 1
+
+    manage.db_list.return_value = [{"name": "new"}]
+    assert catalog.names() == ['new']
+    assert manage.db_list.call_count == 2
+
+
+def test_catalog_filters():
+    manage = make_manage()
+    catalog = DatabaseCatalog(manage, status=['ok'])
+    catalog.refresh()
+    manage.db_list.assert_called_once_with(status=['ok'])
+
+
+def test_catalog_db_filter():
+    manage = make_manage()
+    catalog = DatabaseCatalog(manage)
+
+    assert catalog.db_filter('www.example.com') == ['www', 'shop']
+
+    manage.environment.get_config.return_value = '^%d$'
+    catalog.refresh()
+
+    assert catalog.db_filter('shop.example.com') == ['shop']
+    assert catalog.db_filter('www.shop.com') == ['shop']
+    # www is skipped like in odoo
+    assert catalog.db_filter('www.example.com') == []
+
+    rule = compile_db_filter('^%d$', 'www.example.com')
+    assert compile_db_filter('^%d$', 'www.example.com') is rule
+
+
+def test_catalog_background_refresh():
+    manage = make_manage()
+    catalog = DatabaseCatalog(manage)
+
+    catalog.start(interval=0.01)
+    catalog.start(interval=0.01)
+
+    deadline = time.time() + 5
+    while manage.db_list.call_count < 2 and time.time() < deadline:
+        time.sleep(0.01)
+
+    catalog.stop()
+    catalog.stop()
+
+    assert manage.db_list.call_count >= 2
+    assert catalog._thread is None
+
+    count = manage.db_list.call_count
+    time.sleep(0.05)
+    assert manage.db_list.call_count == count
+
+
+def test_catalog_background_refresh_error():
+    manage = make_manage()
+    manage.db_list.side_effect = Exception("down")
+    catalog = DatabaseCatalog(manage)
+
+    catalog.start(interval=0.01)
+
+    deadline = time.time() + 5
+    while manage.db_list.call_count < 2 and time.time() < deadline:
+        time.sleep(0.01)
+
+    catalog.stop()
+
+    assert catalog.refreshed_at is None
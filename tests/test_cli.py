@@ -6,6 +6,7 @@ from odoo_tools.cli.odot import command
 from odoo_tools.api.management import ManagementApi
 from odoo_tools.api.db import DbApi
 from odoo_tools.api.environment import Environment
+from odoo_tools.utilities.requirements import merge_requirements
 # from odoo_tools.cli import fetch_addons, copy_addons
 
 
@@ -268,6 +269,79 @@ def test_requirements(runner, tmp_path):
     assert result.output == "pillow\nrequests\n"
 
 
+def test_requirements_lock_file(runner, tmp_path):
+    odoo_dir, addons_dir = generate_odoo_dir(tmp_path)
+    generate_addons(
+        addons_dir, ['e'], external_dependencies={'python': ['requests']}
+    )
+    lock_file = tmp_path / 'requirements.txt'
+
+    args = ['module', 'requirements', '--lock-file', str(lock_file)]
+    env = {'ODOO_BASE_PATH': str(odoo_dir)}
+
+    with patch(
+        'odoo_tools.api.modules.merge_requirements',
+        wraps=merge_requirements
+    ) as merge:
+        result = runner.invoke(command, args, env=env)
+        assert result.output == "requests\n"
+
+        result = runner.invoke(command, args, env=env)
+        assert result.output == "requests\n"
+
+    merge.assert_called_once()
+    assert lock_file.read_text() == "requests"
+
+
+def test_wheelhouse(runner, tmp_path):
+    odoo_dir, addons_dir = generate_odoo_dir(tmp_path)
+    generate_addons(
+        addons_dir, ['e'], external_dependencies={'python': ['requests']}
+    )
+
+    with patch('odoo_tools.cli.click.module.Wheelhouse') as wheelhouse:
+        builder = wheelhouse.return_value
+        builder.build.return_value = [
+            {"requirement": "requests", "status": "done", "duration": 1.0}
+        ]
+
+        result = runner.invoke(
+            command,
+            [
+                'module', 'wheelhouse',
+                '-o', str(tmp_path / 'wheels'),
+                '-j', '2',
+                '-f', str(tmp_path / 'index'),
+                '--no-index',
+            ],
+            env={'ODOO_BASE_PATH': str(odoo_dir)}
+        )
+
+    assert result.exit_code == 0
+    wheelhouse.assert_called_once_with(
+        str(tmp_path / 'wheels'),
+        find_links=(str(tmp_path / 'index'),),
+        index_url=None,
+        no_index=True,
+        jobs=2,
+        timeout=None
+    )
+    builder.build.assert_called_once_with({'requests'})
+    assert result.output == "done requests (1.0s)\n1 requirements, 0 failed\n"
+
+    with patch('odoo_tools.cli.click.module.Wheelhouse') as wheelhouse:
+        wheelhouse.return_value.build.return_value = [
+            {"requirement": "requests", "status": "failed", "duration": 1.0}
+        ]
+        result = runner.invoke(
+            command,
+            ['module', 'wheelhouse', '-o', str(tmp_path / 'wheels')],
+            env={'ODOO_BASE_PATH': str(odoo_dir)}
+        )
+
+    assert result.exit_code == 1
+
+
 def test_deps(runner, tmp_path):
     odoo_dir, addons_dir = generate_odoo_dir(tmp_path)
     generate_addons(addons_dir, ['a', 'b', 'c'], depends=[])
@@ -950,6 +1024,65 @@ def test_manage_update(runner, tmp_path):
         )
 
 
+def test_manage_update_all_dbs(runner, tmp_path):
+    with patch.object(ManagementApi, 'db_list') as db_list, \
+         patch('odoo_tools.api.fleet.FleetUpdate.run') as run:
+        db_list.return_value = [{'name': 'db1'}, {'name': 'db2'}]
+        run.return_value = [
+            {'name': 'db1', 'status': 'done', 'duration': 1, 'log': 'a'},
+            {'name': 'db2', 'status': 'skipped', 'duration': 2, 'log': 'b'},
+        ]
+
+        result = runner.invoke(
+            command,
+            [
+                'manage',
+                'update',
+                '--all-dbs',
+                '-m', 'sale',
+                '--jobs', '2',
+                '--filter-version', 'any',
+                '--log-dir', str(tmp_path),
+            ]
+        )
+
+        assert result.exception is None
+        db_list.assert_called_once_with(
+            db_name=None,
+            dbfilter=None,
+            hostname=None,
+            filter_missing=True,
+            filter_invalid=True,
+            filter_version=False,
+            include_extra_dbs=False,
+        )
+        run.assert_called_once_with(['db1', 'db2'])
+        assert result.output.splitlines()[-1] == "2 databases, 0 failed"
+
+        run.return_value[1]['status'] = 'timeout'
+        result = runner.invoke(
+            command,
+            [
+                'manage',
+                'update',
+                '--all-dbs',
+                '-m', 'sale',
+                '--log-dir', str(tmp_path),
+            ]
+        )
+        assert result.exit_code == 1
+        assert result.output.splitlines()[-1] == "2 databases, 1 failed"
+
+        result = runner.invoke(
+            command,
+            ['manage', 'update', '--all-dbs', 'db1']
+        )
+        assert result.exit_code == 2
+
+        result = runner.invoke(command, ['manage', 'update', '-m', 'sale'])
+        assert result.exit_code == 2
+
+
 def test_manage_uninstall(runner, tmp_path):
     with patch.object(DbApi, 'uninstall_modules') as mock_method, \
          patch.object(Environment, 'check_odoo', return_value=True), \
@@ -1031,7 +1164,8 @@ def test_db_list(runner, tmp_path):
             filter_missing=False,
             filter_invalid=False,
             filter_version=False,
-            include_extra_dbs=False
+            include_extra_dbs=False,
+            jobs=8
         )
 
         assert result.exception is None
@@ -1059,7 +1193,8 @@ def test_db_list(runner, tmp_path):
             filter_missing=False,
             filter_invalid=False,
             filter_version='15.0',
-            include_extra_dbs=False
+            include_extra_dbs=False,
+            jobs=8
         )
 
 
@@ -1085,6 +1220,7 @@ def test_db_init(runner, tmp_path):
             language='en_US',
             country=None,
             without_demo=True,
+            template_cache=False,
         )
 
         mock_method.reset_mock()
@@ -1109,10 +1245,24 @@ def test_db_init(runner, tmp_path):
             language='fr_CA',
             country='CA',
             without_demo=False,
+            template_cache=False,
         )
 
         mock_method.reset_mock()
 
+        result = runner.invoke(
+            command,
+            [
+                'db',
+                'init',
+                '--template-cache',
+                'testdb'
+            ]
+        )
+
+        assert result.exception is None
+        assert mock_method.call_args[1]['template_cache'] is True
+
 
 def test_list_users(runner):
     with patch.object(DbApi, 'init') as mock_method, \
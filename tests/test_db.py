@@ -238,7 +238,7 @@ def test_db_list():
         'example.net',
     ]
 
-    def get_db_ver(db):
+    def get_db_ver(db, connection_info=None, pooled=True):
         return {
             "name": db,
             "version": "15.0",
@@ -255,12 +255,17 @@ def test_db_list():
     lst = manage.db_list(hostname="example.com")
     assert lst == [{'name': 'example.com', 'version': '15.0', 'status': 'ok'}]
 
+    # Databases discarded by the filters aren't probed
+    manage.get_db_version.assert_called_once_with(
+        'example.com', manage.connection_info('postgres'), pooled=False
+    )
+
     lst = manage.db_list(hostname="example.com", include_extra_dbs=True)
     assert lst == [
         {'name': 'example.com', 'version': '15.0', 'status': 'ok'},
     ]
 
-    def get_db_ver_invalid(db):
+    def get_db_ver_invalid(db, connection_info=None, pooled=True):
         return {
             "name": db,
             "version": "15.0",
@@ -278,7 +283,7 @@ def test_db_list():
     assert lst == [
     ]
 
-    def get_db_ver_missing(db):
+    def get_db_ver_missing(db, connection_info=None, pooled=True):
         return {
             "name": db,
             "version": "15.0",
@@ -318,3 +323,40 @@ def test_db_list():
     assert lst == [
         {'name': 'example.com', 'status': 'missing', 'version': '15.0'}
     ]
+
+
+def test_db_list_concurrent():
+    env = Environment()
+    manage = ManagementApi(env)
+
+    dbnames = [f"db{idx}" for idx in range(20)]
+
+    manage.get_active_dbs = MagicMock()
+    manage.get_active_dbs.return_value = dbnames
+
+    with patch('psycopg2.connect') as connect, \
+         patch('odoo_tools.api.management.get_tables') as get_tables, \
+         patch('odoo_tools.api.management.fetch_db_version') as db_version:
+        get_tables.return_value = ['ir_module_module']
+        db_version.return_value = '15.0'
+
+        lst = manage.db_list(jobs=4)
+
+        assert [db['name'] for db in lst] == dbnames
+        assert connect.call_count == 20
+
+        databases = {
+            call[1]['database']
+            for call in connect.call_args_list
+        }
+        assert databases == set(dbnames)
+
+        # Probes don't keep connections opened to each database
+        assert manage.pool.idle == {}
+
+        connect.reset_mock()
+        lst = manage.db_list(db_name='db3,db5', jobs=4)
+        assert [db['name'] for db in lst] == ['db3', 'db5']
+        assert connect.call_count == 2
+
+    assert manage.probe_dbs([]) == []
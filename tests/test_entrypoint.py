@@ -1,3 +1,4 @@
+import os
 from mock import MagicMock, patch
 from odoo_tools.entrypoints import execute_entrypoint, entrypoint, custom_entrypoints
 
@@ -33,7 +34,7 @@ def test_entrypoint_pkg():
 
         return [mock_entrypoint]
 
-    with patch('pkg_resources.iter_entry_points') as mock_pkg:
+    with patch('odoo_tools.entrypoints.iter_entry_points') as mock_pkg:
         mock_pkg.return_value = mocked_iter_entrypoints()
 
         ctx = MagicMock()
@@ -41,3 +42,64 @@ def test_entrypoint_pkg():
         execute_entrypoint("test2", ctx)
 
         assert ctx.called == 1
+
+
+def test_iter_entry_points_cache():
+    from odoo_tools import entrypoints
+
+    entrypoints.clear_entry_points_cache()
+
+    commands = entrypoints.iter_entry_points('odootools.command')
+    assert 'module' in [ep.name for ep in commands]
+    assert entrypoints.iter_entry_points('unknown.group') == []
+
+    with patch.object(entrypoints, 'scan_entry_points') as scan:
+        entrypoints.iter_entry_points('odootools.command')
+        assert scan.call_count == 0
+
+        entrypoints.clear_entry_points_cache()
+        scan.return_value = {'test': [('ep', 'os.path:join')]}
+        eps = entrypoints.iter_entry_points('test')
+        assert scan.call_count == 1
+
+    assert eps[0].name == 'ep'
+    assert eps[0].load() is os.path.join
+
+    entrypoints.clear_entry_points_cache()
+
+
+def test_entry_points_index(tmp_path, monkeypatch):
+    from odoo_tools import entrypoints
+
+    cache_path = tmp_path / 'cache' / 'entry_points.json'
+    site = tmp_path / 'site'
+    site.mkdir()
+
+    monkeypatch.setenv(entrypoints.CACHE_ENV, str(cache_path))
+    fingerprint = entrypoints.path_fingerprint([str(site)])
+    monkeypatch.setattr(
+        entrypoints, 'path_fingerprint', lambda: list(fingerprint)
+    )
+
+    entrypoints.clear_entry_points_cache()
+
+    with patch.object(entrypoints, 'scan_entry_points') as scan:
+        scan.return_value = {'test': [('ep', 'os.path:join')]}
+
+        assert len(entrypoints.iter_entry_points('test')) == 1
+        assert scan.call_count == 1
+        assert cache_path.exists()
+
+        # A new process reads the persisted index
+        entrypoints.clear_entry_points_cache()
+        assert len(entrypoints.iter_entry_points('test')) == 1
+        assert scan.call_count == 1
+
+        # Installing a distribution changes the mtime of site-packages
+        fingerprint[0][1] += 1
+        entrypoints.clear_entry_points_cache()
+        scan.return_value = {}
+        assert entrypoints.iter_entry_points('test') == []
+        assert scan.call_count == 2
+
+    entrypoints.clear_entry_points_cache()
@@ -1,3 +1,5 @@
+import os
+import errno
 import sys
 import toml
 from types import ModuleType
@@ -6,7 +8,8 @@ from odoo_tools.odoo import Environment
 from odoo_tools.compat import Path
 from odoo_tools.exceptions import OdooNotInstalled
 from odoo_tools.api.objects import Manifest
-from unittest.mock import MagicMock
+from odoo_tools.utils import ConfigParser
+from unittest.mock import MagicMock, patch
 
 from tests.utils import (
     generate_addons,
@@ -72,6 +75,138 @@ def test_env_config(tmp_path):
     assert env.get_config('addons_path') == '1'
 
 
+def test_env_config_cache(tmp_path):
+    config_path = tmp_path / 'odoo.cfg'
+    config_path.write_text("[options]\ndb_name = a\n")
+
+    env = Environment()
+    env.context.odoo_rc = config_path
+
+    with patch.object(
+        ConfigParser, 'read', autospec=True, side_effect=ConfigParser.read
+    ) as read:
+        assert env.get_config('db_name') == 'a'
+        assert env.get_config('db_name') == 'a'
+        with env.config(readonly=True):
+            pass
+        assert read.call_count == 1
+
+        # The file is read again when it's modified
+        mtime = config_path.stat().st_mtime
+        config_path.write_text("[options]\ndb_name = b\n")
+        os.utime(str(config_path), (mtime + 1, mtime + 1))
+
+        # Once the validation interval is over
+        assert env.get_config('db_name') == 'a'
+        env.revalidate_config()
+
+        assert env.get_config('db_name') == 'b'
+        assert read.call_count == 2
+
+
+def test_env_config_validate_interval(tmp_path):
+    config_path = tmp_path / 'odoo.cfg'
+    config_path.write_text("[options]\ndb_name = a\n")
+
+    env = Environment()
+    env.context.odoo_rc = config_path
+    os_stat = os.stat
+
+    with patch.object(env, 'odoo_version', return_value=None) as version, \
+            patch('odoo_tools.api.environment.os.stat') as stat, \
+            patch('odoo_tools.api.environment.time.monotonic') as monotonic:
+        stat.side_effect = os_stat
+        monotonic.return_value = 100.0
+
+        for _index in range(5):
+            assert env.get_config('db_name') == 'a'
+
+        assert version.call_count == 1
+        assert stat.call_count == 1
+
+        monotonic.return_value = 102.0
+        assert env.get_config('db_name') == 'a'
+        assert version.call_count == 2
+        assert stat.call_count == 2
+
+        # Another config file is checked right away
+        other_path = tmp_path / 'other.cfg'
+        other_path.write_text("[options]\ndb_name = b\n")
+        env.context.odoo_rc = other_path
+        assert env.get_config('db_name') == 'b'
+
+
+def test_env_config_write(tmp_path):
+    target = tmp_path / 'odoo.cfg'
+    target.write_text("[options]\ndb_name = a\n")
+    target.chmod(0o600)
+
+    config_path = tmp_path / 'link.cfg'
+    config_path.symlink_to(target)
+
+    env = Environment()
+    env.context.odoo_rc = config_path
+
+    inode = target.stat().st_ino
+
+    # Unmodified configs aren't written
+    with env.config():
+        pass
+    env.set_config('db_name', 'a')
+    assert target.stat().st_ino == inode
+
+    env.set_config('db_name', 'b')
+
+    assert config_path.is_symlink()
+    assert target.stat().st_ino != inode
+    assert target.stat().st_mode & 0o777 == 0o600
+    assert target.read_text() == "[options]\ndb_name = b\n\n"
+    assert list(tmp_path.glob('.*.tmp')) == []
+
+    # The config written isn't read again
+    with patch.object(ConfigParser, 'read') as read:
+        assert env.get_config('db_name') == 'b'
+        assert read.call_count == 0
+
+
+def test_env_config_write_in_place(tmp_path):
+    config_path = tmp_path / 'odoo.cfg'
+    config_path.write_text("[options]\ndb_name = a\n")
+
+    env = Environment()
+    env.context.odoo_rc = config_path
+
+    inode = config_path.stat().st_ino
+
+    # Bind mounted files can't be replaced
+    busy = OSError(errno.EBUSY, "Device or resource busy")
+
+    with patch('odoo_tools.api.environment.os.replace', side_effect=busy):
+        env.set_config('db_name', 'b')
+
+    assert config_path.stat().st_ino == inode
+    assert config_path.read_text() == "[options]\ndb_name = b\n\n"
+    assert list(tmp_path.glob('.*.tmp')) == []
+
+
+def test_env_params_cache():
+    env = Environment()
+    env.context.odoo_version = '15'
+
+    with patch(
+        'odoo_tools.api.environment.get_env_params',
+        return_value={'ODOO_WORKERS': ('workers', 0)}
+    ) as get_env_params:
+        with env.config(readonly=True) as config:
+            assert config.get('options', 'workers') == 0
+
+        with env.config(readonly=True):
+            pass
+
+        assert env.env_options() == {}
+        assert get_env_params.call_count == 1
+
+
 def test_env_config_addons_path(tmp_path):
     env = Environment()
 
@@ -175,6 +310,83 @@ def test_addons_paths(tmp_path):
         mod.package()
 
 
+def test_addons_paths_cache(tmp_path):
+    odoo_dir, addons_dir = generate_odoo_dir(tmp_path)
+    generate_addons(addons_dir, ['a', 'b'])
+
+    env = Environment()
+    env.context.odoo_base_path = str(odoo_dir)
+
+    assert env.addons_paths() == {addons_dir}
+    assert env.addons_paths_version == 1
+    assert set(env.addons_paths_timings) == {
+        'validate', 'config', 'entrypoints', 'modules', 'filter'
+    }
+
+    # The cached result is a copy
+    env.addons_paths().add(tmp_path)
+    assert env.addons_paths() == {addons_dir}
+    assert env.addons_paths_version == 1
+    assert set(env.addons_paths_timings) == {'validate'}
+    assert len(env.modules.list()) == 2
+
+    # Adding a module changes the mtime of the addons path, it's moved
+    # forward for filesystems with a coarse timestamp resolution
+    mtime = addons_dir.stat().st_mtime
+    generate_addons(addons_dir, ['c'])
+    os.utime(str(addons_dir), (mtime + 1, mtime + 1))
+    assert env.addons_paths() == {addons_dir}
+    assert env.addons_paths_version == 2
+    assert len(env.modules.list()) == 3
+
+    custom_dir = tmp_path / "custom"
+    custom_dir.mkdir()
+    generate_addons(custom_dir, ['d'])
+
+    env.context.custom_paths.add(custom_dir)
+    assert env.addons_paths() == {addons_dir, custom_dir}
+    assert env.addons_paths_version == 3
+
+    env.context.excluded_paths.add(custom_dir)
+    assert env.addons_paths() == [addons_dir]
+    assert env.addons_paths_version == 4
+    assert len(env.modules.list()) == 3
+
+    env.addons_paths(reload=True)
+    assert env.addons_paths_version == 5
+
+
+def test_modules_get_validation(tmp_path):
+    odoo_dir, addons_dir = generate_odoo_dir(tmp_path)
+    generate_addons(addons_dir, ['a', 'b'])
+
+    env = Environment()
+    env.context.odoo_base_path = str(odoo_dir)
+
+    with patch.object(
+        env, 'addons_paths', wraps=env.addons_paths
+    ) as addons_paths, patch('odoo_tools.api.modules.time') as mock_time:
+        mock_time.monotonic.return_value = 100.0
+
+        # The addons paths are checked once per validate_interval
+        for _i in range(10):
+            assert env.modules.get('a').technical_name == 'a'
+        assert addons_paths.call_count == 1
+
+        mtime = addons_dir.stat().st_mtime
+        generate_addons(addons_dir, ['c'])
+        os.utime(str(addons_dir), (mtime + 1, mtime + 1))
+
+        mock_time.monotonic.return_value = 102.0
+        assert env.modules.get('c').technical_name == 'c'
+        assert addons_paths.call_count == 2
+
+        # Commands sharing the environment check them again
+        env.modules.revalidate()
+        env.modules.get('c')
+        assert addons_paths.call_count == 3
+
+
 def test_env_options(tmp_path):
     env = Environment()
 
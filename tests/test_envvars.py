@@ -1,9 +1,17 @@
 import os
+import copy
+import pytest
 from pathlib import Path
 from mock import patch
 from odoo_tools.api.context import Context
+from odoo_tools.api.environment import Environment
 from odoo_tools.configuration.misc import cd
-from odoo_tools.env import EnvironmentVariables, EnvironmentVariable, StoredEnv
+from odoo_tools.env import (
+    EnvironmentSnapshot,
+    EnvironmentVariables,
+    EnvironmentVariable,
+    StoredEnv,
+)
 
 
 def test_empty_context():
@@ -123,3 +131,102 @@ def test_env_properties():
         assert obj.val5 == ''
         assert os.environ['val5'] == ''
         assert obj._values['val5'] == ''
+
+
+def test_environment_snapshot(tmp_path):
+    vals = {
+        'ODOO_RC': str(tmp_path / 'odoo.cfg'),
+        'ODOO_DISABLED_MODULES': 'a,b',
+        'EXTRA_APT_PACKAGES': 'git',
+        'SKIP_PIP': 'true',
+    }
+
+    with patch.dict(os.environ, vals, clear=True):
+        envvars = EnvironmentVariables.snapshot()
+
+        assert envvars.ODOO_RC == str(tmp_path / 'odoo.cfg')
+        assert envvars.ODOO_DISABLED_MODULES == frozenset({'a', 'b'})
+        assert envvars.ODOO_EXTRA_APT_PACKAGES == frozenset({'git'})
+        assert envvars.SKIP_PIP is True
+        assert envvars.ODOO_STRICT_MODE is True
+        assert envvars.ODOO_BASE_PATH is None
+        assert set(envvars.values()) == set(EnvironmentVariables.fields())
+        assert envvars.environ['SKIP_PIP'] == 'true'
+
+        with pytest.raises(AttributeError):
+            envvars.ODOO_RC = '/tmp'
+
+        with pytest.raises(TypeError):
+            envvars.environ['SKIP_PIP'] = 'false'
+
+        with pytest.raises(AttributeError):
+            envvars.UNKNOWN
+
+        # The snapshot doesn't follow the environment
+        os.environ['SKIP_PIP'] = 'false'
+        assert envvars.SKIP_PIP is True
+        assert envvars.refresh().SKIP_PIP is False
+
+        context = Context.from_env(envvars)
+        assert context.odoo_rc == tmp_path / 'odoo.cfg'
+        assert context.disabled_modules == {'a', 'b'}
+        context.extra_apt_packages.add('curl')
+
+    snapshot = EnvironmentVariables.snapshot({'ODOO_VERSION': '15'})
+    assert snapshot.ODOO_VERSION == '15'
+
+
+def test_environment_snapshot_options():
+    params = {'ODOO_WORKERS': ('workers', 0)}
+    vals = {'ODOO_WORKERS': '2', 'ODOO_VERSION': '15'}
+
+    with patch('odoo_tools.api.environment.get_env_params') as env_params, \
+            patch.dict(os.environ, vals):
+        env_params.return_value = params
+        env = Environment(envvars=EnvironmentVariables.snapshot())
+
+        assert env.env_options() == {'workers': '2'}
+
+        env.env_options()['workers'] = '4'
+        assert env.env_options() == {'workers': '2'}
+
+        os.environ['ODOO_WORKERS'] = '3'
+        assert env.env_options() == {'workers': '2'}
+
+        env.refresh_envvars()
+        assert env.env_options() == {'workers': '3'}
+
+        assert env_params.call_count == 1
+
+
+def test_environment_snapshot_copy():
+    snapshot = EnvironmentVariables.snapshot({'ODOO_VERSION': '15'})
+
+    assert copy.copy(snapshot) is snapshot
+    assert copy.deepcopy(snapshot) is snapshot
+    assert copy.deepcopy({'envvars': snapshot})['envvars'] is snapshot
+
+    # Instances created without __init__ don't recurse
+    empty = object.__new__(EnvironmentSnapshot)
+    with pytest.raises(AttributeError):
+        empty.ODOO_VERSION
+
+
+def test_environment_refresh_context(tmp_path):
+    vals = {'ODOO_EXTRA_PATHS': str(tmp_path / 'a')}
+
+    with patch.dict(os.environ, vals):
+        env = Environment(envvars=EnvironmentVariables.snapshot())
+        env.context.odoo_rc = tmp_path / 'odoo.cfg'
+
+        os.environ['ODOO_EXTRA_PATHS'] = str(tmp_path / 'b')
+
+        # The context keeps the values it was built with
+        env.refresh_envvars()
+        assert env.envvars.ODOO_EXTRA_PATHS == {tmp_path / 'b'}
+        assert env.context.custom_paths == {tmp_path / 'a'}
+        assert env.context.odoo_rc == tmp_path / 'odoo.cfg'
+
+        env.refresh_envvars(context=True)
+        assert env.context.custom_paths == {tmp_path / 'b'}
+        assert env.context.odoo_rc != tmp_path / 'odoo.cfg'
@@ -0,0 +1,173 @@
+import polib
+from mock import MagicMock
+
+from odoo_tools.api.objects import Manifest
+from odoo_tools.api.modules import ModuleApi
+from odoo_tools.modules.extract import (
+    extract_terms,
+    export_pot_files,
+)
+
+
+MODELS = '''
+from odoo import _, api, fields, models
+
+
+class SaleOrder(models.Model):
+    _name = 'sale.order'
+    _description = 'Sales Order'
+
+    name = fields.Char('Order Reference', help="Unique reference")
+    partner_id = fields.Many2one('res.partner', string="Customer")
+    user_id = fields.Many2one('res.users')
+    state = fields.Selection([
+        ('draft', 'Quotation'),
+        ('sale', 'Sales Order'),
+    ])
+    amount = fields.Float(related='line_id.amount')
+
+    def action_confirm(self):
+        raise UserError(_("Cannot confirm"))
+
+
+class Partner(models.Model):
+    _inherit = ['res.partner']
+
+    sale_count = fields.Integer(string="Sales")
+'''
+
+VIEWS = '''<?xml version="1.0"?>
+<odoo>
+    <record id="view_order_form" model="ir.ui.view">
+        <field name="model">sale.order</field>
+        <field name="arch" type="xml">
+            <form string="Sales Order">
+                <div class="title">  Order
+                  details </div>
+                <field name="name" placeholder="Reference"/>
+                <span t-translation="off">Skipped</span>
+                <span>42</span>
+            </form>
+        </field>
+    </record>
+    <record id="action_orders" model="ir.actions.act_window">
+        <field name="name">Quotations</field>
+    </record>
+    <menuitem id="menu_sale" name="Sales"/>
+    <template id="portal_order">
+        <h1>My Orders</h1>
+    </template>
+</odoo>
+'''
+
+JS = '''odoo.define('sale.widget', function (require) {
+    var _t = core._t;
+    var title = _t("Confirm order");
+    var other = _t('It\\'s done', {});
+});
+'''
+
+QWEB = '''<?xml version="1.0"?>
+<templates>
+    <t t-name="sale.Widget">
+        <button title="Send">Send by email</button>
+    </t>
+</templates>
+'''
+
+
+def make_module(path, name='sale'):
+    module = path / name
+    (module / 'models').mkdir(parents=True)
+    (module / 'views').mkdir()
+    (module / 'static' / 'src' / 'js').mkdir(parents=True)
+    (module / 'static' / 'src' / 'xml').mkdir(parents=True)
+
+    (module / '__manifest__.py').write_text(
+        "{'name': 'Sale', 'data': ['views/views.xml']}"
+    )
+    (module / 'models' / 'sale.py').write_text(MODELS)
+    (module / 'views' / 'views.xml').write_text(VIEWS)
+    (module / 'static' / 'src' / 'js' / 'widget.js').write_text(JS)
+    (module / 'static' / 'src' / 'xml' / 'widget.xml').write_text(QWEB)
+
+    return Manifest.from_path(module)
+
+
+def test_extract_terms(tmp_path):
+    manifest = make_module(tmp_path)
+
+    rows = extract_terms(manifest)
+
+    terms = {
+        (row[1], row[2], row[3], row[4])
+        for row in rows
+    }
+    fields = 'ir.model.fields,field_description'
+
+    assert ('model', 'ir.model,name', 'sale.model_sale_order',
+            'Sales Order') in terms
+    assert ('model', fields, 'sale.field_sale_order__name',
+            'Order Reference') in terms
+    assert ('model', 'ir.model.fields,help', 'sale.field_sale_order__name',
+            'Unique reference') in terms
+    assert ('model', fields, 'sale.field_sale_order__partner_id',
+            'Customer') in terms
+    assert ('model', fields, 'sale.field_sale_order__user_id',
+            'User') in terms
+    assert ('model', 'ir.model.fields.selection,name',
+            'sale.selection__sale_order__state__draft',
+            'Quotation') in terms
+    assert ('model', fields, 'sale.field_res_partner__sale_count',
+            'Sales') in terms
+    assert ('code', 'addons/sale/models/sale.py', 19,
+            'Cannot confirm') in terms
+
+    sources = {row[4] for row in rows}
+    assert 'Amount' not in sources
+
+    view = 'ir.ui.view,arch_db'
+    assert ('model', view, 'sale.view_order_form', 'Sales Order') in terms
+    assert ('model', view, 'sale.view_order_form', 'Order details') in terms
+    assert ('model', view, 'sale.view_order_form', 'Reference') in terms
+    assert 'Skipped' not in sources
+    assert '42' not in sources
+    assert ('model', 'ir.actions.act_window,name', 'sale.action_orders',
+            'Quotations') in terms
+    assert ('model', 'ir.ui.menu,name', 'sale.menu_sale', 'Sales') in terms
+    assert ('model', view, 'sale.portal_order', 'My Orders') in terms
+
+    js = 'addons/sale/static/src/js/widget.js'
+    assert ('code', js, 3, 'Confirm order') in terms
+    assert ('code', js, 4, "It's done") in terms
+
+    qweb = 'addons/sale/static/src/xml/widget.xml'
+    assert ('code', qweb, 4, 'Send') in terms
+    assert ('code', qweb, 4, 'Send by email') in terms
+
+
+def test_export_pot_files(tmp_path):
+    manifests = [
+        make_module(tmp_path, 'sale'),
+        make_module(tmp_path, 'sale2'),
+    ]
+
+    paths = export_pot_files(manifests, jobs=2)
+
+    assert paths == [
+        tmp_path / 'sale' / 'i18n' / 'sale.pot',
+        tmp_path / 'sale2' / 'i18n' / 'sale2.pot',
+    ]
+
+    pot = polib.pofile(str(paths[0]))
+    entry = pot.find('Sales Order')
+    assert entry.msgstr == ''
+    assert 'module: sale' in entry.comment
+    assert pot.find('Cannot confirm') is not None
+
+    api = ModuleApi(MagicMock())
+    api.get = {'sale': manifests[0]}.get
+    paths[0].unlink()
+
+    assert api.extract_translations(['sale'], jobs=1) == paths[:1]
+    assert paths[0].exists()
@@ -0,0 +1,114 @@
+import os
+import sys
+import json
+from mock import MagicMock, patch
+
+from odoo_tools.api.fleet import FleetUpdate
+from odoo_tools.env import SOCKET_ENV
+
+
+SCRIPTS = {
+    'ok': "print('updated')",
+    'bad': "import sys; print('boom'); sys.exit(3)",
+    'slow': "import time; time.sleep(10)",
+    'environ': (
+        "import os; print(os.environ.get({!r}, 'unset'))".format(SOCKET_ENV)
+    ),
+}
+
+
+def fake_command(dbname):
+    return [sys.executable, '-c', SCRIPTS[dbname]]
+
+
+def test_fleet_command(tmp_path):
+    env = MagicMock()
+    config = tmp_path / 'odoo.cfg'
+    config.write_text('[options]\n')
+    env.context.odoo_rc = config
+
+    fleet = FleetUpdate(env, {'sale', 'base'}, tmp_path)
+
+    assert fleet.command('db1') == [
+        sys.executable, '-m', 'odoo_tools.cli',
+        '-c', str(config),
+        'manage', 'update', '-m', 'base,sale', 'db1'
+    ]
+
+    env.context.odoo_rc = tmp_path / 'missing.cfg'
+    assert '-c' not in fleet.command('db1')
+
+
+def test_fleet_run(tmp_path):
+    env = MagicMock()
+    log_dir = tmp_path / 'logs'
+
+    fleet = FleetUpdate(env, ['sale'], log_dir, jobs=3, timeout=2)
+
+    with patch.object(fleet, 'command', side_effect=fake_command):
+        results = fleet.run(['ok', 'bad', 'slow'])
+
+    assert [res['name'] for res in results] == ['ok', 'bad', 'slow']
+    assert [res['status'] for res in results] == ['done', 'failed', 'timeout']
+    assert results[0]['returncode'] == 0
+    assert results[1]['returncode'] == 3
+    assert results[2]['returncode'] is None
+
+    assert (log_dir / 'ok.log').read_text().strip() == 'updated'
+    assert (log_dir / 'bad.log').read_text().strip() == 'boom'
+
+    state = json.loads((log_dir / 'state.json').read_text())
+    assert state['modules'] == ['sale']
+    assert state['databases']['bad']['status'] == 'failed'
+
+
+def test_fleet_resume(tmp_path):
+    env = MagicMock()
+
+    fleet = FleetUpdate(env, ['sale'], tmp_path)
+    with patch.object(fleet, 'command', side_effect=fake_command):
+        fleet.run(['ok', 'bad'])
+
+    fleet = FleetUpdate(env, ['sale'], tmp_path, resume=True)
+    with patch.object(fleet, 'update_database') as update:
+        update.side_effect = lambda name: {'name': name, 'status': 'done'}
+        results = fleet.run(['ok', 'bad'])
+
+    update.assert_called_once_with('bad')
+    assert results[0]['status'] == 'skipped'
+    assert results[1]['status'] == 'done'
+
+    # Other modules don't reuse the state
+    fleet = FleetUpdate(env, ['stock'], tmp_path, resume=True)
+    with patch.object(fleet, 'update_database') as update:
+        update.side_effect = lambda name: {'name': name, 'status': 'done'}
+        fleet.run(['ok', 'bad'])
+
+    assert update.call_count == 2
+
+    # Without resume everything is updated again
+    fleet = FleetUpdate(env, ['sale'], tmp_path)
+    with patch.object(fleet, 'update_database') as update:
+        update.side_effect = lambda name: {'name': name, 'status': 'done'}
+        fleet.run(['ok', 'bad'])
+
+    assert update.call_count == 2
+
+
+def test_fleet_daemon_socket(tmp_path):
+    env = MagicMock()
+    log_dir = tmp_path / 'logs'
+
+    fleet = FleetUpdate(env, ['sale'], log_dir, timeout=10)
+
+    socket_path = str(tmp_path / 'odootools.sock')
+
+    with patch.object(fleet, 'command', side_effect=fake_command), \
+            patch.dict(os.environ, {SOCKET_ENV: socket_path}):
+        results = fleet.run(['environ'])
+
+        # Workers run in their own process instead of the daemon
+        assert SOCKET_ENV not in fleet.worker_environ()
+
+    assert results[0]['status'] == 'done'
+    assert (log_dir / 'environ.log').read_text().strip() == 'unset'
@@ -195,3 +195,43 @@ def test_manifest_operators(tmp_path):
 def test_try_eval_manifest():
     data = try_compile_manifest('{"name": "test"}')
     assert data == {"name": "test"}
+
+
+def test_write_translations_incremental(tmp_path):
+    modules = {
+        'odoo': mock.MagicMock(),
+        'odoo.release': mock.MagicMock(description='Odoo', version='15.0'),
+    }
+
+    manifest = Manifest(tmp_path / 'sale')
+
+    rows = [
+        ('sale', 'code', 'addons/sale/a.py', 10, 'Sale', 'Vente', ['x']),
+        ('sale', 'code', 'addons/sale/b.py', 20, 'Sale', 'Vente', ['y']),
+        ('sale', 'model', 'ir.ui.menu,name', 'sale.menu', 'Order', '', []),
+    ]
+
+    with mock.patch.dict('sys.modules', modules):
+        writer = manifest.write_translations('fr', rows)
+        po_path = tmp_path / 'sale' / 'i18n' / 'fr.po'
+
+        assert writer.changed is True
+        content = po_path.read_bytes()
+        mtime = po_path.stat().st_mtime_ns
+
+        writer = manifest.write_translations('fr', rows)
+        assert writer.changed is False
+        assert po_path.read_bytes() == content
+        assert po_path.stat().st_mtime_ns == mtime
+
+        # Only the new rows are merged, existing entries are kept
+        writer = manifest.write_translations('fr', rows[2:])
+        assert writer.changed is False
+
+        writer = manifest.write_translations('fr', [
+            ('sale', 'code', 'addons/sale/c.py', 5, 'Quote', 'Devis', []),
+        ])
+        assert writer.changed is True
+        assert b'msgstr "Devis"' in po_path.read_bytes()
+        assert b'msgstr "Vente"' in po_path.read_bytes()
+        assert not list(po_path.parent.glob('*.tmp'))
@@ -13,7 +13,7 @@ def test_find_paths_entrypoint(tmp_path):
 
         return [mock_entrypoint]
 
-    with patch('pkg_resources.iter_entry_points') as mock_pkg:
+    with patch('odoo_tools.modules.search.iter_entry_points') as mock_pkg:
         mock_pkg.return_value = mocked_iter_entrypoints()
 
         options = MagicMock()
@@ -1,8 +1,10 @@
 import os
+import pickle
 from mock import patch
 from odoo_tools.modules.search import Manifest
 from odoo_tools.odoo import Environment
 from odoo_tools.api.context import Context
+from odoo_tools.utilities.requirements import RequirementsLock
 
 
 def test_requirements(tmp_path):
@@ -46,6 +48,32 @@ def test_requirements(tmp_path):
     assert requirements_files4 == {requirement_file, requirement_file2}
 
 
+def test_requirements_lookup_lock(tmp_path):
+    addons = tmp_path / 'addons'
+    mod1 = Manifest(addons / 'mod1')
+    mod1.set_attribute(['external_dependencies', 'python'], ['gitpython'])
+    mod1.save()
+
+    (addons / 'mod1' / 'requirements.txt').write_text("gitlab")
+
+    env = Environment()
+    env.context.custom_paths.add(addons)
+
+    digest = env.modules.requirements_hash()
+    assert digest != env.modules.requirements_hash(lookup_requirements=True)
+
+    lock = RequirementsLock(tmp_path / 'requirements.txt')
+
+    requirements = env.modules.requirements(
+        lookup_requirements=True,
+        lock=lock
+    )
+    assert requirements == {'gitpython', 'gitlab'}
+
+    # The lock of the lookup isn't used without it
+    assert env.modules.requirements(lock=lock) == {'gitpython'}
+
+
 def test_requirements_no_modules(tmp_path):
     addons = tmp_path / 'addons'
     mod1 = Manifest(addons / 'mod1')
@@ -79,3 +107,97 @@ def test_disabled_modules(tmp_path):
         context = Context.from_env()
         env = Environment(context)
         assert list(env.modules.disabled_modules()) == []
+
+
+class InlineExecutor(object):
+    """
+    Executor running the tasks in the current process after checking
+    they can be sent to a spawned process.
+    """
+    def __init__(self, max_workers, mp_context):
+        assert mp_context.get_start_method() == 'spawn'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def map(self, func, iterable):
+        func = pickle.loads(pickle.dumps(func))
+        return [func(value) for value in iterable]
+
+
+def test_export_translations(tmp_path):
+    from mock import MagicMock
+    from odoo_tools.api.modules import ModuleApi
+
+    modules = {
+        'odoo': MagicMock(),
+        'odoo.release': MagicMock(description='Odoo', version='15.0'),
+    }
+
+    def row(module, src, value):
+        return (module, 'code', 'addons/x.py', 0, src, value, [])
+
+    def export_translation_terms(languages, mods):
+        assert mods == ['sale', 'stock']
+        for language in languages:
+            yield language, 'sale', [row('sale', 'Sale', language + 'Sale')]
+            yield language, 'stock', [row('stock', 'Stock', language)]
+            yield language, 'other', [row('other', 'Other', language)]
+
+    db = MagicMock()
+    db.export_translation_terms.side_effect = export_translation_terms
+
+    api = ModuleApi(MagicMock())
+    manifests = {
+        name: Manifest(tmp_path / name)
+        for name in ['sale', 'stock']
+    }
+    api.get = manifests.get
+
+    with patch.dict('sys.modules', modules):
+        paths = api.export_translations(db, ['sale', 'stock'], ['fr', 'de'])
+
+        assert db.export_translation_terms.call_count == 1
+        assert sorted(paths) == sorted([
+            tmp_path / 'sale' / 'i18n' / 'fr.po',
+            tmp_path / 'stock' / 'i18n' / 'fr.po',
+            tmp_path / 'sale' / 'i18n' / 'de.po',
+            tmp_path / 'stock' / 'i18n' / 'de.po',
+        ])
+        assert 'msgstr "frSale"' in paths[0].read_text()
+        assert not (tmp_path / 'other').exists()
+
+        for path in paths:
+            path.unlink()
+
+        # Workers get a new environment from picklable arguments
+        child = MagicMock()
+        child.modules = ModuleApi(child)
+        child.modules.get = manifests.get
+        child.manage.db.return_value = db
+
+        api.environment.context = Context()
+        db.database = 'test'
+
+        with patch(
+            'odoo_tools.api.modules.ProcessPoolExecutor', InlineExecutor
+        ), patch(
+            'odoo_tools.api.environment.Environment', return_value=child
+        ) as environment:
+            paths2 = api.export_translations(
+                db, ['sale', 'stock'], ['fr', 'de'], jobs=2
+            )
+
+        assert environment.call_count == 2
+        assert isinstance(environment.call_args[0][0], Context)
+        child.manage.db.assert_called_with('test')
+
+    assert sorted(paths2) == sorted(paths)
+    for path in paths2:
+        assert path.exists()
+    assert 'msgstr "deSale"' in (
+        tmp_path / 'sale' / 'i18n' / 'de.po'
+    ).read_text()
@@ -380,6 +380,68 @@ def test_install_python_dependencies(env, tmp_path):
         pipe.assert_called_once()
 
 
+def test_install_python_dependencies_lock(env, tmp_path):
+    env.context.requirement_file_path = tmp_path / 'requirements.txt'
+    env.context.custom_paths.add(tmp_path)
+
+    addons_path = tmp_path / 'addons'
+    addons_path.mkdir()
+
+    generate_addons(
+        addons_path,
+        ['mod1'],
+        external_dependencies={"python": ['requests']}
+    )
+
+    with patch('odoo_tools.docker.user_entrypoint.pipe') as pipe:
+        pipe.return_value = 0
+        install_python_dependencies(env)
+        install_python_dependencies(env)
+        pipe.assert_called_once()
+
+        assert env.context.requirement_file_path.read_text() == "requests"
+
+        generate_addons(
+            addons_path,
+            ['mod2'],
+            external_dependencies={"python": ['lxml']}
+        )
+
+        # A new environment like a container restart
+        env = Environment(env.context)
+        install_python_dependencies(env)
+        assert pipe.call_count == 2
+
+        pipe.return_value = 1
+        generate_addons(
+            addons_path,
+            ['mod3'],
+            external_dependencies={"python": ['toml']}
+        )
+        env = Environment(env.context)
+
+        with pytest.raises(Exception):
+            install_python_dependencies(env)
+
+        # Failed installations are retried
+        with pytest.raises(Exception):
+            install_python_dependencies(env)
+
+        assert pipe.call_count == 4
+
+
+def test_install_python_dependencies_wheelhouse(env, tmp_path):
+    env.context.wheelhouse_path = tmp_path / 'wheels'
+
+    with patch('odoo_tools.docker.user_entrypoint.pipe') as pipe:
+        pipe.return_value = 0
+        install_python_dependencies(env)
+
+    args = pipe.call_args[0][0]
+    wheels = str(tmp_path / 'wheels')
+    assert args[-5:-2] == ['--no-index', '--find-links', wheels]
+
+
 def test_install_python_dependencies_exceptions(env, tmp_path):
     env.context.requirement_file_path = tmp_path / 'requirements.txt'
 
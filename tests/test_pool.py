@@ -0,0 +1,230 @@
+from mock import MagicMock, patch
+from contextlib import closing
+
+from odoo_tools.api.environment import Environment
+from odoo_tools.api.pool import ConnectionPool, PooledConnection
+
+
+def make_connection():
+    connection = MagicMock()
+    connection.closed = 0
+    return connection
+
+
+def test_pool_reuse():
+    pool = ConnectionPool()
+
+    with patch('psycopg2.connect') as connect:
+        connect.side_effect = lambda **kw: make_connection()
+
+        conn = pool.acquire({'database': 'a', 'user': 'odoo'})
+        assert isinstance(conn, PooledConnection)
+        raw = conn._connection
+        conn.close()
+        conn.close()
+        raw.rollback.assert_called_once()
+        raw.close.assert_not_called()
+
+        # Same parameters in another order reuse the connection
+        with closing(pool.acquire({'user': 'odoo', 'database': 'a'})) as conn:
+            assert conn._connection is raw
+            conn.cursor()
+            raw.cursor.assert_called_once()
+
+        # Other database needs a new connection
+        other = pool.acquire({'database': 'b', 'user': 'odoo'})
+        assert other._connection is not raw
+        other.close()
+
+        assert connect.call_count == 2
+
+    pool.close_all()
+    raw.close.assert_called_once()
+    assert pool.idle == {}
+
+
+def test_pool_max_size():
+    pool = ConnectionPool(max_size=1)
+
+    with patch('psycopg2.connect') as connect:
+        connect.side_effect = lambda **kw: make_connection()
+
+        conn1 = pool.acquire({'database': 'a'})
+        conn2 = pool.acquire({'database': 'a'})
+        raw1, raw2 = conn1._connection, conn2._connection
+
+        conn1.close()
+        conn2.close()
+
+    raw1.close.assert_not_called()
+    raw2.close.assert_called_once()
+
+
+def test_pool_max_total():
+    pool = ConnectionPool(max_total=2)
+
+    with patch('psycopg2.connect') as connect, \
+         patch('time.time') as mock_time:
+        connect.side_effect = lambda **kw: make_connection()
+
+        raws = []
+        for index, name in enumerate(['a', 'b', 'c']):
+            mock_time.return_value = 1000 + index
+            conn = pool.acquire({'database': name})
+            raws.append(conn._connection)
+            conn.close()
+
+    # The least recently released connection is closed
+    raws[0].close.assert_called_once()
+    raws[1].close.assert_not_called()
+    raws[2].close.assert_not_called()
+    assert sorted(dict(key)['database'] for key in pool.idle) == ['b', 'c']
+
+
+def test_pool_fork():
+    pool = ConnectionPool()
+
+    with patch('psycopg2.connect') as connect:
+        connect.side_effect = lambda **kw: make_connection()
+
+        conn = pool.acquire({'database': 'a'})
+        raw = conn._connection
+        conn.close()
+
+        # A forked process doesn't reuse the connections of its parent
+        with patch('os.getpid', return_value=pool.pid + 1):
+            conn = pool.acquire({'database': 'a'})
+            assert conn._connection is not raw
+            conn.close()
+            pool.close_all()
+
+    # Closing it in the child would close it for the parent too
+    raw.close.assert_not_called()
+    assert pool.inherited == [raw]
+
+
+def test_pool_health_check():
+    pool = ConnectionPool(max_idle=60, check_after=10)
+
+    with patch('psycopg2.connect') as connect, \
+         patch('time.time') as mock_time:
+        connect.side_effect = lambda **kw: make_connection()
+        mock_time.return_value = 1000
+
+        conn = pool.acquire({'database': 'a'})
+        raw = conn._connection
+        conn.close()
+
+        # Recently used connections aren't checked
+        mock_time.return_value = 1005
+        conn = pool.acquire({'database': 'a'})
+        assert conn._connection is raw
+        raw.cursor.assert_not_called()
+        conn.close()
+
+        # Checked after check_after seconds
+        mock_time.return_value = 1020
+        conn = pool.acquire({'database': 'a'})
+        assert conn._connection is raw
+        raw.cursor.return_value.__enter__.return_value.execute\
+            .assert_called_once_with("SELECT 1")
+        conn.close()
+
+        # Broken connections are discarded
+        raw.cursor.side_effect = Exception("server closed the connection")
+        mock_time.return_value = 1040
+        conn = pool.acquire({'database': 'a'})
+        assert conn._connection is not raw
+        raw.close.assert_called_once()
+        new_raw = conn._connection
+        conn.close()
+
+        # Closed connections aren't given back
+        new_raw.closed = 1
+        mock_time.return_value = 1041
+        conn = pool.acquire({'database': 'a'})
+        assert conn._connection is not new_raw
+        conn._connection.closed = 1
+        conn.close()
+        assert pool.idle == {}
+
+
+def test_pool_max_idle():
+    pool = ConnectionPool(max_idle=60)
+
+    with patch('psycopg2.connect') as connect, \
+         patch('time.time') as mock_time:
+        connect.side_effect = lambda **kw: make_connection()
+        mock_time.return_value = 1000
+
+        conn = pool.acquire({'database': 'a'})
+        raw_a = conn._connection
+        conn.close()
+
+        mock_time.return_value = 1100
+        conn = pool.acquire({'database': 'a'})
+        assert conn._connection is not raw_a
+        raw_a.close.assert_called_once()
+        conn.close()
+
+        conn = pool.acquire({'database': 'b'})
+        raw_b = conn._connection
+        conn.close()
+
+        # Releasing prunes the other expired connections
+        mock_time.return_value = 1200
+        conn = pool.acquire({'database': 'c'})
+        conn.close()
+        raw_b.close.assert_called_once()
+        assert list(pool.idle) == [pool.make_key({'database': 'c'})]
+
+
+def test_pool_rollback_failure():
+    pool = ConnectionPool()
+
+    with patch('psycopg2.connect') as connect:
+        connect.side_effect = lambda **kw: make_connection()
+
+        conn = pool.acquire({'database': 'a'})
+        raw = conn._connection
+        raw.rollback.side_effect = Exception("failed")
+        conn.close()
+
+    raw.close.assert_called_once()
+    assert pool.idle == {}
+
+
+def test_db_connect_pooled():
+    env = Environment()
+
+    with patch('psycopg2.connect') as connect:
+        connect.side_effect = lambda **kw: make_connection()
+
+        conn = env.manage.db_connect('test', pooled=True)
+        raw = conn._connection
+        conn.close()
+
+        conn = env.manage.db_connect('test', pooled=True)
+        assert conn._connection is raw
+        conn.close()
+
+        assert connect.call_count == 1
+        assert connect.call_args[1]['database'] == 'test'
+
+
+def test_pool_close_database():
+    pool = ConnectionPool()
+
+    with patch('psycopg2.connect') as connect:
+        connect.side_effect = lambda **kw: make_connection()
+
+        conn_a = pool.acquire({'database': 'a'})
+        conn_b = pool.acquire({'database': 'b'})
+        raw_a, raw_b = conn_a._connection, conn_b._connection
+        conn_a.close()
+        conn_b.close()
+
+    pool.close_database('a')
+    raw_a.close.assert_called_once()
+    raw_b.close.assert_not_called()
+    assert list(pool.idle) == [pool.make_key({'database': 'b'})]
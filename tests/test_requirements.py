@@ -1,5 +1,15 @@
 import json
-from odoo_tools.utilities.requirements import merge_requirements
+import pytest
+from pathlib import Path
+from odoo_tools.exceptions import ArgumentError
+from odoo_tools.utilities.requirements import (
+    merge_requirements,
+    merge_requirements_pip,
+    RequirementMerger,
+    RequirementsLock,
+    requirement_files,
+    requirements_hash,
+)
 
 
 def test_merge_requirements(tmp_path):
@@ -73,3 +83,147 @@ setuptools.setup(
         'cryptography',
         'file://{}/vals'.format(tmp_path)
     ])
+
+
+def test_merge_requirements_pip(tmp_path):
+    req1 = """cryptography
+Pillow >3.0
+"""
+    req2 = """Pillow <10
+requests[ssl] <3; python_version <= '4'
+"""
+    requirements = set()
+
+    for index, req in enumerate([req1, req2]):
+        filename = tmp_path / f'requirements{index}.txt'
+        filename.write_text(req)
+        requirements.add(filename)
+
+    assert sorted(merge_requirements_pip(requirements)) == sorted(
+        merge_requirements(requirements)
+    )
+
+
+def test_merge_requirement_rules(tmp_path):
+    base = tmp_path / 'base.txt'
+    base.write_text("""
+# comment
+--index-url https://pypi.org/simple
+requests >2  # inline comment
+lxml \\
+    <5
+""")
+
+    req = tmp_path / 'requirements.txt'
+    req.write_text("-r base.txt\n-r requirements.txt\nbarcode\n")
+
+    result = merge_requirements([req], rules=[
+        'requests <3',
+        'gitpython',
+        "pywin32; sys_platform == 'win32'",
+        'package @ https://example.com/package.zip',
+        './local#egg=local',
+    ])
+
+    assert set(result) == set([
+        'requests <3,>2',
+        'lxml <5',
+        'barcode',
+        'gitpython',
+        'https://example.com/package.zip',
+        (Path.cwd() / 'local').as_uri() + '#egg=local',
+    ])
+
+
+def test_merge_requirement_markers():
+    merger = RequirementMerger()
+    merger.add_string("a; python_version > '2'\nb; python_version > '2'")
+
+    assert sorted(merger.result()) == ['a', 'b']
+    assert merger.markers == {'python_version > "2"': True}
+
+
+def test_merge_requirement_hashes(tmp_path):
+    req = tmp_path / 'requirements.txt'
+    req.write_text("""--require-hashes
+requests==2.31.0 \\
+    --hash=sha256:abc \\
+    --hash=sha256:def
+certifi==2023.7.22 --hash=sha256:123
+lxml --global-option="--with-xslt"
+""")
+
+    assert sorted(merge_requirements([req])) == [
+        'certifi ==2023.7.22',
+        'lxml',
+        'requests ==2.31.0',
+    ]
+
+
+def test_merge_requirement_invalid():
+    with pytest.raises(ArgumentError):
+        merge_requirements(rules=['requests >>> 2'])
+
+    with pytest.raises(ArgumentError):
+        merge_requirements(rules=['-x value'])
+
+
+def test_requirements_hash(tmp_path):
+    req = tmp_path / 'requirements.txt'
+    req.write_text("requests")
+
+    deps = {'mod1': ['ldap'], 'mod2': []}
+    digest = requirements_hash(deps, [req], {'ldap': 'python-ldap'})
+
+    assert digest == requirements_hash(deps, [req], {'ldap': 'python-ldap'})
+    assert digest != requirements_hash(deps, [req], {})
+    assert digest != requirements_hash(deps, [req], rules=['lxml'])
+    assert digest != requirements_hash({'mod1': ['ldap']}, [req])
+
+    req.write_text("requests >2")
+    assert digest != requirements_hash(deps, [req], {'ldap': 'python-ldap'})
+
+
+def test_requirements_hash_included(tmp_path):
+    base = tmp_path / 'base'
+    base.mkdir()
+    (base / 'common.txt').write_text("lxml\n-r requirements.txt\n")
+
+    req = tmp_path / 'requirements.txt'
+    req.write_text("requests\n-r base/common.txt\n-r base/missing.txt\n")
+
+    assert requirement_files([req]) == [
+        (base / 'common.txt').resolve(),
+        (base / 'missing.txt').resolve(),
+        (base / 'requirements.txt').resolve(),
+        req.resolve(),
+    ]
+
+    digest = requirements_hash({}, [req])
+    assert digest == requirements_hash({}, [req])
+
+    # Editing an included file changes the digest
+    (base / 'common.txt').write_text("lxml >4\n")
+    digest2 = requirements_hash({}, [req])
+    assert digest2 != digest
+
+    (base / 'missing.txt').write_text("")
+    assert requirements_hash({}, [req]) != digest2
+
+
+def test_requirements_lock(tmp_path):
+    lock = RequirementsLock(tmp_path / 'lock' / 'requirements.txt')
+
+    assert lock.get('abc') is None
+    assert lock.is_installed('abc') is False
+
+    lock.save('abc', ['lxml', 'requests'])
+
+    assert lock.path.read_text() == "lxml\nrequests"
+    assert lock.get('abc') == ['lxml', 'requests']
+    assert lock.get('def') is None
+    assert lock.is_installed('abc') is False
+
+    lock.save('abc', ['lxml', 'requests'], installed=True)
+    assert lock.is_installed('abc') is True
+    assert lock.is_installed('def') is False
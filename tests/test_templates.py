@@ -0,0 +1,270 @@
+import pytest
+from mock import MagicMock, patch
+from psycopg2 import sql
+
+from odoo_tools.api.objects import Manifest
+from odoo_tools.api.templates import TemplateCache
+
+
+def make_module(path, name, **attrs):
+    module_path = path / name
+    module_path.mkdir()
+    (module_path / '__init__.py').write_text('# {}\n'.format(name))
+    return Manifest(module_path, attrs=attrs)
+
+
+@pytest.fixture
+def manage(tmp_path):
+    manage = MagicMock()
+    addons = tmp_path / 'addons'
+    addons.mkdir()
+
+    manage.environment.modules.list.return_value = [
+        make_module(addons, 'base'),
+        make_module(addons, 'sale', depends=['base']),
+        make_module(addons, 'stock', depends=['base']),
+        make_module(
+            addons, 'sale_stock', depends=['sale', 'stock'], auto_install=True
+        ),
+        make_module(addons, 'website', depends=['base']),
+    ]
+    manage.config.filestore.side_effect = lambda db: str(
+        tmp_path / 'filestore' / db
+    )
+
+    server = tmp_path / 'odoo'
+    (server / 'addons' / 'base').mkdir(parents=True)
+    (server / 'models.py').write_text('# models\n')
+    (server / 'addons' / 'base' / 'models.py').write_text('# base\n')
+    manage.environment.path.return_value = server
+    manage.environment.odoo_version.return_value = 14
+
+    return manage
+
+
+def test_module_closure(manage):
+    cache = TemplateCache(manage)
+
+    closure = [mod.path.name for mod in cache.module_closure({'sale'})]
+    assert closure == ['base', 'sale']
+
+    closure = [
+        mod.path.name
+        for mod in cache.module_closure({'sale', 'stock'})
+    ]
+    assert closure == ['base', 'sale', 'sale_stock', 'stock']
+
+
+def test_template_hash(manage, tmp_path):
+    cache = TemplateCache(manage)
+
+    name = cache.template_name({'sale'}, 'CA', 'en_US', True)
+    assert name.startswith('odootools_tpl_')
+    assert len(name) < 64
+    assert name == cache.template_name({'sale'}, 'CA', 'en_US', True)
+
+    assert name != cache.template_name({'sale'}, 'US', 'en_US', True)
+    assert name != cache.template_name({'sale'}, 'CA', 'fr_CA', True)
+    assert name != cache.template_name({'sale'}, 'CA', 'en_US', False)
+    assert name != cache.template_name({'stock'}, 'CA', 'en_US', True)
+
+    # Unrelated modules don't change the template
+    (tmp_path / 'addons' / 'website' / 'models.py').write_text('')
+    assert name == cache.template_name({'sale'}, 'CA', 'en_US', True)
+
+    (tmp_path / 'addons' / 'sale' / 'models.py').write_text('')
+    assert name != cache.template_name({'sale'}, 'CA', 'en_US', True)
+
+
+def test_template_hash_server(manage, tmp_path):
+    cache = TemplateCache(manage)
+    name = cache.template_name({'sale'}, 'CA', 'en_US', True)
+
+    # Addons of the server are covered by the module checksums
+    (tmp_path / 'odoo' / 'addons' / 'base' / 'models.py').write_text('')
+    assert name == cache.template_name({'sale'}, 'CA', 'en_US', True)
+
+    (tmp_path / 'odoo' / 'fields.py').write_text('# fields\n')
+    name2 = cache.template_name({'sale'}, 'CA', 'en_US', True)
+    assert name2 != name
+
+    manage.environment.odoo_version.return_value = 15
+    assert name2 != cache.template_name({'sale'}, 'CA', 'en_US', True)
+
+
+def test_init_database(manage):
+    cache = TemplateCache(manage)
+
+    with patch.object(cache, 'exists') as exists, \
+         patch.object(cache, 'build') as build, \
+         patch.object(cache, 'copy') as copy:
+        exists.return_value = False
+
+        template = cache.init_database('db1', {'sale'}, 'CA', 'en_US', True)
+        build.assert_called_once_with(template, {'sale'}, 'CA', 'en_US', True)
+        copy.assert_called_once_with(template, 'db1')
+
+        build.reset_mock()
+        exists.return_value = True
+        cache.init_database('db2', {'sale'}, 'CA', 'en_US', True)
+        build.assert_not_called()
+        copy.assert_called_with(template, 'db2')
+
+
+def test_copy(manage, tmp_path):
+    cache = TemplateCache(manage)
+
+    store = tmp_path / 'filestore' / 'tpl' / 'ab'
+    store.mkdir(parents=True)
+    (store / 'abcd').write_text('data')
+
+    with patch.object(cache, 'execute_admin') as execute, \
+         patch.object(cache, 'reset_identity') as reset:
+        cache.copy('tpl', 'db1')
+
+        execute.assert_called_once_with(
+            sql.SQL("CREATE DATABASE {} WITH TEMPLATE {}").format(
+                sql.Identifier('db1'),
+                sql.Identifier('tpl'),
+            )
+        )
+        reset.assert_called_once_with('db1')
+
+    manage.pool.close_database.assert_called_with('tpl')
+
+    copied = tmp_path / 'filestore' / 'db1' / 'ab' / 'abcd'
+    assert copied.read_text() == 'data'
+
+
+def test_copy_existing_filestore(manage, tmp_path):
+    cache = TemplateCache(manage)
+
+    store = tmp_path / 'filestore' / 'tpl' / 'ab'
+    store.mkdir(parents=True)
+    (store / 'abcd').write_text('data')
+
+    # Filestore left by a database dropped by other means
+    stale = tmp_path / 'filestore' / 'db1' / 'cd'
+    stale.mkdir(parents=True)
+    (stale / 'cdef').write_text('stale')
+
+    with patch.object(cache, 'execute_admin'), \
+         patch.object(cache, 'reset_identity'):
+        cache.copy('tpl', 'db1')
+
+    assert not stale.exists()
+    copied = tmp_path / 'filestore' / 'db1' / 'ab' / 'abcd'
+    assert copied.read_text() == 'data'
+
+
+def test_copy_failure(manage, tmp_path):
+    cache = TemplateCache(manage)
+
+    with patch.object(cache, 'execute_admin'), \
+         patch.object(cache, 'reset_identity') as reset, \
+         patch.object(cache, 'drop') as drop:
+        reset.side_effect = RuntimeError('failed')
+
+        with pytest.raises(RuntimeError):
+            cache.copy('tpl', 'db1')
+
+        drop.assert_called_once_with('db1')
+
+
+def test_build(manage, tmp_path):
+    cache = TemplateCache(manage)
+    dbapi = manage.db.return_value
+
+    def drop(name):
+        return sql.SQL("DROP DATABASE IF EXISTS {}").format(
+            sql.Identifier(name)
+        )
+
+    def init(*args, **kwargs):
+        store = tmp_path / 'filestore' / 'tpl_tmp'
+        store.mkdir(parents=True)
+        (store / 'abcd').write_text('data')
+
+    dbapi.init.side_effect = init
+
+    with patch.object(cache, 'execute_admin') as execute:
+        cache.build('tpl', {'sale'}, 'CA', 'en_US', True)
+
+        # The template is built under a temporary name
+        manage.db.assert_called_once_with('tpl_tmp')
+        dbapi.init.assert_called_once_with(
+            {'sale'}, 'CA', language='en_US', without_demo=True
+        )
+        assert [call[0][0] for call in execute.call_args_list] == [
+            drop('tpl'),
+            drop('tpl_tmp'),
+            sql.SQL("ALTER DATABASE {} RENAME TO {}").format(
+                sql.Identifier('tpl_tmp'),
+                sql.Identifier('tpl'),
+            ),
+            sql.SQL("ALTER DATABASE {} WITH IS_TEMPLATE TRUE").format(
+                sql.Identifier('tpl')
+            ),
+        ]
+
+        store = tmp_path / 'filestore' / 'tpl'
+        assert (store / 'abcd').read_text() == 'data'
+        assert not (tmp_path / 'filestore' / 'tpl_tmp').exists()
+
+        # A failed template is dropped
+        execute.reset_mock()
+        dbapi.init.side_effect = Exception("install failed")
+
+        with pytest.raises(Exception):
+            cache.build('tpl', {'sale'}, 'CA', 'en_US', True)
+
+        assert execute.call_args_list[-1][0][0] == drop('tpl_tmp')
+        assert not store.exists()
+
+
+def test_exists(manage):
+    cache = TemplateCache(manage)
+    cr = manage.db_connect.return_value.cursor.return_value
+
+    cr.fetchone.return_value = None
+    assert cache.exists('tpl') is False
+
+    # Half built templates aren't flagged as templates
+    query = cr.execute.call_args[0][0]
+    assert 'datistemplate' in query
+
+    cr.fetchone.return_value = (1,)
+    assert cache.exists('tpl') is True
+
+
+def test_init_database_lock(manage):
+    cache = TemplateCache(manage)
+    cr = manage.db_connect.return_value.cursor.return_value
+
+    with patch.object(cache, 'exists') as exists, \
+         patch.object(cache, 'build') as build, \
+         patch.object(cache, 'copy'):
+        # Built by another process while waiting for the lock
+        exists.side_effect = [False, True]
+
+        cache.init_database('db1', {'sale'}, 'CA', 'en_US', True)
+        build.assert_not_called()
+
+    queries = [call[0][0] for call in cr.execute.call_args_list]
+    assert queries == [
+        "SELECT pg_advisory_lock(%s)",
+        "SELECT pg_advisory_unlock(%s)",
+    ]
+
+
+def test_reset_identity(manage):
+    cache = TemplateCache(manage)
+    conn = manage.db_connect.return_value
+
+    cache.reset_identity('db1')
+
+    manage.db_connect.assert_called_once_with('db1', pooled=True)
+    cr = conn.cursor.return_value
+    keys = [call[0][1][1] for call in cr.execute.call_args_list]
+    assert keys == ['database.uuid', 'database.secret']
+    conn.commit.assert_called_once()
@@ -0,0 +1,130 @@
+import zipfile
+import subprocess
+from mock import patch
+
+from odoo_tools.configuration.pip import pip_command, pip_wheel_command
+from odoo_tools.configuration.wheelhouse import Wheelhouse
+
+
+def make_wheel(index, name, version, requires=()):
+    dist = "{}-{}".format(name, version)
+    path = index / "{}-py3-none-any.whl".format(dist)
+
+    metadata = "Metadata-Version: 2.1\nName: {}\nVersion: {}\n".format(
+        name, version
+    ) + "".join(
+        "Requires-Dist: {}\n".format(require)
+        for require in requires
+    )
+
+    with zipfile.ZipFile(str(path), 'w') as wheel:
+        wheel.writestr("{}/__init__.py".format(name), "")
+        wheel.writestr("{}.dist-info/METADATA".format(dist), metadata)
+        wheel.writestr(
+            "{}.dist-info/WHEEL".format(dist),
+            "Wheel-Version: 1.0\nRoot-Is-Purelib: true\nTag: py3-none-any\n"
+        )
+        wheel.writestr("{}.dist-info/RECORD".format(dist), "")
+
+    return path
+
+
+def test_pip_commands(tmp_path):
+    assert pip_command(find_links=[tmp_path], no_index=True)[-3:] == [
+        '--no-index', '--find-links', str(tmp_path)
+    ]
+
+    args = pip_wheel_command(tmp_path, index_url='https://pypi.local')
+    assert args[3:] == [
+        'wheel',
+        '--wheel-dir', str(tmp_path),
+        '--index-url', 'https://pypi.local',
+    ]
+
+
+def test_wheelhouse_build(tmp_path):
+    index = tmp_path / 'index'
+    index.mkdir()
+
+    make_wheel(index, 'alpha', '1.0', ['beta'])
+    make_wheel(index, 'beta', '2.0')
+    make_wheel(index, 'gamma', '0.1')
+
+    wheelhouse = Wheelhouse(
+        tmp_path / 'wheels',
+        find_links=[index],
+        no_index=True,
+        jobs=2
+    )
+
+    results = wheelhouse.build(['gamma', 'alpha >=1', 'missing'])
+
+    assert [
+        (result['requirement'], result['status'])
+        for result in results
+    ] == [
+        ('alpha >=1', 'done'),
+        ('gamma', 'done'),
+        ('missing', 'failed'),
+    ]
+
+    assert sorted(
+        path.name
+        for path in (tmp_path / 'wheels').iterdir()
+    ) == [
+        'alpha-1.0-py3-none-any.whl',
+        'beta-2.0-py3-none-any.whl',
+        'gamma-0.1-py3-none-any.whl',
+    ]
+
+    # The wheelhouse is enough to build again without the index
+    offline = Wheelhouse(tmp_path / 'wheels', no_index=True)
+    results = offline.build(['alpha'])
+    assert results[0]['status'] == 'done'
+
+
+def test_wheelhouse_constraints(tmp_path):
+    index = tmp_path / 'index'
+    index.mkdir()
+
+    make_wheel(index, 'alpha', '1.0', ['beta'])
+    make_wheel(index, 'beta', '1.0')
+    make_wheel(index, 'beta', '2.0')
+
+    wheelhouse = Wheelhouse(
+        tmp_path / 'wheels',
+        find_links=[index],
+        no_index=True,
+    )
+
+    assert wheelhouse.constraints([
+        'beta <2',
+        'requests[security] >2; python_version > "3"',
+        'https://example.com/package.zip',
+    ]) == [
+        'beta<2',
+        'requests>2; python_version > "3"',
+    ]
+
+    # The dependency of alpha is built in the version required by beta
+    results = wheelhouse.build(['alpha', 'beta <2'])
+
+    assert [result['status'] for result in results] == ['done', 'done']
+    assert sorted(
+        path.name
+        for path in (tmp_path / 'wheels').iterdir()
+    ) == [
+        'alpha-1.0-py3-none-any.whl',
+        'beta-1.0-py3-none-any.whl',
+    ]
+
+
+def test_wheelhouse_timeout(tmp_path):
+    wheelhouse = Wheelhouse(tmp_path / 'wheels', timeout=1)
+
+    with patch('subprocess.run') as run:
+        run.side_effect = subprocess.TimeoutExpired('pip', 1)
+        results = wheelhouse.build(['alpha'])
+
+    assert results[0]['status'] == 'timeout'
+    assert results[0]['wheels'] == []